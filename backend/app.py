@@ -1,16 +1,41 @@
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt, get_jwt_identity
+from werkzeug.exceptions import RequestEntityTooLarge
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-import hashlib
 from datetime import datetime, timedelta
 import re
 import os
 import uuid
+from contextlib import closing
 from functools import wraps
+import pandas as pd
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import deferred, selectinload, undefer_group
 from config import Config
+from counters import DashboardCounters, breakdown
+from exports import arrow_available, arrow_chunks, arrow_type, batched, csv_chunks, gzip_chunks, ndjson_chunks
+from jobs import JobQueue, job_progress
+from ingest import parallel_map, plan_shards
+from json_provider import FastJSONProvider
+from kaggle_transform import transform_kaggle_shard
+from audit import AuditWriter
+from bulk_insert import insert_rows
+from cache import ResponseCache
+from migrations import migrate
+from pagination import InvalidCursor, keyset_page
+from pii import detect_pii, detect_pii_frame, mask_pii
+from purge import delete_batch, id_ranges, truncate_tables, vacuum
+from search import SearchIndex
+from uploads import UploadTooLarge, file_sha256, save_stream, splice
+from user_cache import UserCache
+from security_controls import (
+    SECURITY_COLS, CONTROL_BITS, pack_controls, unpack_controls, controls_bits,
+    pack_controls_frame, truthy_columns
+)
 
 # Import fraud detection model
 try:
@@ -20,6 +45,7 @@ except ImportError:
 
 app = Flask(__name__)
 app.config.from_object(Config)
+app.json = FastJSONProvider(app)
 
 # Database configuration - use SQLite for local development
 database_url = os.getenv('DATABASE_URL', 'sqlite:///onboarding.db')
@@ -53,6 +79,12 @@ app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
 CORS(app, origins=app.config.get('CORS_ORIGINS', ['http://localhost:3000']))
 db = SQLAlchemy(app)
 jwt = JWTManager(app)
+audit_writer = AuditWriter()
+search_index = SearchIndex()
+dashboard_counters = DashboardCounters()
+response_cache = ResponseCache()
+user_cache = UserCache()
+job_queue = JobQueue()
 
 # ============== DATABASE MODELS ==============
 
@@ -63,6 +95,7 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     password_hash = db.Column(db.String(255), nullable=False)
     role = db.Column(db.String(20), default='reviewer')  # admin, reviewer, viewer
+    token_version = db.Column(db.Integer, nullable=False, default=0)  # bump to revoke issued tokens
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def set_password(self, password):
@@ -75,6 +108,13 @@ class User(db.Model):
 
 class Application(db.Model):
     __tablename__ = 'applications'
+    __table_args__ = (
+        db.Index('ix_applications_submitted_date_id', 'submitted_date', 'id'),
+        db.Index('ix_applications_status_submitted_date', 'status', 'submitted_date', 'id'),
+        db.Index('ix_applications_type_submitted_date', 'type', 'submitted_date', 'id'),
+        db.Index('ix_applications_status_type_submitted_date', 'status', 'type', 'submitted_date', 'id'),
+        db.Index('ix_applications_risk_score', 'risk_score'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     type = db.Column(db.String(20), nullable=False)  # vendor, client
     company_name = db.Column(db.String(200), nullable=False)
@@ -86,11 +126,16 @@ class Application(db.Model):
     zip = db.Column(db.String(20))
     tax_id = db.Column(db.String(50))
     industry = db.Column(db.String(100))
-    description = db.Column(db.Text)
+    description = deferred(db.Column(db.Text), group='details')
     status = db.Column(db.String(20), default='pending_review')
     risk_score = db.Column(db.Float)
     fraud_score = db.Column(db.Float)
-    fraud_detection_result = db.Column(db.Text)  # JSON string
+    fraud_detection_result = deferred(db.Column(db.JSON().with_variant(JSONB(), 'postgresql')), group='details')
+    fraud_model_type = db.Column(db.String(50), index=True)  # copied from fraud_detection_result
+    fraud_risk_level = db.Column(db.String(20), index=True)
+    controls_mask = db.Column(db.Integer, default=0, index=True)  # bit per control, see CONTROL_BITS
+    external_id = db.Column(db.String(100), unique=True, index=True)  # application_id from imported CSVs
+    content_hash = db.Column(db.String(40))  # hash of the imported CSV row, see kaggle_transform.content_hashes
     submitted_date = db.Column(db.DateTime, default=datetime.utcnow)
     reviewed_by = db.Column(db.Integer, db.ForeignKey('users.id'))
     reviewed_at = db.Column(db.DateTime)
@@ -102,9 +147,10 @@ class Application(db.Model):
 
 
 class SecurityControl(db.Model):
+    """Legacy one-row-per-control storage, superseded by Application.controls_mask"""
     __tablename__ = 'security_controls'
     id = db.Column(db.Integer, primary_key=True)
-    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False, index=True)
     category = db.Column(db.String(100), nullable=False)
     control_name = db.Column(db.String(100), nullable=False)
     status = db.Column(db.Boolean, default=False)
@@ -113,7 +159,7 @@ class SecurityControl(db.Model):
 class PIIData(db.Model):
     __tablename__ = 'pii_data'
     id = db.Column(db.Integer, primary_key=True)
-    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False)
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False, index=True)
     field_name = db.Column(db.String(100), nullable=False)
     pii_type = db.Column(db.String(50), nullable=False)
     masked_value = db.Column(db.String(200))
@@ -122,9 +168,13 @@ class PIIData(db.Model):
 
 class AuditLog(db.Model):
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        db.Index('ix_audit_logs_application_id', 'application_id', 'timestamp'),
+        db.Index('ix_audit_logs_timestamp_id', 'timestamp', 'id'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     application_id = db.Column(db.Integer, db.ForeignKey('applications.id'))
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
     action = db.Column(db.String(100), nullable=False)
     details = db.Column(db.Text)
     ip_address = db.Column(db.String(50))
@@ -133,6 +183,9 @@ class AuditLog(db.Model):
 
 class ApplicationComment(db.Model):
     __tablename__ = 'application_comments'
+    __table_args__ = (
+        db.Index('ix_application_comments_application_id', 'application_id', 'created_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -144,8 +197,56 @@ class ApplicationComment(db.Model):
     application = db.relationship('Application', backref='comments')
 
 
+class DashboardCounter(db.Model):
+    """Running totals behind the dashboard, maintained by counters.DashboardCounters"""
+    __tablename__ = 'dashboard_counters'
+    name = db.Column(db.String(150), primary_key=True)  # total, status:<status>, type:<type>, ...
+    count = db.Column(db.Integer, nullable=False, default=0)
+    risk_sum = db.Column(db.Float, nullable=False, default=0)
+    risk_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class DailyRiskRollup(db.Model):
+    """Per-day, per-type application totals behind the risk trends, maintained by counters.DashboardCounters"""
+    __tablename__ = 'daily_risk_rollups'
+    day = db.Column(db.Date, primary_key=True)
+    type = db.Column(db.String(20), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    risk_sum = db.Column(db.Float, nullable=False, default=0)
+    risk_count = db.Column(db.Integer, nullable=False, default=0)
+    fraud_sum = db.Column(db.Float, nullable=False, default=0)
+    fraud_count = db.Column(db.Integer, nullable=False, default=0)
+    pending_count = db.Column(db.Integer, nullable=False, default=0)
+    approved_count = db.Column(db.Integer, nullable=False, default=0)
+    flagged_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class ImportJob(db.Model):
+    """Background import job, run and checkpointed by jobs.JobQueue"""
+    __tablename__ = 'import_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, completed, failed
+    params = db.Column(db.JSON)
+    checkpoint = db.Column(db.JSON)  # handler-specific resume state
+    stats = db.Column(db.JSON)
+    total_rows = db.Column(db.Integer)
+    rows_processed = db.Column(db.Integer, nullable=False, default=0)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    worker = db.Column(db.String(200))
+    error = db.Column(db.Text)
+    created_by = db.Column(db.Integer, db.ForeignKey('users.id'))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+
 class Document(db.Model):
     __tablename__ = 'documents'
+    __table_args__ = (
+        db.Index('ix_documents_application_id', 'application_id', 'uploaded_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -154,6 +255,7 @@ class Document(db.Model):
     file_path = db.Column(db.String(500), nullable=False)
     file_type = db.Column(db.String(50))  # certificate, contract, etc.
     file_size = db.Column(db.Integer)  # in bytes
+    sha256 = db.Column(db.String(64))  # of the file contents, computed while it was streamed in
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     # Relationships
@@ -161,49 +263,43 @@ class Document(db.Model):
     application = db.relationship('Application', backref='documents')
 
 
+class DocumentUpload(db.Model):
+    """Resumable upload in progress; becomes a Document when its last chunk arrives"""
+    __tablename__ = 'document_uploads'
+    id = db.Column(db.String(36), primary_key=True)  # uuid4
+    application_id = db.Column(db.Integer, db.ForeignKey('applications.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    original_filename = db.Column(db.String(255), nullable=False)
+    file_type = db.Column(db.String(50))
+    part_path = db.Column(db.String(500), nullable=False)
+    total_size = db.Column(db.Integer, nullable=False)
+    received = db.Column(db.Integer, nullable=False, default=0)  # bytes written to part_path so far
+    sha256 = db.Column(db.String(64))  # expected digest, if the client sent one
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+
+audit_writer.init_app(app, db, AuditLog)
+search_index.init_app(app, Application)
+dashboard_counters.init_app(app, db, DashboardCounter, DailyRiskRollup)
+response_cache.init_app(app, db)
+user_cache.init_app(app, db, User)
+job_queue.init_app(app, db, ImportJob)
+app.before_request(job_queue.ensure_worker)
+
+
 # ============== UTILITY FUNCTIONS ==============
 
-def detect_pii(data):
-    """Detect PII in application data"""
-    pii_fields = []
-    patterns = {
-        'ssn': r'\d{3}-\d{2}-\d{4}',
-        'phone': r'\d{3}-\d{3}-\d{4}',
-        'email': r'@'
-    }
-    
-    for key, value in data.items():
-        if isinstance(value, str):
-            if 'ssn' in key.lower() or re.match(patterns['ssn'], value):
-                pii_fields.append({'field': key, 'type': 'SSN', 'value': value})
-            elif 'phone' in key.lower() or re.match(patterns['phone'], value):
-                pii_fields.append({'field': key, 'type': 'Phone', 'value': value})
-            elif 'email' in key.lower() or '@' in value:
-                pii_fields.append({'field': key, 'type': 'Email', 'value': value})
-            elif 'address' in key.lower():
-                pii_fields.append({'field': key, 'type': 'Address', 'value': value})
-    
-    return pii_fields
-
-
-def mask_pii(value, pii_type):
-    """Mask PII data"""
-    if not value:
-        return ''
-    
-    if pii_type == 'SSN':
-        return '***-**-' + value[-4:]
-    elif pii_type == 'Phone':
-        return '***-***-' + value[-4:]
-    elif pii_type == 'Email':
-        if '@' in value:
-            name, domain = value.split('@')
-            return name[:2] + '***@' + domain
-        return value
-    elif pii_type == 'Address':
-        words = value.split(' ')
-        return ' '.join(words[:2] + ['***'] * (len(words) - 2))
-    return value
+# Controls that count towards auto-approval
+CORE_SECURITY_COLS = ['mfaEnabled', 'ssoSupport', 'encryptionAtRest',
+                      'encryptionInTransit', 'firewallEnabled', 'gdprCompliant']
+
+FALLBACK_FRAUD_RESULT = {
+    'is_fraud': False,
+    'fraud_score': 0.5,
+    'risk_level': 'medium',
+    'model_type': 'fallback'
+}
 
 
 def calculate_risk_score(data):
@@ -227,28 +323,228 @@ def calculate_risk_score(data):
         score -= 15
     
     # Security controls check
-    security_cols = ['mfaEnabled', 'ssoSupport', 'rbacImplemented', 'encryptionAtRest',
-                    'encryptionInTransit', 'keyManagement', 'firewallEnabled', 'vpnRequired',
-                    'ipWhitelisting', 'auditLogging', 'siemIntegration', 'alertingEnabled',
-                    'gdprCompliant', 'soc2Certified', 'isoCompliant']
-    security_count = sum(1 for col in security_cols if data.get(col, False))
+    security_count = sum(1 for col in SECURITY_COLS if data.get(col, False))
     if security_count < 5:
         score -= (15 - security_count) * 2
     
     return max(0, min(100, score))
 
 
+def calculate_risk_scores(df):
+    """Vectorized calculate_risk_score over a DataFrame of applications"""
+    score = pd.Series(100, index=df.index)
+    
+    def text(col):
+        return df[col].fillna('').astype(str) if col in df.columns else pd.Series('', index=df.index)
+    
+    email = text('email')
+    score -= 10 * (email.str.contains('@gmail.com', regex=False) | email.str.contains('@yahoo.com', regex=False))
+    
+    present = truthy_columns(df, ['tax_id', 'address', 'city', 'state'])
+    score -= 20 * ~present['tax_id']
+    score -= 10 * ~(present['address'] & present['city'] & present['state'])
+    
+    high_risk_industries = ['Cryptocurrency', 'Gambling', 'Cannabis']
+    score -= 15 * text('industry').isin(high_risk_industries)
+    
+    security_count = truthy_columns(df, SECURITY_COLS).sum(axis=1)
+    score -= ((15 - security_count) * 2).where(security_count < 5, 0)
+    
+    return score.clip(0, 100)
+
+
+def fraud_result_fields(fraud_result):
+    """Application column values for a fraud detection result"""
+    return {
+        'fraud_detection_result': fraud_result,
+        'fraud_model_type': fraud_result.get('model_type'),
+        'fraud_risk_level': fraud_result.get('risk_level')
+    }
+
+
+def adjust_risk_for_fraud(risk_score, fraud_result):
+    """Cap the risk score according to the fraud detection result"""
+    if fraud_result.get('is_fraud', False):
+        return min(risk_score, 30)
+    elif fraud_result.get('risk_level') == 'high':
+        return min(risk_score, 50)
+    elif fraud_result.get('risk_level') == 'medium':
+        return min(risk_score, 70)
+    return risk_score
+
+
+def determine_status(fraud_result, risk_score, security_controls_count):
+    """Determine initial application status from risk and fraud detection"""
+    if fraud_result.get('is_fraud', False) or fraud_result.get('risk_level') == 'high':
+        return 'flagged'
+    elif (fraud_result.get('fraud_score', 1) < 0.1 and 
+          fraud_result.get('risk_level') == 'low' and 
+          risk_score >= 85 and 
+          security_controls_count >= 4):
+        # Auto-approve very low-risk applications with good security
+        return 'approved'
+    elif risk_score >= 70:
+        return 'pending_review'
+    return 'flagged'
+
+
 def log_audit(application_id, user_id, action, details, ip_address):
-    """Create audit log entry"""
-    log = AuditLog(
-        application_id=application_id,
-        user_id=user_id,
-        action=action,
-        details=details,
-        ip_address=ip_address
+    """Create audit log entry, written when the current transaction commits"""
+    audit_writer.log(application_id, user_id, action, details, ip_address)
+
+
+def log_audits(events):
+    """Create audit log entries for (application_id, user_id, action, details, ip_address) tuples"""
+    audit_writer.log_many(events)
+
+
+# List and export endpoints select only these columns, getting plain tuple
+# rows instead of identity-mapped Application objects
+APPLICATION_LIST_COLUMNS = [
+    Application.id, Application.type, Application.company_name, Application.email,
+    Application.phone, Application.status, Application.risk_score, Application.fraud_score,
+    Application.submitted_date
+]
+APPLICATION_EXPORT_COLUMNS = APPLICATION_LIST_COLUMNS + [Application.industry]
+
+# Fields of the Parquet/Arrow/NDJSON exports: every Application column except
+# the raw fraud JSON and import hash, one flag per security control, and the
+# fraud verdict
+BULK_EXPORT_COLUMNS = {
+    c.key: c for c in Application.__table__.columns if c.key not in ('fraud_detection_result', 'content_hash')
+}
+BULK_EXPORT_FIELDS = list(BULK_EXPORT_COLUMNS) + SECURITY_COLS + ['is_fraud']
+BULK_EXPORT_FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+    'ndjson': ('application/x-ndjson', 'ndjson')
+}
+
+
+def filter_applications(query, ranked=False):
+    """Apply the request's application filters and search to query
+    
+    Raises ValueError for unknown security control names.
+    """
+    status = request.args.get('status')
+    type_ = request.args.get('type')
+    search = request.args.get('search', '').strip()
+    min_risk = request.args.get('min_risk')
+    max_risk = request.args.get('max_risk')
+    date_from = request.args.get('date_from')
+    date_to = request.args.get('date_to')
+    controls_present = request.args.get('controls_present', '')
+    controls_missing = request.args.get('controls_missing', '')
+    
+    # Security control filters, e.g. controls_missing=mfaEnabled
+    present_bits = controls_bits(controls_present)
+    missing_bits = controls_bits(controls_missing)
+    if present_bits:
+        query = query.filter(Application.controls_mask.op('&')(present_bits) == present_bits)
+    if missing_bits:
+        query = query.filter(Application.controls_mask.op('&')(missing_bits) == 0)
+    
+    # Status filter
+    if status:
+        query = query.filter_by(status=status)
+    
+    # Type filter
+    if type_:
+        query = query.filter_by(type=type_)
+    
+    # Search filter (company name, email, industry)
+    if search:
+        query = search_index.apply(query, search, ranked=ranked)
+    
+    # Risk score filters
+    if min_risk:
+        try:
+            query = query.filter(Application.risk_score >= float(min_risk))
+        except:
+            pass
+    if max_risk:
+        try:
+            query = query.filter(Application.risk_score <= float(max_risk))
+        except:
+            pass
+    
+    # Date range filters
+    if date_from:
+        try:
+            from_date = datetime.fromisoformat(date_from.replace('Z', '+00:00'))
+            query = query.filter(Application.submitted_date >= from_date)
+        except:
+            pass
+    if date_to:
+        try:
+            to_date = datetime.fromisoformat(date_to.replace('Z', '+00:00'))
+            query = query.filter(Application.submitted_date <= to_date)
+        except:
+            pass
+    
+    return query
+
+
+def paginate_request(query, keyset_columns, page_order):
+    """Paginate a query by cursor if the request has one, else by page number
+    
+    Cursor mode (?cursor=, empty for the first page) uses keyset pagination
+    on keyset_columns and only counts rows when include_total is set.
+    Page mode keeps the original OFFSET/COUNT behaviour ordered by page_order.
+    per_page is capped at MAX_PER_PAGE in both modes. Returns (items,
+    pagination fields for the response).
+    """
+    per_page = min(max(int(request.args.get('per_page', 50)), 1), app.config.get('MAX_PER_PAGE', 200))
+    cursor = request.args.get('cursor')
+    
+    if cursor is not None:
+        items, next_cursor = keyset_page(query, keyset_columns, cursor, per_page)
+        meta = {'next_cursor': next_cursor, 'has_more': next_cursor is not None}
+        if request.args.get('include_total', '').lower() in ('1', 'true', 'yes'):
+            meta['total'] = query.order_by(None).count()
+        return items, meta
+    
+    page = int(request.args.get('page', 1))
+    pagination = query.order_by(*page_order).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    return pagination.items, {
+        'total': pagination.total,
+        'pages': pagination.pages,
+        'current_page': page
+    }
+
+
+@app.errorhandler(InvalidCursor)
+def handle_invalid_cursor(e):
+    return jsonify({'error': str(e)}), 400
+
+
+def issue_access_token(user):
+    """Access token carrying the user's role and token version as claims"""
+    return create_access_token(
+        identity=str(user.id),
+        additional_claims={'role': user.role, 'ver': user.token_version}
     )
-    db.session.add(log)
-    db.session.commit()
+
+
+@jwt.token_in_blocklist_loader
+def token_revoked(jwt_header, jwt_payload):
+    """Reject tokens of deleted users and tokens issued before the user's last role change"""
+    role, version = user_cache.get(int(jwt_payload['sub']))
+    if role is None:
+        return True
+    # Tokens issued before token versions existed carry no 'ver' claim
+    return 'ver' in jwt_payload and jwt_payload['ver'] != version
+
+
+def current_role():
+    """Role of the authenticated user, from the token claims"""
+    claims = get_jwt()
+    if 'role' in claims:
+        return claims['role']
+    role, _ = user_cache.get(int(get_jwt_identity()))
+    return role
 
 
 def role_required(required_role):
@@ -257,15 +553,9 @@ def role_required(required_role):
         @wraps(fn)
         @jwt_required()
         def wrapper(*args, **kwargs):
-            user_id = int(get_jwt_identity())
-            user = User.query.get(user_id)
-            
-            if not user:
-                return jsonify({'error': 'User not found'}), 404
-            
             role_hierarchy = {'viewer': 1, 'reviewer': 2, 'admin': 3}
             
-            if role_hierarchy.get(user.role, 0) < role_hierarchy.get(required_role, 999):
+            if role_hierarchy.get(current_role(), 0) < role_hierarchy.get(required_role, 999):
                 return jsonify({'error': 'Insufficient permissions'}), 403
             
             return fn(*args, **kwargs)
@@ -310,7 +600,7 @@ def register():
     db.session.add(user)
     db.session.commit()
     
-    access_token = create_access_token(identity=str(user.id))
+    access_token = issue_access_token(user)
     
     return jsonify({
         'message': 'User created successfully',
@@ -338,7 +628,7 @@ def login():
     if not user or not user.check_password(data['password']):
         return jsonify({'error': 'Invalid credentials'}), 401
     
-    access_token = create_access_token(identity=str(user.id))
+    access_token = issue_access_token(user)
     
     return jsonify({
         'access_token': access_token,
@@ -355,67 +645,22 @@ def login():
 
 @app.route(f'{Config.API_PREFIX}/applications', methods=['GET'])
 @jwt_required()
+@response_cache.cached(['applications'])
 def get_applications():
     """Get all applications with filters and search"""
-    status = request.args.get('status')
-    type_ = request.args.get('type')
-    search = request.args.get('search', '').strip()
-    min_risk = request.args.get('min_risk')
-    max_risk = request.args.get('max_risk')
-    date_from = request.args.get('date_from')
-    date_to = request.args.get('date_to')
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 50))
-    
-    query = Application.query
-    
-    # Status filter
-    if status:
-        query = query.filter_by(status=status)
-    
-    # Type filter
-    if type_:
-        query = query.filter_by(type=type_)
+    query = Application.query.with_entities(*APPLICATION_LIST_COLUMNS)
     
-    # Search filter (company name, email)
-    if search:
-        search_pattern = f'%{search}%'
-        query = query.filter(
-            db.or_(
-                Application.company_name.ilike(search_pattern),
-                Application.email.ilike(search_pattern),
-                Application.industry.ilike(search_pattern)
-            )
-        )
-    
-    # Risk score filters
-    if min_risk:
-        try:
-            query = query.filter(Application.risk_score >= float(min_risk))
-        except:
-            pass
-    if max_risk:
-        try:
-            query = query.filter(Application.risk_score <= float(max_risk))
-        except:
-            pass
-    
-    # Date range filters
-    if date_from:
-        try:
-            from_date = datetime.fromisoformat(date_from.replace('Z', '+00:00'))
-            query = query.filter(Application.submitted_date >= from_date)
-        except:
-            pass
-    if date_to:
-        try:
-            to_date = datetime.fromisoformat(date_to.replace('Z', '+00:00'))
-            query = query.filter(Application.submitted_date <= to_date)
-        except:
-            pass
-    
-    pagination = query.order_by(Application.submitted_date.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
+    # sort=relevance ranks search results in page mode
+    ranked = request.args.get('sort') == 'relevance' and 'cursor' not in request.args
+    try:
+        query = filter_applications(query, ranked=ranked)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    items, page_meta = paginate_request(
+        query,
+        [Application.submitted_date, Application.id],
+        [Application.submitted_date.desc()]
     )
     
     applications = [{
@@ -427,14 +672,12 @@ def get_applications():
         'status': app.status,
         'risk_score': app.risk_score,
         'fraud_score': app.fraud_score,
-        'submitted_date': app.submitted_date.isoformat() if app.submitted_date else None
-    } for app in pagination.items]
+        'submitted_date': app.submitted_date
+    } for app in items]
     
     return jsonify({
         'applications': applications,
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
+        **page_meta
     }), 200
 
 
@@ -442,14 +685,16 @@ def get_applications():
 @jwt_required()
 def get_application(app_id):
     """Get single application with full details"""
-    app = Application.query.get_or_404(app_id)
+    # One query per collection regardless of how many rows each holds
+    app = Application.query.options(
+        undefer_group('details'),
+        selectinload(Application.pii_data),
+        selectinload(Application.audit_logs),
+        selectinload(Application.comments).joinedload(ApplicationComment.user)
+    ).filter_by(id=app_id).first_or_404()
     
     # Get security controls
-    controls = {}
-    for ctrl in app.security_controls:
-        if ctrl.category not in controls:
-            controls[ctrl.category] = {}
-        controls[ctrl.category][ctrl.control_name] = ctrl.status
+    controls = unpack_controls(app.controls_mask)
     
     # Get PII data
     pii = [{
@@ -462,7 +707,7 @@ def get_application(app_id):
     logs = [{
         'action': log.action,
         'details': log.details,
-        'timestamp': log.timestamp.isoformat() if log.timestamp else None,
+        'timestamp': log.timestamp,
         'user_id': log.user_id
     } for log in app.audit_logs]
     
@@ -472,18 +717,9 @@ def get_application(app_id):
         'comment': c.comment,
         'user_id': c.user_id,
         'username': c.user.username if c.user else 'Unknown',
-        'created_at': c.created_at.isoformat() if c.created_at else None
+        'created_at': c.created_at
     } for c in app.comments]
     
-    # Parse fraud detection result
-    fraud_result = None
-    if app.fraud_detection_result:
-        import json
-        try:
-            fraud_result = json.loads(app.fraud_detection_result)
-        except:
-            pass
-    
     return jsonify({
         'id': app.id,
         'type': app.type,
@@ -500,8 +736,8 @@ def get_application(app_id):
         'status': app.status,
         'risk_score': app.risk_score,
         'fraud_score': app.fraud_score,
-        'fraud_detection': fraud_result,
-        'submitted_date': app.submitted_date.isoformat() if app.submitted_date else None,
+        'fraud_detection': app.fraud_detection_result,
+        'submitted_date': app.submitted_date,
         'security_controls': controls,
         'pii_detected': pii,
         'audit_logs': logs,
@@ -531,45 +767,16 @@ def create_application():
         except Exception as e:
             print(f"Fraud detection error: {e}")
             # Fallback fraud detection result
-            fraud_result = {
-                'is_fraud': False,
-                'fraud_score': 0.5,
-                'risk_level': 'medium',
-                'model_type': 'fallback'
-            }
+            fraud_result = dict(FALLBACK_FRAUD_RESULT)
             fraud_score = 0.5
         
-        # Calculate risk score
-        risk_score = calculate_risk_score(data)
-        
-        # Adjust risk score based on fraud detection
-        if fraud_result.get('is_fraud', False):
-            risk_score = min(risk_score, 30)
-        elif fraud_result.get('risk_level') == 'high':
-            risk_score = min(risk_score, 50)
-        elif fraud_result.get('risk_level') == 'medium':
-            risk_score = min(risk_score, 70)
+        # Calculate risk score, adjusted based on fraud detection
+        risk_score = adjust_risk_for_fraud(calculate_risk_score(data), fraud_result)
         
         # Determine initial status based on risk and fraud detection
         # Auto-approve: Very low fraud score (< 0.1), low risk level, high risk score (>= 85), good security controls
-        security_controls_count = sum([
-            data.get('mfaEnabled', False), data.get('ssoSupport', False),
-            data.get('encryptionAtRest', False), data.get('encryptionInTransit', False),
-            data.get('firewallEnabled', False), data.get('gdprCompliant', False)
-        ])
-        
-        if fraud_result.get('is_fraud', False) or fraud_result.get('risk_level') == 'high':
-            status = 'flagged'
-        elif (fraud_result.get('fraud_score', 1) < 0.1 and 
-              fraud_result.get('risk_level') == 'low' and 
-              risk_score >= 85 and 
-              security_controls_count >= 4):
-            # Auto-approve very low-risk applications with good security
-            status = 'approved'
-        elif risk_score >= 70:
-            status = 'pending_review'
-        else:
-            status = 'flagged'
+        security_controls_count = sum(data.get(col, False) for col in CORE_SECURITY_COLS)
+        status = determine_status(fraud_result, risk_score, security_controls_count)
         
         # Create application
         app = Application(
@@ -586,34 +793,17 @@ def create_application():
             description=data.get('description'),
             status=status,
             risk_score=risk_score,
-            fraud_score=fraud_score
+            fraud_score=fraud_score,
+            **fraud_result_fields(fraud_result)
         )
         
-        # Store fraud detection result as JSON
-        import json
-        app.fraud_detection_result = json.dumps(fraud_result)
+        # Store security controls as a bitmask
+        app.controls_mask = pack_controls(data)
         
         db.session.add(app)
         db.session.flush()
-        
-        # Save security controls
-        security_controls = {
-            'Identity & Access Management': ['mfaEnabled', 'ssoSupport', 'rbacImplemented'],
-            'Data Encryption': ['encryptionAtRest', 'encryptionInTransit', 'keyManagement'],
-            'Network Security': ['firewallEnabled', 'vpnRequired', 'ipWhitelisting'],
-            'Logging & Monitoring': ['auditLogging', 'siemIntegration', 'alertingEnabled'],
-            'Compliance': ['gdprCompliant', 'soc2Certified', 'isoCompliant']
-        }
-        
-        for category, controls in security_controls.items():
-            for control in controls:
-                ctrl = SecurityControl(
-                    application_id=app.id,
-                    category=category,
-                    control_name=control,
-                    status=data.get(control, False)
-                )
-                db.session.add(ctrl)
+        dashboard_counters.record([app])
+        response_cache.invalidate_on_commit('applications', 'analytics')
         
         # Detect and save PII
         pii_detected = detect_pii(data)
@@ -654,6 +844,142 @@ def create_application():
         return jsonify({'error': f'Failed to create application: {str(e)}'}), 500
 
 
+@app.route(f'{Config.API_PREFIX}/applications/batch', methods=['POST'])
+@jwt_required()
+def create_applications_batch():
+    """Create many applications in one request
+    
+    Accepts {"applications": [...]} (or a bare list). All records are
+    validated up front, scored with one batched model call and inserted with
+    bulk inserts, one transaction per chunk. Returns a per-item result list
+    in request order, with 201 if any were created, 400 if every record was
+    invalid, and 207 (some created) or 500 (none) if a chunk failed on the
+    server; those records are marked retryable.
+    """
+    data = request.get_json()
+    records = data.get('applications') if isinstance(data, dict) else data
+    if not isinstance(records, list) or not records:
+        return jsonify({'error': 'A non-empty list of applications is required'}), 400
+    
+    max_size = app.config.get('BATCH_MAX_SIZE', 5000)
+    if len(records) > max_size:
+        return jsonify({'error': f'Batch too large. Maximum size: {max_size}'}), 400
+    
+    user_id = int(get_jwt_identity())
+    results = [None] * len(records)
+    
+    # Validate required fields
+    valid = []
+    for i, record in enumerate(records):
+        if not isinstance(record, dict):
+            results[i] = {'index': i, 'success': False, 'error': 'Application must be an object'}
+        elif not record.get('company_name') or not record.get('email'):
+            results[i] = {'index': i, 'success': False, 'error': 'Company name and email are required'}
+        else:
+            valid.append(i)
+    
+    chunk_size = app.config.get('BATCH_CHUNK_SIZE', 500)
+    server_errors = 0
+    for start in range(0, len(valid), chunk_size):
+        indices = valid[start:start + chunk_size]
+        try:
+            for result in _create_application_chunk(records, indices, user_id, request.remote_addr):
+                results[result['index']] = result
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error creating application batch: {e}")
+            server_errors += len(indices)
+            for i in indices:
+                results[i] = {
+                    'index': i, 'success': False, 'retryable': True,
+                    'error': f'Failed to create application: {str(e)}'
+                }
+    
+    # 400 only when the request itself was bad; a server-side failure is a
+    # 500, or a 207 alongside the records that did get created
+    created = sum(1 for r in results if r['success'])
+    if server_errors:
+        status = 207 if created else 500
+    else:
+        status = 201 if created else 400
+    return jsonify({
+        'message': f'{created} of {len(records)} applications created',
+        'created': created,
+        'failed': len(records) - created,
+        'results': results
+    }), status
+
+
+def _create_application_chunk(records, indices, user_id, ip_address):
+    """Score and bulk-insert one chunk of validated applications in one transaction"""
+    chunk = [records[i] for i in indices]
+    df = pd.DataFrame(chunk, index=indices)
+    
+    # Run fraud detection with one model call
+    try:
+        fraud_results = fraud_model.predict_batch(chunk)
+    except Exception as e:
+        print(f"Fraud detection error: {e}")
+        fraud_results = [dict(FALLBACK_FRAUD_RESULT) for _ in chunk]
+    
+    base_risk = calculate_risk_scores(df)
+    core_controls = truthy_columns(df, CORE_SECURITY_COLS).sum(axis=1)
+    controls_masks = pack_controls_frame(df)
+    
+    submitted_date = datetime.utcnow()
+    rows = []
+    for i, record, fraud_result in zip(indices, chunk, fraud_results):
+        risk_score = adjust_risk_for_fraud(int(base_risk[i]), fraud_result)
+        rows.append({
+            'type': record.get('type', 'vendor'),
+            'company_name': record.get('company_name', ''),
+            'email': record.get('email', ''),
+            'phone': record.get('phone'),
+            'address': record.get('address'),
+            'city': record.get('city'),
+            'state': record.get('state'),
+            'zip': record.get('zip'),
+            'tax_id': record.get('tax_id'),
+            'industry': record.get('industry'),
+            'description': record.get('description'),
+            'status': determine_status(fraud_result, risk_score, int(core_controls[i])),
+            'risk_score': risk_score,
+            'fraud_score': fraud_result.get('fraud_score', 0),
+            **fraud_result_fields(fraud_result),
+            'controls_mask': int(controls_masks[i]),
+            'submitted_date': submitted_date
+        })
+    
+    app_ids = insert_rows(db.session, Application.__table__, rows, return_ids=True)
+    id_by_index = dict(zip(indices, app_ids))
+    dashboard_counters.record(rows)
+    response_cache.invalidate_on_commit('applications', 'analytics')
+    
+    insert_rows(db.session, PIIData.__table__, [{
+        'application_id': id_by_index[i],
+        'field_name': field,
+        'pii_type': pii_type,
+        'masked_value': mask_pii(value, pii_type)
+    } for i, field, pii_type, value in detect_pii_frame(df)])
+    
+    log_audits([
+        (id_by_index[i], user_id, 'APPLICATION_CREATED',
+         f"New {records[i].get('type', 'vendor')} application submitted (batch)", ip_address)
+        for i in indices
+    ])
+    
+    db.session.commit()
+    
+    return [{
+        'index': i,
+        'success': True,
+        'application_id': id_by_index[i],
+        'status': row['status'],
+        'risk_score': row['risk_score'],
+        'fraud_score': row['fraud_score']
+    } for i, row in zip(indices, rows)]
+
+
 @app.route(f'{Config.API_PREFIX}/applications/<int:app_id>/status', methods=['PUT'])
 @role_required('reviewer')
 def update_application_status(app_id):
@@ -671,6 +997,8 @@ def update_application_status(app_id):
     app.status = new_status
     app.reviewed_by = user_id
     app.reviewed_at = datetime.utcnow()
+    dashboard_counters.record_status_change(app, old_status)
+    response_cache.invalidate_on_commit('applications', 'analytics')
     
     # Add comment if provided
     comment_text = data.get('comment', '').strip()
@@ -765,44 +1093,32 @@ def get_application_comments(app_id):
 
 @app.route(f'{Config.API_PREFIX}/analytics/dashboard', methods=['GET'])
 @jwt_required()
+@response_cache.cached(['analytics'])
 def get_dashboard_analytics():
     """Get dashboard analytics"""
-    total = Application.query.count()
-    pending = Application.query.filter_by(status='pending_review').count()
-    approved = Application.query.filter_by(status='approved').count()
-    flagged = Application.query.filter_by(status='flagged').count()
-    
-    # Average risk score
-    from sqlalchemy import func
-    avg_risk = db.session.query(func.avg(Application.risk_score)).scalar() or 0
-    
-    # Applications by type
-    by_type = db.session.query(
-        Application.type, 
-        func.count(Application.id)
-    ).group_by(Application.type).all()
-    
-    # Applications by status
-    by_status = db.session.query(
-        Application.status,
-        func.count(Application.id)
-    ).group_by(Application.status).all()
+    # Counts and risk sums come from the incrementally maintained rollup
+    counters = dashboard_counters.snapshot()
+    total, risk_sum, risk_count = counters.get('total', (0, 0.0, 0))
+    by_status = breakdown(counters, 'status')
+    avg_risk = risk_sum / risk_count if risk_count else 0
     
     # Recent applications
-    recent = Application.query.order_by(
-        Application.submitted_date.desc()
-    ).limit(10).all()
+    recent = Application.query.with_entities(
+        Application.id, Application.company_name, Application.status, Application.submitted_date
+    ).order_by(Application.submitted_date.desc()).limit(10).all()
     
     return jsonify({
         'summary': {
             'total': total,
-            'pending': pending,
-            'approved': approved,
-            'flagged': flagged,
+            'pending': by_status.get('pending_review', 0),
+            'approved': by_status.get('approved', 0),
+            'flagged': by_status.get('flagged', 0),
             'avg_risk_score': round(avg_risk, 2)
         },
-        'by_type': dict(by_type),
-        'by_status': dict(by_status),
+        'by_type': breakdown(counters, 'type'),
+        'by_status': by_status,
+        'by_model_type': breakdown(counters, 'model_type'),
+        'by_risk_level': breakdown(counters, 'risk_level'),
         'recent': [{
             'id': app.id,
             'company_name': app.company_name,
@@ -814,30 +1130,43 @@ def get_dashboard_analytics():
 
 @app.route(f'{Config.API_PREFIX}/analytics/risk-trends', methods=['GET'])
 @jwt_required()
+@response_cache.cached(['analytics'])
 def get_risk_trends():
     """Get risk score trends"""
     days = int(request.args.get('days', 30))
-    start_date = datetime.utcnow() - timedelta(days=days)
-    
-    from sqlalchemy import func
-    
-    # Risk scores over time
-    trends = db.session.query(
-        func.date(Application.submitted_date).label('date'),
-        func.avg(Application.risk_score).label('avg_risk'),
-        func.count(Application.id).label('count')
-    ).filter(
-        Application.submitted_date >= start_date
-    ).group_by(
-        func.date(Application.submitted_date)
-    ).all()
+    now = datetime.utcnow()
+    start_date = now - timedelta(days=days)
+    
+    # Whole days inside the window come from the daily rollups; the partial
+    # first day and today are computed live over the submitted_date index
+    first_full_day = start_date.date() + timedelta(days=1)
+    today = datetime(now.year, now.month, now.day)
+    totals = dashboard_counters.daily_totals(first_full_day, today.date() - timedelta(days=1))
+    
+    live_ranges = [
+        (Application.submitted_date >= start_date,
+         Application.submitted_date < datetime.combine(first_full_day, datetime.min.time())),
+        (Application.submitted_date >= max(today, start_date),)
+    ]
+    for range_filter in live_ranges:
+        live = db.session.query(
+            func.date(Application.submitted_date).label('date'),
+            func.count(Application.id),
+            func.sum(Application.risk_score),
+            func.count(Application.risk_score)
+        ).filter(*range_filter).group_by(
+            func.date(Application.submitted_date)
+        ).all()
+        # Assign rather than add: a window starting today is covered by both ranges
+        for date, count, risk_sum, risk_count in live:
+            totals[str(date)] = (count, risk_sum or 0, risk_count)
     
     return jsonify({
         'trends': [{
-            'date': str(t.date),
-            'avg_risk_score': round(t.avg_risk, 2),
-            'application_count': t.count
-        } for t in trends]
+            'date': date,
+            'avg_risk_score': round(risk_sum / risk_count, 2) if risk_count else 0,
+            'application_count': count
+        } for date, (count, risk_sum, risk_count) in sorted(totals.items()) if count]
     }), 200
 
 
@@ -847,12 +1176,11 @@ def get_risk_trends():
 @role_required('admin')
 def get_audit_logs():
     """Get audit logs"""
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 50))
-    
-    pagination = AuditLog.query.order_by(
-        AuditLog.timestamp.desc()
-    ).paginate(page=page, per_page=per_page, error_out=False)
+    items, page_meta = paginate_request(
+        AuditLog.query,
+        [AuditLog.timestamp, AuditLog.id],
+        [AuditLog.timestamp.desc()]
+    )
     
     logs = [{
         'id': log.id,
@@ -862,13 +1190,11 @@ def get_audit_logs():
         'details': log.details,
         'ip_address': log.ip_address,
         'timestamp': log.timestamp.isoformat() if log.timestamp else None
-    } for log in pagination.items]
+    } for log in items]
     
     return jsonify({
         'logs': logs,
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
+        **page_meta
     }), 200
 
 
@@ -878,12 +1204,7 @@ def get_audit_logs():
 @role_required('admin')
 def get_users():
     """Get all users (admin only)"""
-    page = int(request.args.get('page', 1))
-    per_page = int(request.args.get('per_page', 50))
-    
-    pagination = User.query.order_by(User.id.desc()).paginate(
-        page=page, per_page=per_page, error_out=False
-    )
+    items, page_meta = paginate_request(User.query, [User.id], [User.id.desc()])
     
     users = [{
         'id': u.id,
@@ -891,13 +1212,11 @@ def get_users():
         'email': u.email,
         'role': u.role,
         'created_at': None  # Add if you have this field
-    } for u in pagination.items]
+    } for u in items]
     
     return jsonify({
         'users': users,
-        'total': pagination.total,
-        'pages': pagination.pages,
-        'current_page': page
+        **page_meta
     }), 200
 
 
@@ -914,9 +1233,10 @@ def update_user(user_id):
     if user_id == admin_id and data.get('role') != user.role:
         return jsonify({'error': 'Cannot change your own role'}), 400
     
-    # Update fields
-    if 'role' in data:
+    # Update fields; a role change revokes the user's existing tokens
+    if 'role' in data and data['role'] != user.role:
         user.role = data['role']
+        user.token_version = (user.token_version or 0) + 1
     if 'email' in data:
         user.email = data['email']
     
@@ -930,6 +1250,7 @@ def update_user(user_id):
     )
     
     db.session.commit()
+    user_cache.invalidate(user.id)
     
     return jsonify({
         'message': 'User updated successfully',
@@ -967,66 +1288,67 @@ def delete_user(user_id):
     
     db.session.delete(user)
     db.session.commit()
+    user_cache.invalidate(user_id)
     
     return jsonify({'message': f'User {username} deleted successfully'}), 200
 
 
 # ============== DOCUMENT UPLOAD ENDPOINTS ==============
 
-@app.route(f'{Config.API_PREFIX}/applications/<int:app_id>/documents', methods=['POST'])
-@jwt_required()
-def upload_document(app_id):
-    """Upload a document for an application"""
-    
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file provided'}), 400
-    
-    file = request.files['file']
-    file_type = request.form.get('file_type', 'document')
-    
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
-    
-    # Validate file type
-    allowed_extensions = {'pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png', 'txt'}
-    filename = file.filename
-    if '.' not in filename or filename.rsplit('.', 1)[1].lower() not in allowed_extensions:
-        return jsonify({'error': 'Invalid file type. Allowed: PDF, DOC, DOCX, JPG, PNG, TXT'}), 400
-    
-    # Validate file size (max 10MB)
-    file.seek(0, os.SEEK_END)
-    file_size = file.tell()
-    file.seek(0)
-    
-    if file_size > 10 * 1024 * 1024:  # 10MB
-        return jsonify({'error': 'File too large. Maximum size: 10MB'}), 400
-    
-    # Create uploads directory
+DOCUMENT_EXTENSIONS = {'pdf', 'doc', 'docx', 'jpg', 'jpeg', 'png', 'txt'}
+# Room for the multipart boundaries and form fields around the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+SHA256_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+# request.files parses a multipart body in full before upload_document sees
+# the file, so every request body is capped here: large enough for a whole
+# multipart upload or a resumable chunk, refused by Flask beyond that
+app.config['MAX_CONTENT_LENGTH'] = max(
+    app.config.get('UPLOAD_MAX_SIZE', 10 * 1024 * 1024) + MULTIPART_OVERHEAD,
+    app.config.get('RESUMABLE_CHUNK_SIZE', 5 * 1024 * 1024),
+)
+
+
+def documents_dir():
+    """Directory document files are stored in, created on first use"""
     uploads_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'uploads', 'documents')
     os.makedirs(uploads_dir, exist_ok=True)
-    
-    # Generate unique filename
-    file_ext = filename.rsplit('.', 1)[1].lower()
-    unique_filename = f"{uuid.uuid4()}.{file_ext}"
-    file_path = os.path.join(uploads_dir, unique_filename)
-    
-    # Save file
-    file.save(file_path)
-    
-    # Create document record
-    user_id = int(get_jwt_identity())
-    app = Application.query.get_or_404(app_id)
-    
+    return uploads_dir
+
+
+def document_extension(filename):
+    """Lower-case extension of an allowed document filename, or None"""
+    if not filename or '.' not in filename:
+        return None
+    ext = filename.rsplit('.', 1)[1].lower()
+    return ext if ext in DOCUMENT_EXTENSIONS else None
+
+
+def invalid_type_response():
+    return jsonify({'error': 'Invalid file type. Allowed: PDF, DOC, DOCX, JPG, PNG, TXT'}), 400
+
+
+def too_large_response(limit):
+    return jsonify({'error': f'File too large. Maximum size: {limit // (1024 * 1024)}MB'}), 413
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def handle_request_too_large(e):
+    return too_large_response(app.config.get('UPLOAD_MAX_SIZE', 10 * 1024 * 1024))
+
+
+def add_document(app_id, user_id, filename, file_type, file_path, file_size, sha256):
+    """Record a stored file as a document of an application, with its audit log, and commit"""
     document = Document(
         application_id=app_id,
         user_id=user_id,
-        filename=unique_filename,
+        filename=os.path.basename(file_path),
         original_filename=secure_filename(filename),
         file_path=file_path,
         file_type=file_type,
-        file_size=file_size
+        file_size=file_size,
+        sha256=sha256
     )
-    
     db.session.add(document)
     
     # Create audit log
@@ -1047,11 +1369,233 @@ def upload_document(app_id):
             'filename': document.original_filename,
             'file_type': document.file_type,
             'file_size': document.file_size,
+            'sha256': document.sha256,
             'uploaded_at': document.uploaded_at.isoformat() if document.uploaded_at else None
         }
     }), 201
 
 
+@app.route(f'{Config.API_PREFIX}/applications/<int:app_id>/documents', methods=['POST'])
+@jwt_required()
+def upload_document(app_id):
+    """Upload a document for an application
+    
+    Send either multipart form data (file, file_type) or the raw file as
+    the request body with ?filename=...&file_type=... The raw body is
+    streamed straight to disk. Either way the file is read in chunks while
+    its size and SHA-256 are computed, and the upload is refused before
+    anything is read if the application doesn't exist or Content-Length
+    is over the limit.
+    """
+    Application.query.get_or_404(app_id)
+    limit = app.config.get('UPLOAD_MAX_SIZE', 10 * 1024 * 1024)
+    multipart = request.mimetype == 'multipart/form-data'
+    if request.content_length is not None and request.content_length > limit + (MULTIPART_OVERHEAD if multipart else 0):
+        return too_large_response(limit)
+    
+    if multipart:
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file provided'}), 400
+        file = request.files['file']
+        filename = file.filename
+        file_type = request.form.get('file_type', 'document')
+        stream = file.stream
+        if filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+    else:
+        filename = request.args.get('filename', '')
+        file_type = request.args.get('file_type', 'document')
+        stream = request.stream
+        if not filename:
+            return jsonify({'error': 'filename is required'}), 400
+    
+    # Validate file type
+    file_ext = document_extension(filename)
+    if not file_ext:
+        return invalid_type_response()
+    
+    # Stream to a uniquely named file, hashing as we go
+    file_path = os.path.join(documents_dir(), f"{uuid.uuid4()}.{file_ext}")
+    try:
+        file_size, sha256 = save_stream(stream, file_path, limit, app.config.get('UPLOAD_CHUNK_SIZE', 64 * 1024))
+    except UploadTooLarge:
+        return too_large_response(limit)
+    
+    return add_document(app_id, int(get_jwt_identity()), filename, file_type, file_path, file_size, sha256)
+
+
+def expire_uploads():
+    """Delete resumable uploads that have seen no chunk for RESUMABLE_UPLOAD_TTL_HOURS, with their files"""
+    cutoff = datetime.utcnow() - timedelta(hours=app.config.get('RESUMABLE_UPLOAD_TTL_HOURS', 24))
+    stale = DocumentUpload.query.filter(DocumentUpload.updated_at < cutoff).limit(100).all()
+    part_paths = [upload.part_path for upload in stale]
+    for upload in stale:
+        db.session.delete(upload)
+    db.session.commit()
+    remove_files(part_paths)
+
+
+def upload_status(upload):
+    return {
+        'upload_id': upload.id,
+        'application_id': upload.application_id,
+        'filename': upload.original_filename,
+        'size': upload.total_size,
+        'offset': upload.received,
+        'chunk_size': app.config.get('RESUMABLE_CHUNK_SIZE', 5 * 1024 * 1024),
+        'upload_url': f'{Config.API_PREFIX}/documents/uploads/{upload.id}'
+    }
+
+
+def owns_upload(upload):
+    """Only the uploader or an admin may see, continue or cancel a resumable upload"""
+    return upload.user_id == int(get_jwt_identity()) or current_role() == 'admin'
+
+
+@app.route(f'{Config.API_PREFIX}/applications/<int:app_id>/documents/uploads', methods=['POST'])
+@jwt_required()
+def create_document_upload(app_id):
+    """Start a resumable upload of a large document
+    
+    JSON body: filename, size in bytes, file_type and optionally sha256,
+    which the assembled file is checked against. Then PUT the file in
+    chunks to upload_url with an Upload-Offset header; GET upload_url
+    returns the offset to resume from after an interruption.
+    """
+    Application.query.get_or_404(app_id)
+    data = request.get_json(silent=True) or {}
+    filename = data.get('filename', '')
+    size = data.get('size')
+    sha256 = data.get('sha256')
+    limit = app.config.get('RESUMABLE_UPLOAD_MAX_SIZE', 100 * 1024 * 1024)
+    
+    file_ext = document_extension(filename)
+    if not file_ext:
+        return invalid_type_response()
+    if type(size) is not int or size <= 0:
+        return jsonify({'error': 'size must be a positive integer'}), 400
+    if size > limit:
+        return too_large_response(limit)
+    if sha256 is not None and not (isinstance(sha256, str) and SHA256_PATTERN.match(sha256.lower())):
+        return jsonify({'error': 'sha256 must be a hex SHA-256 digest'}), 400
+    
+    expire_uploads()
+    upload_id = str(uuid.uuid4())
+    upload = DocumentUpload(
+        id=upload_id,
+        application_id=app_id,
+        user_id=int(get_jwt_identity()),
+        original_filename=filename,
+        file_type=data.get('file_type', 'document'),
+        part_path=os.path.join(documents_dir(), f'{upload_id}.{file_ext}.part'),
+        total_size=size,
+        sha256=sha256.lower() if sha256 else None
+    )
+    open(upload.part_path, 'wb').close()
+    db.session.add(upload)
+    db.session.commit()
+    
+    return jsonify(upload_status(upload)), 201
+
+
+@app.route(f'{Config.API_PREFIX}/documents/uploads/<upload_id>', methods=['GET'])
+@jwt_required()
+def get_document_upload(upload_id):
+    """Progress of a resumable upload: the offset the next chunk must start at"""
+    upload = DocumentUpload.query.get_or_404(upload_id)
+    if not owns_upload(upload):
+        return jsonify({'error': 'Unauthorized'}), 403
+    return jsonify(upload_status(upload)), 200
+
+
+@app.route(f'{Config.API_PREFIX}/documents/uploads/<upload_id>', methods=['PUT'])
+@jwt_required()
+def put_document_upload_chunk(upload_id):
+    """Append the request body to a resumable upload at the Upload-Offset header
+    
+    The offset must equal the bytes received so far (409 with the current
+    offset otherwise, e.g. after a lost response). The chunk that completes
+    the file turns it into a document: 201 with the document, or 422 if it
+    doesn't match the sha256 given at the start. Other chunks return 200
+    with the new offset.
+    """
+    upload = DocumentUpload.query.get_or_404(upload_id)
+    if not owns_upload(upload):
+        return jsonify({'error': 'Unauthorized'}), 403
+    offset = request.headers.get('Upload-Offset', type=int)
+    if offset != upload.received:
+        return jsonify({'error': 'Upload-Offset does not match the bytes received', 'offset': upload.received}), 409
+    remaining = upload.total_size - offset
+    if request.content_length is not None and request.content_length > remaining:
+        return jsonify({'error': f'Chunk is larger than the {remaining} bytes remaining', 'offset': offset}), 413
+    part_path = upload.part_path
+    # Don't hold a transaction open while the body arrives
+    db.session.commit()
+    
+    # The chunk goes to a file of its own first: a concurrent PUT for the
+    # same offset must not be able to mix its bytes into the partial file
+    chunk_path = f'{part_path}.{uuid.uuid4()}'
+    try:
+        written, _ = save_stream(request.stream, chunk_path, remaining, app.config.get('UPLOAD_CHUNK_SIZE', 64 * 1024))
+    except UploadTooLarge:
+        return jsonify({'error': f'Chunk is larger than the {remaining} bytes remaining', 'offset': offset}), 413
+    
+    # Claim the range and splice the chunk in within one transaction. The
+    # compare-and-set UPDATE locks the row until commit, so a PUT for the
+    # same offset then finds it taken, and the next chunk can't be spliced
+    # in before this one is
+    received = offset + written
+    try:
+        claimed = db.session.execute(
+            update(DocumentUpload).where(DocumentUpload.id == upload_id, DocumentUpload.received == offset).values(
+                received=received, updated_at=datetime.utcnow()
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        if claimed:
+            splice(chunk_path, part_path, offset)
+        db.session.commit()
+    except BaseException:
+        db.session.rollback()
+        raise
+    finally:
+        remove_files([chunk_path])
+    
+    upload = DocumentUpload.query.get_or_404(upload_id)
+    if not claimed:
+        return jsonify({'error': 'Upload-Offset does not match the bytes received', 'offset': upload.received}), 409
+    if received < upload.total_size:
+        return jsonify({'upload_id': upload.id, 'offset': received, 'size': upload.total_size}), 200
+    
+    # Last chunk: verify, move into place and record the document
+    sha256 = file_sha256(part_path)
+    db.session.delete(upload)
+    if upload.sha256 and sha256 != upload.sha256:
+        db.session.commit()
+        remove_files([part_path])
+        return jsonify({'error': 'Checksum mismatch; the upload was discarded', 'sha256': sha256}), 422
+    
+    file_path = part_path[:-len('.part')]
+    os.replace(part_path, file_path)
+    return add_document(
+        upload.application_id, upload.user_id, upload.original_filename, upload.file_type,
+        file_path, upload.total_size, sha256
+    )
+
+
+@app.route(f'{Config.API_PREFIX}/documents/uploads/<upload_id>', methods=['DELETE'])
+@jwt_required()
+def cancel_document_upload(upload_id):
+    """Abandon a resumable upload and delete what was received"""
+    upload = DocumentUpload.query.get_or_404(upload_id)
+    if not owns_upload(upload):
+        return jsonify({'error': 'Unauthorized'}), 403
+    part_path = upload.part_path
+    db.session.delete(upload)
+    db.session.commit()
+    remove_files([part_path])
+    return jsonify({'message': 'Upload cancelled'}), 200
+
+
 @app.route(f'{Config.API_PREFIX}/applications/<int:app_id>/documents', methods=['GET'])
 @jwt_required()
 def get_application_documents(app_id):
@@ -1067,6 +1611,7 @@ def get_application_documents(app_id):
             'filename': d.original_filename,
             'file_type': d.file_type,
             'file_size': d.file_size,
+            'sha256': d.sha256,
             'uploaded_by': d.user.username if d.user else 'Unknown',
             'uploaded_at': d.uploaded_at.isoformat() if d.uploaded_at else None
         } for d in documents]
@@ -1099,10 +1644,8 @@ def delete_document(doc_id):
     user_id = int(get_jwt_identity())
     
     # Only allow deletion by uploader or admin
-    if document.user_id != user_id:
-        user = User.query.get(user_id)
-        if not user or user.role != 'admin':
-            return jsonify({'error': 'Unauthorized'}), 403
+    if document.user_id != user_id and current_role() != 'admin':
+        return jsonify({'error': 'Unauthorized'}), 403
     
     # Delete file
     if os.path.exists(document.file_path):
@@ -1131,43 +1674,30 @@ def delete_document(doc_id):
 @app.route(f'{Config.API_PREFIX}/applications/export/csv', methods=['GET'])
 @jwt_required()
 def export_applications_csv():
-    """Export applications to CSV"""
-    import csv
-    from io import StringIO
-    
-    status = request.args.get('status')
-    type_ = request.args.get('type')
-    search = request.args.get('search', '').strip()
+    """Export applications to CSV, streamed in chunks (gzip=true for a .csv.gz)
     
-    query = Application.query
+    Takes the same filters as get_applications and the other export formats.
+    """
+    compress = request.args.get('gzip', '').lower() in ('1', 'true', 'yes')
     
-    if status:
-        query = query.filter_by(status=status)
-    if type_:
-        query = query.filter_by(type=type_)
-    if search:
-        search_pattern = f'%{search}%'
-        query = query.filter(
-            db.or_(
-                Application.company_name.ilike(search_pattern),
-                Application.email.ilike(search_pattern)
-            )
-        )
-    
-    applications = query.order_by(Application.submitted_date.desc()).all()
+    try:
+        query = filter_applications(Application.query.with_entities(*APPLICATION_EXPORT_COLUMNS))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    output = StringIO()
-    writer = csv.writer(output)
+    # yield_per streams rows from the cursor (server-side on PostgreSQL)
+    chunk_size = app.config['EXPORT_CHUNK_SIZE']
+    applications = query.order_by(
+        Application.submitted_date.desc(), Application.id.desc()
+    ).yield_per(chunk_size)
     
-    # Write header
-    writer.writerow([
+    header = [
         'ID', 'Type', 'Company Name', 'Email', 'Phone', 'Industry',
         'Status', 'Risk Score', 'Fraud Score', 'Submitted Date'
-    ])
+    ]
     
-    # Write data
-    for app in applications:
-        writer.writerow([
+    def to_values(app):
+        return [
             app.id,
             app.type,
             app.company_name,
@@ -1178,193 +1708,471 @@ def export_applications_csv():
             app.risk_score or 0,
             app.fraud_score or 0,
             app.submitted_date.isoformat() if app.submitted_date else ''
-        ])
+        ]
+    
+    body = csv_chunks(applications, header, to_values, chunk_size)
+    filename = 'applications.csv'
+    mimetype = 'text/csv'
+    if compress:
+        body = gzip_chunks(body)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
+
+
+@app.route(f'{Config.API_PREFIX}/applications/export/<fmt>', methods=['GET'])
+@jwt_required()
+def export_applications(fmt):
+    """Export applications as Parquet, an Arrow IPC stream or NDJSON, streamed in row groups
+    
+    Takes the same filters as get_applications, plus columns=a,b,c to pick
+    fields and gzip=true for NDJSON.
+    """
+    if fmt not in BULK_EXPORT_FORMATS:
+        return jsonify({'error': f'Unsupported export format: {fmt}'}), 404
+    if fmt != 'ndjson' and not arrow_available():
+        return jsonify({'error': 'Parquet and Arrow exports require pyarrow'}), 501
+    
+    fields = [f.strip() for f in request.args.get('columns', '').split(',') if f.strip()] or BULK_EXPORT_FIELDS
+    unknown = [f for f in fields if f not in BULK_EXPORT_FIELDS]
+    if unknown:
+        return jsonify({'error': f"Unknown export columns: {', '.join(unknown)}"}), 400
+    
+    # Read only the columns the selected fields are built from
+    needed = {f for f in fields if f in BULK_EXPORT_COLUMNS}
+    if any(f in CONTROL_BITS for f in fields):
+        needed.add('controls_mask')
+    if 'is_fraud' in fields:
+        needed.add('fraud_detection_result')
+    query = Application.query.with_entities(*[getattr(Application, key) for key in sorted(needed)])
+    try:
+        query = filter_applications(query)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    chunk_size = app.config['EXPORT_CHUNK_SIZE'] if fmt == 'ndjson' else app.config['EXPORT_ROW_GROUP_SIZE']
+    rows = query.order_by(
+        Application.submitted_date.desc(), Application.id.desc()
+    ).yield_per(chunk_size)
+    
+    def to_columns(batch):
+        columns = {}
+        for field in fields:
+            if field in CONTROL_BITS:
+                bit = CONTROL_BITS[field]
+                columns[field] = [bool((row.controls_mask or 0) & bit) for row in batch]
+            elif field == 'is_fraud':
+                columns[field] = [
+                    bool(row.fraud_detection_result.get('is_fraud')) if row.fraud_detection_result else None
+                    for row in batch
+                ]
+            else:
+                columns[field] = [getattr(row, field) for row in batch]
+        return columns
+    
+    batches = (to_columns(batch) for batch in batched(rows, chunk_size))
+    if fmt == 'ndjson':
+        body = ndjson_chunks(batches, app.json.dumps)
+    else:
+        schema = [
+            (f, arrow_type(BULK_EXPORT_COLUMNS[f].type if f in BULK_EXPORT_COLUMNS else 'bool'))
+            for f in fields
+        ]
+        body = arrow_chunks(batches, schema, fmt)
     
-    output.seek(0)
+    mimetype, extension = BULK_EXPORT_FORMATS[fmt]
+    filename = f'applications.{extension}'
+    if fmt == 'ndjson' and request.args.get('gzip', '').lower() in ('1', 'true', 'yes'):
+        body = gzip_chunks(body)
+        filename += '.gz'
+        mimetype = 'application/gzip'
     
-    from flask import Response
     return Response(
-        output.getvalue(),
-        mimetype='text/csv',
-        headers={'Content-Disposition': 'attachment; filename=applications.csv'}
+        stream_with_context(body),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
 
 # ============== DATA IMPORT ENDPOINTS ==============
 
+KAGGLE_IMPORT_MODES = ['replace', 'incremental']
+# Existing application fields an incremental import needs to update rows and counters
+KAGGLE_UPSERT_LOOKUP = [
+    Application.id, Application.external_id, Application.content_hash, Application.reviewed_at,
+    Application.status, Application.type, Application.risk_score, Application.fraud_score,
+    Application.fraud_model_type, Application.fraud_risk_level, Application.submitted_date
+]
+
+
+def _insert_kaggle_pii(pii, id_by_label):
+    """Bulk-insert the PII rows of the applications in id_by_label"""
+    rows = pii[pii.index.isin(list(id_by_label))]
+    insert_rows(db.session, PIIData.__table__, [{
+        'application_id': id_by_label[label],
+        'field_name': field,
+        'pii_type': pii_type,
+        'masked_value': masked_value
+    } for label, field, pii_type, masked_value in rows.itertuples()])
+
+
+def _insert_kaggle_rows(frame, pii):
+    """Bulk-insert new applications and their PII"""
+    frame = frame.assign(submitted_date=datetime.utcnow())
+    app_ids = insert_rows(db.session, Application.__table__, frame.to_dict('records'), return_ids=True)
+    _insert_kaggle_pii(pii, dict(zip(frame.index, app_ids)))
+    dashboard_counters.record_frame(frame)
+
+
+def _update_kaggle_rows(frame, old, pii):
+    """Bulk-update changed applications (old holds their current values) and replace their PII
+    
+    Submission dates are kept, and so is the status of applications a
+    reviewer has already acted on.
+    """
+    reviewed = old['reviewed_at'].notna()
+    frame = frame.assign(id=old['id'], submitted_date=old['submitted_date'])
+    frame['status'] = frame['status'].where(~reviewed, old['status'])
+    db.session.execute(update(Application), frame.to_dict('records'))
+    
+    id_by_label = frame['id'].to_dict()
+    db.session.execute(delete(PIIData).where(PIIData.application_id.in_(list(id_by_label.values()))))
+    _insert_kaggle_pii(pii, id_by_label)
+    
+    dashboard_counters.record_frame(old, sign=-1)
+    dashboard_counters.record_frame(frame)
+    return frame
+
+
+def _upsert_kaggle_chunk(frame, pii):
+    """Write one chunk of imported applications in the current transaction
+    
+    Rows whose external_id matches an existing application update it if
+    their content_hash differs and are left alone otherwise; the rest are
+    inserted. Returns (inserted, updated) frames.
+    """
+    keys = frame['external_id'].dropna().tolist()
+    existing = pd.DataFrame(
+        db.session.query(*KAGGLE_UPSERT_LOOKUP).filter(Application.external_id.in_(keys)).all() if keys else [],
+        columns=[column.key for column in KAGGLE_UPSERT_LOOKUP]
+    ).set_index('external_id')
+    
+    matched = frame['external_id'].isin(existing.index)
+    inserted = frame[~matched]
+    old = existing.loc[frame.loc[matched, 'external_id']].set_axis(frame.index[matched])
+    changed = old['content_hash'] != frame.loc[matched, 'content_hash']
+    updated = frame[matched][changed]
+    
+    if len(inserted):
+        _insert_kaggle_rows(inserted, pii)
+    if len(updated):
+        updated = _update_kaggle_rows(updated, old[changed], pii)
+    if len(inserted) or len(updated):
+        response_cache.invalidate_on_commit('applications', 'analytics')
+    return inserted, updated
+
+
+# Kaggle data file sets, in order of preference. supplier_quality_data.csv
+# holds every row that prepare_training_data.py splits into train/test, so
+# importing it together with the split files would import each row twice.
+KAGGLE_CSV_SETS = [
+    ['supplier_quality_data.csv'],
+    ['onboarding_train.csv', 'onboarding_test.csv']
+]
+
+
+def find_kaggle_csvs():
+    """Paths of the first set of Kaggle CSV files present in the data directory"""
+    # Look for CSV files in data directory (relative to project root)
+    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+    for names in KAGGLE_CSV_SETS:
+        paths = [os.path.join(data_dir, name) for name in names if os.path.exists(os.path.join(data_dir, name))]
+        if paths:
+            return paths
+    return []
+
+
+@job_queue.handler('kaggle_import')
+def run_kaggle_import(job):
+    """Import the job's CSV shards, parsed in parallel and written here in order
+    
+    Worker processes (IMPORT_WORKERS, default one per core) parse and
+    transform shards; this thread is the only writer and commits each
+    shard's rows with its checkpoint.
+    
+    In 'replace' mode existing applications are cleared first. In
+    'incremental' mode nothing is deleted: rows are matched to applications
+    by application_id, only new or changed rows are written, and rows
+    without an application_id are skipped.
+    
+    The files are split into shards here rather than in the request, which
+    means reading all of them, and the plan is saved in the job's params
+    with the first checkpoint. The checkpoint holds the number of shards
+    done. A resumed job reuses the plan, skips those shards and doesn't
+    clear the tables again.
+    """
+    incremental = job.params.get('mode') == 'incremental'
+    shards = job.params.get('shards')
+    checkpoint = job.checkpoint
+    stats = job.stats or {
+        'imported': 0,
+        'inserted': 0,
+        'updated': 0,
+        'unchanged': 0,
+        'skipped': 0,
+        'status_breakdown': {'flagged': 0, 'pending': 0, 'approved': 0}
+    }
+    if shards is None:
+        shards = plan_shards(job.params['paths'], app.config.get('IMPORT_SHARD_BYTES', 1 << 20))
+        job_queue.checkpoint(job, params=dict(job.params, shards=shards),
+                             total_rows=sum(shard['rows'] for shard in shards))
+        print(f"📂 Planned {len(shards)} shards")
+    if checkpoint is None:
+        if not incremental:
+            print("🗑️  Clearing existing applications...")
+            for _ in purge_applications():
+                job_queue.checkpoint(job)
+        checkpoint = {'shards_done': 0}
+        job_queue.checkpoint(job, checkpoint=checkpoint, stats=stats)
+        if not incremental:
+            print("✅ Existing data cleared")
+    
+    done = checkpoint['shards_done']
+    rows_processed = sum(shard['rows'] for shard in shards[:done])
+    remaining = shards[done:]
+    workers = min(app.config.get('IMPORT_WORKERS') or os.cpu_count() or 1, len(remaining))
+    print(f"📂 Importing {len(remaining)} shards with {workers} workers")
+    
+    with closing(parallel_map(transform_kaggle_shard, remaining, workers)) as results:
+        for shard, (rows_read, frame, pii) in zip(remaining, results):
+            if incremental:
+                frame = frame[frame['external_id'].notna()]
+            inserted, updated = _upsert_kaggle_chunk(frame, pii)
+            
+            statuses = pd.concat([inserted['status'], updated['status']]).value_counts()
+            breakdown = stats['status_breakdown']
+            stats = {
+                'imported': stats['imported'] + len(inserted) + len(updated),
+                'inserted': stats['inserted'] + len(inserted),
+                'updated': stats['updated'] + len(updated),
+                'unchanged': stats['unchanged'] + len(frame) - len(inserted) - len(updated),
+                'skipped': stats['skipped'] + rows_read - len(frame),
+                'status_breakdown': {
+                    'flagged': breakdown['flagged'] + int(statuses.get('flagged', 0)),
+                    'pending': breakdown['pending'] + int(statuses.get('pending_review', 0)),
+                    'approved': breakdown['approved'] + int(statuses.get('approved', 0))
+                }
+            }
+            done += 1
+            rows_processed += shard['rows']
+            # Commits the shard together with the new checkpoint
+            job_queue.checkpoint(job, checkpoint={'shards_done': done}, stats=stats, rows_processed=rows_processed)
+    
+    breakdown = stats['status_breakdown']
+    print(f"✅ Import complete: {stats['inserted']} inserted, {stats['updated']} updated, "
+          f"{stats['unchanged']} unchanged, {stats['skipped']} skipped")
+    print(f"   Status breakdown: {breakdown['flagged']} flagged, {breakdown['pending']} pending, {breakdown['approved']} approved")
+
+
 @app.route(f'{Config.API_PREFIX}/import/kaggle-data', methods=['POST'])
 @role_required('admin')
 def import_kaggle_data():
-    """Import applications from Kaggle CSV data - clears existing data first"""
-    try:
-        import pandas as pd
-        import json
-        import os
-        
-        # Clear existing applications first
-        print("🗑️  Clearing existing applications...")
-        ApplicationComment.query.delete()
-        Document.query.delete()
-        AuditLog.query.filter(AuditLog.application_id.isnot(None)).delete()
-        PIIData.query.delete()
-        SecurityControl.query.delete()
-        Application.query.delete()
-        db.session.commit()
-        print("✅ Existing data cleared")
-        
-        # Look for CSV files in data directory (relative to project root)
-        base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        csv_files = [
-            os.path.join(base_dir, 'data', 'onboarding_train.csv'),
-            os.path.join(base_dir, 'data', 'onboarding_test.csv'),
-            os.path.join(base_dir, 'data', 'supplier_quality_data.csv')
-        ]
-        
-        csv_file = None
-        for file_path in csv_files:
-            if os.path.exists(file_path):
-                csv_file = file_path
-                break
-        
-        if not csv_file:
-            return jsonify({'error': 'No CSV data file found. Please ensure data files exist in the data/ directory.'}), 404
-        
-        # Read CSV
-        df = pd.read_csv(csv_file)
-        print(f"📂 Loaded {len(df)} records from {csv_file}")
-        
-        imported_count = 0
-        skipped_count = 0
-        flagged_count = 0
-        pending_count = 0
-        approved_count = 0
-        
-        for _, row in df.iterrows():
-            # Map CSV columns to Application model
-            company_name = row.get('company_name', f"Company {row.get('application_id', 'Unknown')}")
-            email = row.get('email', f"contact{imported_count}@example.com")
-            
-            if not company_name or not email:
-                skipped_count += 1
-                continue
-            
-            # Determine status based on is_fraud and security controls
-            is_fraud = row.get('is_fraud', 0)
-            security_count = sum([
-                row.get('mfaEnabled', 0), row.get('ssoSupport', 0),
-                row.get('encryptionAtRest', 0), row.get('encryptionInTransit', 0),
-                row.get('firewallEnabled', 0), row.get('gdprCompliant', 0)
-            ])
-            
-            if is_fraud == 1:
-                status = 'flagged'
-                fraud_score = 0.8
-                risk_score = 30
-                flagged_count += 1
-            elif is_fraud == 0 and security_count >= 10:
-                # Auto-approve legitimate applications with excellent security
-                status = 'approved'
-                fraud_score = 0.05
-                risk_score = 90
-                approved_count += 1
-            else:
-                status = 'pending_review'
-                fraud_score = 0.1
-                risk_score = 75
-                pending_count += 1
-            
-            # Create application
-            app = Application(
-                type=row.get('type', 'vendor').lower(),
-                company_name=company_name,
-                email=email,
-                phone=str(row.get('phone', '')) if pd.notna(row.get('phone')) else None,
-                address=row.get('address', '') if pd.notna(row.get('address')) else None,
-                city=row.get('city', '') if pd.notna(row.get('city')) else None,
-                state=row.get('state', '') if pd.notna(row.get('state')) else None,
-                zip=row.get('zip', '') if pd.notna(row.get('zip')) else None,
-                tax_id=str(row.get('tax_id', '')) if pd.notna(row.get('tax_id')) else None,
-                industry=row.get('industry', '') if pd.notna(row.get('industry')) else None,
-                status=status,
-                risk_score=risk_score,
-                fraud_score=fraud_score,
-                submitted_date=datetime.utcnow()
-            )
-            
-            # Store fraud detection result
-            fraud_result = {
-                'is_fraud': bool(is_fraud == 1),
-                'fraud_score': float(fraud_score),
-                'risk_level': 'high' if is_fraud == 1 else 'low',
-                'model_type': 'kaggle_import'
-            }
-            app.fraud_detection_result = json.dumps(fraud_result)
-            
-            db.session.add(app)
-            db.session.flush()
-            
-            # Save security controls
-            security_controls = {
-                'Identity & Access Management': ['mfaEnabled', 'ssoSupport', 'rbacImplemented'],
-                'Data Encryption': ['encryptionAtRest', 'encryptionInTransit', 'keyManagement'],
-                'Network Security': ['firewallEnabled', 'vpnRequired', 'ipWhitelisting'],
-                'Logging & Monitoring': ['auditLogging', 'siemIntegration', 'alertingEnabled'],
-                'Compliance': ['gdprCompliant', 'soc2Certified', 'isoCompliant']
-            }
-            
-            for category, controls in security_controls.items():
-                for control in controls:
-                    value = row.get(control, False)
-                    if pd.notna(value):
-                        ctrl = SecurityControl(
-                            application_id=app.id,
-                            category=category,
-                            control_name=control,
-                            status=bool(value) if isinstance(value, (int, float)) else False
-                        )
-                        db.session.add(ctrl)
-            
-            # Detect and save PII
-            data_dict = row.to_dict()
-            pii_detected = detect_pii(data_dict)
-            for pii in pii_detected:
-                pii_record = PIIData(
-                    application_id=app.id,
-                    field_name=pii['field'],
-                    pii_type=pii['type'],
-                    masked_value=mask_pii(pii['value'], pii['type'])
-                )
-                db.session.add(pii_record)
-            
-            imported_count += 1
-            
-            # Commit in batches of 50
-            if imported_count % 50 == 0:
-                db.session.commit()
-        
-        db.session.commit()
-        
-        print(f"✅ Import complete: {imported_count} imported, {skipped_count} skipped")
-        print(f"   Status breakdown: {flagged_count} flagged, {pending_count} pending, {approved_count} approved")
+    """Queue an import of the Kaggle CSV data files
+    
+    supplier_quality_data.csv is imported if present, otherwise the
+    train/test split files, in shards that worker processes parse in
+    parallel. ?mode=replace (default) clears existing
+    data first; ?mode=incremental only inserts or updates rows whose
+    application_id is new or whose content changed. Returns 202 with the
+    job id at once; poll GET /jobs/<id> for progress.
+    """
+    mode = request.args.get('mode', 'replace')
+    if mode not in KAGGLE_IMPORT_MODES:
+        return jsonify({'error': f"Invalid mode. Use one of: {', '.join(KAGGLE_IMPORT_MODES)}"}), 400
+    
+    csv_files = find_kaggle_csvs()
+    if not csv_files:
+        return jsonify({'error': 'No CSV data file found. Please ensure data files exist in the data/ directory.'}), 404
+    if mode == 'incremental':
+        missing = [os.path.basename(path) for path in csv_files
+                   if 'application_id' not in pd.read_csv(path, nrows=0).columns]
+        if missing:
+            return jsonify({'error': f"Incremental import needs an application_id column in: {', '.join(missing)}"}), 400
+    
+    active = job_queue.active('kaggle_import', 'purge')
+    if active:
+        return jsonify({'error': f'An {active.kind} job is already in progress', 'job_id': active.id}), 409
+    
+    job = job_queue.enqueue('kaggle_import', {'paths': csv_files, 'mode': mode}, user_id=int(get_jwt_identity()))
+    print(f"📂 Queued {mode} import job {job.id} for {', '.join(csv_files)}")
+    
+    return jsonify({
+        'message': 'Import queued',
+        'job_id': job.id,
+        'mode': mode,
+        'files': [os.path.basename(path) for path in csv_files],
+        'status': job.status,
+        'status_url': f'{Config.API_PREFIX}/jobs/{job.id}'
+    }), 202
+
+
+@app.route(f'{Config.API_PREFIX}/jobs/<int:job_id>', methods=['GET'])
+@role_required('admin')
+def get_job(job_id):
+    """Progress of a background job: rows processed, throughput and errors"""
+    job = ImportJob.query.get_or_404(job_id)
+    return jsonify(job_progress(job)), 200
+
+
+# ============== DATA RETENTION ==============
+
+# Foreign keys of the rows deleted along with their application
+APPLICATION_CHILD_KEYS = [
+    PIIData.application_id, SecurityControl.application_id, ApplicationComment.application_id,
+    Document.application_id, DocumentUpload.application_id, AuditLog.application_id
+]
+# Child tables a purge of every application may TRUNCATE (documents and uploads
+# have files to remove and audit_logs also holds entries that aren't about applications)
+TRUNCATABLE_CHILD_TABLES = [PIIData.__table__, SecurityControl.__table__, ApplicationComment.__table__]
+# Application fields the dashboard counters need to subtract purged rows
+PURGE_COUNTER_COLUMNS = [
+    Application.type, Application.status, Application.risk_score, Application.fraud_score,
+    Application.fraud_model_type, Application.fraud_risk_level, Application.submitted_date
+]
+
+
+def remove_files(paths):
+    """Delete files from disk, ignoring ones that are already gone"""
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def purge_criteria(older_than_days=None, imported_only=False, statuses=None, now=None):
+    """Application filters for a purge; an empty list matches every application"""
+    criteria = []
+    if older_than_days is not None:
+        criteria.append(Application.submitted_date < (now or datetime.utcnow()) - timedelta(days=older_than_days))
+    if imported_only:
+        criteria.append(Application.fraud_model_type == 'kaggle_import')
+    if statuses:
+        criteria.append(Application.status.in_(statuses))
+    return criteria
+
+
+def purge_applications(criteria=(), batch_size=None):
+    """Delete the applications matching criteria, and the rows that hang off them, in batches
+    
+    A generator: after deleting each range of PURGE_BATCH_SIZE ids it yields
+    the number of applications deleted so far, and the caller commits
+    before asking for more. With criteria, dashboard counters are
+    decremented in the same transaction, so they stay exact between
+    batches. A purge of everything instead rebuilds them once the last
+    batch is done (cheap, as little or nothing is left), which also
+    covers applications added while it ran; on PostgreSQL it TRUNCATEs
+    the simple child tables up front. Document files are removed once
+    their batch is committed.
+    """
+    batch_size = batch_size or app.config.get('PURGE_BATCH_SIZE', 1000)
+    child_keys = APPLICATION_CHILD_KEYS
+    deleted = 0
+    for first, last, count in id_ranges(db.session, Application.id, criteria, batch_size):
+        if not criteria and not deleted and truncate_tables(db.session, TRUNCATABLE_CHILD_TABLES):
+            child_keys = [Document.application_id, DocumentUpload.application_id, AuditLog.application_id]
+        batch = [Application.id.between(first, last), *criteria]
+        batch_ids = select(Application.id).where(*batch)
+        files = db.session.scalars(
+            select(Document.file_path).where(Document.application_id.in_(batch_ids))
+            .union_all(select(DocumentUpload.part_path).where(DocumentUpload.application_id.in_(batch_ids)))
+        ).all()
         
-        return jsonify({
-            'message': 'Data imported successfully',
-            'imported': imported_count,
-            'skipped': skipped_count,
-            'total': len(df),
-            'status_breakdown': {
-                'flagged': flagged_count,
-                'pending': pending_count,
-                'approved': approved_count
-            }
-        }), 200
+        if criteria:
+            dashboard_counters.record(db.session.query(*PURGE_COUNTER_COLUMNS).filter(*batch).all(), sign=-1)
+        delete_batch(db.session, Application.id, batch, child_keys)
+        response_cache.invalidate_on_commit('applications', 'analytics')
+        deleted += count
+        yield deleted
+        remove_files(files)
+    if not criteria:
+        dashboard_counters.reconcile()
+
+
+def vacuum_applications():
+    """Give the space freed by a purge back to the database (see purge.vacuum)"""
+    vacuum(db.engine, [Application.__table__] + [key.table for key in APPLICATION_CHILD_KEYS])
+
+
+@job_queue.handler('purge')
+def run_purge(job):
+    """Purge the applications matching the job's filters, committing each batch with a checkpoint
+    
+    older_than_days counts back from when the job was queued, so a resumed
+    job purges the same applications.
+    """
+    params = job.params
+    criteria = purge_criteria(
+        params.get('older_than_days'), params.get('imported_only'), params.get('statuses'), now=job.created_at
+    )
+    done = job.rows_processed
+    if job.total_rows is None:
+        job_queue.checkpoint(job, total_rows=db.session.query(func.count(Application.id)).filter(*criteria).scalar())
     
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error importing data: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': f'Failed to import data: {str(e)}'}), 500
+    deleted = 0
+    for deleted in purge_applications(criteria):
+        job_queue.checkpoint(job, rows_processed=done + deleted, stats={'deleted': done + deleted})
+    if params.get('vacuum'):
+        vacuum_applications()
+    print(f"✅ Purged {done + deleted} applications")
+    return {'stats': {'deleted': done + deleted}}
+
+
+@app.route(f'{Config.API_PREFIX}/applications/purge', methods=['POST'])
+@role_required('admin')
+def purge_applications_job():
+    """Queue a batched purge of applications (retention)
+    
+    JSON body: older_than_days, imported_only, statuses (a list) and
+    vacuum. At least one filter is required, or "all": true to purge every
+    application. Returns 202 with the job id; poll GET /jobs/<id>.
+    """
+    data = request.get_json(silent=True) or {}
+    older_than_days = data.get('older_than_days')
+    statuses = data.get('statuses')
+    if older_than_days is not None and (type(older_than_days) is not int or older_than_days < 0):
+        return jsonify({'error': 'older_than_days must be a non-negative integer'}), 400
+    if statuses is not None and (not isinstance(statuses, list) or not all(isinstance(s, str) for s in statuses)):
+        return jsonify({'error': 'statuses must be a list of strings'}), 400
+    
+    params = {
+        'older_than_days': older_than_days,
+        'imported_only': bool(data.get('imported_only')),
+        'statuses': statuses,
+        'vacuum': bool(data.get('vacuum'))
+    }
+    if not purge_criteria(params['older_than_days'], params['imported_only'], params['statuses']) and not data.get('all'):
+        return jsonify({'error': 'Give at least one filter, or "all": true to purge every application'}), 400
+    
+    active = job_queue.active('kaggle_import', 'purge')
+    if active:
+        return jsonify({'error': f'An {active.kind} job is already in progress', 'job_id': active.id}), 409
+    
+    user_id = int(get_jwt_identity())
+    log_audit(None, user_id, 'APPLICATIONS_PURGED', f"Purge queued with filters {params}", request.remote_addr)
+    job = job_queue.enqueue('purge', params, user_id=user_id)
+    
+    return jsonify({
+        'message': 'Purge queued',
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': f'{Config.API_PREFIX}/jobs/{job.id}'
+    }), 202
 
 
 # ============== INITIALIZE DATABASE ==============
@@ -1374,6 +2182,13 @@ def create_tables():
     try:
         with app.app_context():
             db.create_all()
+            for number, name in migrate(db.engine):
+                print(f"✓ Applied migration {number:03d} {name}")
+            search_index.detect(db.engine)
+            
+            replayed = audit_writer.replay_fallback()
+            if replayed:
+                print(f"✓ Replayed {replayed} audit events from fallback file")
             
             # Create default admin user if not exists
             if not User.query.filter_by(username='admin').first():
@@ -0,0 +1,202 @@
+"""
+Group-commit audit log writer
+
+Audit events are attached to the SQLAlchemy session that produced them and
+handed to a background thread only once that session commits, so a rolled
+back request never leaves audit rows behind. The thread writes them to the
+audit table with one multi-row INSERT every AUDIT_BATCH_SIZE events or
+AUDIT_FLUSH_INTERVAL_MS milliseconds, whichever comes first.
+
+Events that cannot be written (database down, process exiting) are appended
+to a JSON-lines fallback file and replayed on the next startup.
+
+In sync mode (AUDIT_MODE=sync, or app.testing) events are added to the
+caller's session and committed with the rest of the request.
+"""
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from sqlalchemy import event, insert
+
+PENDING_KEY = 'pending_audit_events'
+
+
+class AuditWriter:
+    """Batches audit log inserts off the request path"""
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self.model = None
+        self.mode = 'async'
+        self.batch_size = 100
+        self.flush_interval = 0.25
+        self.fallback_path = None
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def init_app(self, app, db, model):
+        """Bind to the Flask app, its SQLAlchemy instance and the audit model"""
+        self.db = db
+        self.model = model
+        self.app = app
+        self.mode = app.config.get('AUDIT_MODE', 'async')
+        self.batch_size = int(app.config.get('AUDIT_BATCH_SIZE', 100))
+        self.flush_interval = int(app.config.get('AUDIT_FLUSH_INTERVAL_MS', 250)) / 1000.0
+        self.fallback_path = app.config.get('AUDIT_FALLBACK_PATH') or os.path.join(
+            app.instance_path, 'audit_fallback.jsonl'
+        )
+
+        event.listen(db.session, 'after_commit', self._on_commit)
+        event.listen(db.session, 'after_rollback', self._on_rollback)
+        atexit.register(self.shutdown)
+        app.extensions['audit_writer'] = self
+
+    @property
+    def sync(self):
+        """True with AUDIT_MODE=sync or under app.testing (checked per event, since tests set it after import)"""
+        return self.mode == 'sync' or (self.app is not None and self.app.testing)
+
+    # ---- producer side ----
+
+    def log(self, application_id, user_id, action, details, ip_address):
+        """Record an audit event as part of the current session's transaction"""
+        row = {
+            'application_id': application_id,
+            'user_id': user_id,
+            'action': action,
+            'details': details,
+            'ip_address': ip_address,
+            'timestamp': datetime.utcnow()
+        }
+        if self.sync:
+            self.db.session.add(self.model(**row))
+        else:
+            self.db.session.info.setdefault(PENDING_KEY, []).append(row)
+
+    def log_many(self, events):
+        """Record (application_id, user_id, action, details, ip_address) tuples like log(), with one INSERT in sync mode"""
+        timestamp = datetime.utcnow()
+        rows = [{
+            'application_id': application_id,
+            'user_id': user_id,
+            'action': action,
+            'details': details,
+            'ip_address': ip_address,
+            'timestamp': timestamp
+        } for application_id, user_id, action, details, ip_address in events]
+        if not rows:
+            return
+        if self.sync:
+            self.db.session.execute(insert(self.model), rows)
+        else:
+            self.db.session.info.setdefault(PENDING_KEY, []).extend(rows)
+
+    def _on_commit(self, session):
+        rows = session.info.pop(PENDING_KEY, None)
+        if rows:
+            self._ensure_thread()
+            for row in rows:
+                self._queue.put(row)
+
+    def _on_rollback(self, session):
+        session.info.pop(PENDING_KEY, None)
+
+    # ---- consumer side ----
+
+    def _ensure_thread(self):
+        # Start lazily, and again after a fork (e.g. gunicorn --preload)
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+
+    def _collect(self):
+        """Block for the first event, then gather until the batch is full or the interval elapses"""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _drain(self):
+        batch = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _write(self, rows):
+        """Insert rows with one multi-row INSERT, spilling to the fallback file on failure"""
+        try:
+            with self.app.app_context():
+                with self.db.engine.begin() as conn:
+                    for start in range(0, len(rows), self.batch_size):
+                        conn.execute(insert(self.model.__table__).values(rows[start:start + self.batch_size]))
+        except Exception as e:
+            print(f"⚠️ Audit flush failed, writing {len(rows)} events to {self.fallback_path}: {e}")
+            self._spill(rows)
+
+    def _spill(self, rows):
+        os.makedirs(os.path.dirname(self.fallback_path), exist_ok=True)
+        with open(self.fallback_path, 'a') as f:
+            for row in rows:
+                f.write(json.dumps(dict(row, timestamp=row['timestamp'].isoformat())) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def flush(self):
+        """Synchronously write everything queued so far"""
+        rows = self._drain()
+        if rows:
+            self._write(rows)
+
+    def replay_fallback(self):
+        """Insert events left in the fallback file by a previous run"""
+        if not self.fallback_path or not os.path.exists(self.fallback_path):
+            return 0
+        replaying = self.fallback_path + '.replay'
+        os.replace(self.fallback_path, replaying)
+        with open(replaying) as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        for row in rows:
+            row['timestamp'] = datetime.fromisoformat(row['timestamp'])
+        if rows:
+            self._write(rows)
+        os.remove(replaying)
+        return len(rows)
+
+    def shutdown(self):
+        """Stop the writer thread and persist anything still queued"""
+        self._stopping.set()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval * 4)
+        self.flush()
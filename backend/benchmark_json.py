@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+JSON encoder benchmark for API responses
+
+Builds a scratch SQLite database, captures the objects the real
+get_applications and get_application endpoints hand to the JSON provider,
+and times encoding them with the stdlib and orjson paths of
+FastJSONProvider, both on their own and as full test-client requests.
+
+    python benchmark_json.py --rows 20000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Compare stdlib and orjson response encoding')
+    parser.add_argument('--rows', type=int, default=20_000, help='Number of applications to generate')
+    parser.add_argument('--repeat', type=int, default=200, help='Encodings per payload')
+    return parser.parse_args()
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+def main():
+    args = parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='onboarding-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['AUDIT_MODE'] = 'sync'
+    os.environ['CACHE_BACKEND'] = 'none'
+    # Above the default cap of 200, so the 500-row list case serves 500 rows
+    os.environ['MAX_PER_PAGE'] = '500'
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from flask_jwt_extended import create_access_token
+    import app as api
+    from benchmark_query_plans import populate
+    from json_provider import FastJSONProvider, orjson
+
+    if orjson is None:
+        print("orjson is not installed; only the stdlib encoder can be measured")
+
+    captured = []
+
+    class CapturingProvider(FastJSONProvider):
+        def response(self, *a, **kw):
+            captured.append(self._prepare_response_obj(a, kw))
+            return super().response(*a, **kw)
+
+    stdlib = FastJSONProvider(api.app)
+    stdlib.fast = False
+    fast = FastJSONProvider(api.app)
+    encoders = [('stdlib', stdlib)] + ([('orjson', fast)] if fast.fast else [])
+
+    with api.app.app_context():
+        print(f"Generating {args.rows} applications in {workdir}...")
+        populate(api.db, (api.Application, api.AuditLog, api.ApplicationComment), args.rows)
+        api.dashboard_counters.reconcile()
+        detail_id = 5
+        application = api.db.session.get(api.Application, detail_id)
+        application.description = 'Benchmark supplier ' * 20
+        application.fraud_detection_result = {
+            'is_fraud': False, 'fraud_score': 0.12, 'risk_level': 'low',
+            'model_scores': {name: 0.1 for name in ('random_forest', 'gradient_boosting', 'svm', 'isolation_forest')}
+        }
+        for i in range(50):
+            api.db.session.add(api.ApplicationComment(application_id=detail_id, user_id=1, comment=f'Comment {i}'))
+            api.db.session.add(api.AuditLog(application_id=detail_id, user_id=1, action='APPLICATION_VIEWED'))
+        api.db.session.commit()
+
+        headers = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+        client = api.app.test_client()
+        scenarios = [
+            ('list: 50 rows', '/api/v1/applications?per_page=50'),
+            ('list: 500 rows', '/api/v1/applications?per_page=500'),
+            ('detail: 50 comments + logs', f'/api/v1/applications/{detail_id}'),
+            ('dashboard', '/api/v1/analytics/dashboard'),
+        ]
+
+        api.app.json = CapturingProvider(api.app)
+        payloads = []
+        for name, url in scenarios:
+            captured.clear()
+            assert client.get(url, headers=headers).status_code == 200, url
+            payloads.append(captured[-1])
+
+        print("\n" + "=" * 70)
+        for (name, url), payload in zip(scenarios, payloads):
+            size = len(stdlib.dumps(payload))
+            print(f"\n{name} ({size / 1024:.1f} KB)")
+            for label, provider in encoders:
+                encode = median_ms(lambda: provider.response(payload), args.repeat)
+                api.app.json = provider
+                request = median_ms(lambda: client.get(url, headers=headers), max(args.repeat // 10, 5))
+                print(f"  {label:7s} encode {encode:8.3f} ms   request {request:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Query plan benchmark for the schema migrations
+
+Builds a scratch SQLite database, fills it with synthetic applications,
+audit logs and comments, then calls the real list/detail endpoints through
+the Flask test client. Every SQL statement they issue is captured and run
+through EXPLAIN QUERY PLAN, first with the secondary indexes dropped (the
+pre-migration schema) and again after migrations.migrate() has recreated
+them.
+
+    python benchmark_query_plans.py --rows 100000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Compare query plans before and after index migrations')
+    parser.add_argument('--rows', type=int, default=100_000, help='Number of applications to generate')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed requests per scenario')
+    return parser.parse_args()
+
+
+def populate(db, models, n_rows):
+    """Bulk insert synthetic applications with audit logs and comments"""
+    from sqlalchemy import insert
+    Application, AuditLog, ApplicationComment = models
+
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    statuses = ['pending_review', 'approved', 'flagged']
+    types = ['vendor', 'client']
+    chunk = 10_000
+
+    for start in range(0, n_rows, chunk):
+        n = min(chunk, n_rows - start)
+        apps = [{
+            'id': start + i + 1,
+            'type': rng.choice(types),
+            'company_name': f'Company {start + i}',
+            'email': f'contact{start + i}@example.com',
+            'status': rng.choice(statuses),
+            'risk_score': rng.uniform(0, 100),
+            'fraud_score': rng.random(),
+            'controls_mask': rng.getrandbits(15),
+            'submitted_date': now - timedelta(minutes=rng.randint(0, 525_600))
+        } for i in range(n)]
+        db.session.execute(insert(Application), apps)
+        db.session.execute(insert(AuditLog), [{
+            'application_id': a['id'],
+            'user_id': 1,
+            'action': 'APPLICATION_CREATED',
+            'details': 'benchmark',
+            'timestamp': a['submitted_date']
+        } for a in apps])
+        db.session.execute(insert(ApplicationComment), [{
+            'application_id': a['id'],
+            'user_id': 1,
+            'comment': 'benchmark',
+            'created_at': a['submitted_date']
+        } for a in apps if a['id'] % 5 == 0])
+        db.session.commit()
+
+
+def run_scenarios(client, headers, engine, scenarios, repeat):
+    """Call each scenario, capturing its SQL, plans and median latency"""
+    from sqlalchemy import event
+
+    results = {}
+    for name, url in scenarios:
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                statements.append((statement, parameters))
+
+        event.listen(engine, 'before_cursor_execute', capture)
+        response = client.get(url, headers=headers)
+        event.remove(engine, 'before_cursor_execute', capture)
+        assert response.status_code == 200, (url, response.status_code, response.get_data(as_text=True))
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            client.get(url, headers=headers)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+
+        plans = []
+        with engine.connect() as conn:
+            for statement, parameters in statements:
+                rows = conn.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+                plans.append([row[-1] for row in rows])
+        results[name] = (timings[len(timings) // 2], plans)
+    return results
+
+
+def main():
+    args = parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='onboarding-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ['AUDIT_MODE'] = 'sync'
+    os.environ['CACHE_BACKEND'] = 'none'
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    from sqlalchemy import text
+    from flask_jwt_extended import create_access_token
+    import app as api
+    from migrations import INDEXES, migrate
+
+    with api.app.app_context():
+        engine = api.db.engine
+        print(f"Generating {args.rows} applications in {workdir}...")
+        populate(api.db, (api.Application, api.AuditLog, api.ApplicationComment), args.rows)
+
+        token = create_access_token(identity='1')
+        headers = {'Authorization': f'Bearer {token}'}
+        client = api.app.test_client()
+
+        first_page = client.get('/api/v1/applications?cursor=&per_page=50', headers=headers).get_json()
+        deep_cursor = first_page['next_cursor']
+        for _ in range(20):
+            deep_cursor = client.get(
+                f'/api/v1/applications?cursor={deep_cursor}&per_page=50', headers=headers
+            ).get_json()['next_cursor']
+        app_id = args.rows // 2 - (args.rows // 2) % 5
+
+        scenarios = [
+            ('list: status filter, first page', '/api/v1/applications?status=flagged&per_page=50'),
+            ('list: type + status filter', '/api/v1/applications?status=approved&type=vendor&per_page=50'),
+            ('list: risk range', '/api/v1/applications?min_risk=90&max_risk=95&cursor=&per_page=50'),
+            ('list: keyset page 21', f'/api/v1/applications?cursor={deep_cursor}&per_page=50'),
+            ('detail: application', f'/api/v1/applications/{app_id}'),
+            ('comments: application', f'/api/v1/applications/{app_id}/comments'),
+            ('audit logs: keyset first page', '/api/v1/audit-logs?cursor=&per_page=50'),
+        ]
+
+        with engine.begin() as conn:
+            for name, _, _ in INDEXES:
+                conn.execute(text(f'DROP INDEX IF EXISTS {name}'))
+            conn.execute(text('DELETE FROM schema_migrations WHERE version >= 2'))
+        before = run_scenarios(client, headers, engine, scenarios, args.repeat)
+
+        applied = migrate(engine)
+        print(f"Applied migrations: {', '.join(f'{n:03d} {name}' for n, name in applied)}")
+        after = run_scenarios(client, headers, engine, scenarios, args.repeat)
+
+    print("\n" + "=" * 70)
+    for name, _ in scenarios:
+        before_time, before_plans = before[name]
+        after_time, after_plans = after[name]
+        print(f"\n{name}: {before_time * 1000:.1f} ms -> {after_time * 1000:.1f} ms")
+        for label, plans in (('before', before_plans), ('after', after_plans)):
+            for plan in plans:
+                print(f"  {label:6s} | {' / '.join(plan)}")
+
+
+if __name__ == '__main__':
+    main()
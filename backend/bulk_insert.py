@@ -0,0 +1,102 @@
+"""
+Bulk row loading for imports
+
+insert_rows() loads a list of row dicts into a table inside the session's
+transaction. On PostgreSQL (psycopg2) it streams them with COPY, taking
+primary keys from the table's sequence up front when the caller needs the
+new ids. Elsewhere it uses one executemany INSERT; SQLite ids are read back
+from the new max(id), other databases use RETURNING.
+
+COPY skips SQLAlchemy's Python-side column defaults, so those are filled
+in here before the rows are written.
+"""
+import json
+from io import StringIO
+from sqlalchemy import JSON, func, insert, select, text
+
+COPY_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'})
+
+
+def _copy_supported(session):
+    bind = session.get_bind()
+    return bind.dialect.name == 'postgresql' and bind.dialect.driver == 'psycopg2'
+
+
+def _defaults(table, columns):
+    """{name: default value} for the columns with a Python-side default that rows don't set"""
+    defaults = {}
+    for column in table.columns:
+        default = column.default
+        if column.name in columns or default is None:
+            continue
+        if default.is_scalar:
+            defaults[column.name] = default.arg
+        elif default.is_callable:
+            defaults[column.name] = default.arg(None)
+    return defaults
+
+
+def _copy_value(value):
+    """One field of COPY's text format: \\N for NULL, with backslashes and separators escaped"""
+    if value is None:
+        return '\\N'
+    return str(value).translate(COPY_ESCAPES)
+
+
+def allocate_ids(session, table, count):
+    """Reserve count primary keys from the id sequence of a PostgreSQL table"""
+    return session.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count)"),
+        {'table': table.name, 'count': count}
+    ).scalars().all()
+
+
+def copy_rows(session, table, rows):
+    """COPY row dicts into a PostgreSQL table on the session's connection"""
+    columns = list(rows[0])
+    defaults = _defaults(table, columns)
+    columns += list(defaults)
+    json_columns = {c.name for c in table.columns if isinstance(c.type, JSON)}
+
+    buffer = StringIO()
+    for row in rows:
+        values = {**defaults, **row}
+        buffer.write('\t'.join(
+            _copy_value(json.dumps(values[c]) if c in json_columns and values[c] is not None else values[c])
+            for c in columns
+        ) + '\n')
+    buffer.seek(0)
+
+    cursor = session.connection().connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f'COPY {table.name} ({", ".join(columns)}) FROM STDIN',
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def insert_rows(session, table, rows, return_ids=False):
+    """Bulk-insert row dicts into table; returns their new ids in row order if return_ids"""
+    if not rows:
+        return []
+    if _copy_supported(session):
+        ids = []
+        if return_ids:
+            ids = allocate_ids(session, table, len(rows))
+            rows = [dict(row, id=row_id) for row, row_id in zip(rows, ids)]
+        copy_rows(session, table, rows)
+        return ids
+    if return_ids and session.get_bind().dialect.name != 'sqlite':
+        return session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+    session.execute(insert(table), rows)
+    if not return_ids:
+        return []
+    # SQLite has one writer at a time and gives each new row max(id) + 1, so
+    # one executemany gets consecutive ids ending at the new max. (RETURNING
+    # with sort_by_parameter_order falls back to a statement per row there.)
+    last = session.execute(select(func.max(table.c.id))).scalar()
+    return list(range(last - len(rows) + 1, last + 1))
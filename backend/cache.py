@@ -0,0 +1,223 @@
+"""
+Response cache for the list and analytics endpoints
+
+Cached views are keyed on the endpoint, the current version of each of
+their tags and a hash of the normalized query args. Invalidating a tag just
+bumps its version, so every key built on the old version stops matching and
+ages out through its TTL (or LRU eviction) without a scan.
+
+Redis (REDIS_URL) is used when it answers a ping on first use; otherwise, or
+with CACHE_BACKEND=local or in testing, an in-process LRU is used. The LRU
+is per process, so with several gunicorn workers only Redis gives
+cross-worker invalidation. CACHE_BACKEND=none disables caching.
+
+Writes invalidate tags with invalidate_on_commit(), which waits for the
+surrounding transaction to commit so a concurrent request can't re-cache
+data from before the write.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+from flask import current_app, request
+from sqlalchemy import event
+
+PENDING_KEY = 'pending_cache_invalidations'
+
+
+class LocalCache:
+    """Thread-safe in-process LRU with per-entry TTLs"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return [self._tags.get(tag, 0) for tag in tags]
+
+    def bump_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._tags[tag] = self._tags.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class RedisCache:
+    """Redis-backed cache; errors are treated as misses so Redis going away never fails a request"""
+
+    def __init__(self, client, prefix='onboarding:cache:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        try:
+            return self.client.get(self.prefix + key)
+        except Exception:
+            return None
+
+    def set(self, key, value, ttl):
+        try:
+            self.client.set(self.prefix + key, value, ex=ttl)
+        except Exception:
+            pass
+
+    def tag_versions(self, tags):
+        try:
+            return [int(v or 0) for v in self.client.mget([f'{self.prefix}tag:{tag}' for tag in tags])]
+        except Exception:
+            return None
+
+    def bump_tags(self, tags):
+        try:
+            pipe = self.client.pipeline()
+            for tag in tags:
+                pipe.incr(f'{self.prefix}tag:{tag}')
+            pipe.execute()
+        except Exception as e:
+            print(f"⚠️ Cache invalidation failed for {', '.join(tags)}: {e}")
+
+    def clear(self):
+        try:
+            keys = list(self.client.scan_iter(match=self.prefix + '*'))
+            if keys:
+                self.client.delete(*keys)
+        except Exception:
+            pass
+
+
+def _connect_redis(url):
+    """Return a RedisCache if url is reachable, else None"""
+    try:
+        import redis
+        client = redis.Redis.from_url(url, socket_connect_timeout=0.5, socket_timeout=0.5)
+        client.ping()
+        return RedisCache(client)
+    except Exception as e:
+        print(f"⚠️ Redis unavailable ({e}), using in-process cache")
+        return None
+
+
+class ResponseCache:
+    """Caches JSON responses of view functions by endpoint, tags and query args"""
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self.default_ttl = 60
+        self._backend = None
+        self._resolved = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db):
+        self.app = app
+        self.db = db
+        self.default_ttl = int(app.config.get('CACHE_TTL', 60))
+
+        event.listen(db.session, 'after_commit', self._on_commit)
+        event.listen(db.session, 'after_rollback', self._on_rollback)
+        app.extensions['response_cache'] = self
+
+    @property
+    def backend(self):
+        """The cache backend, chosen on first use
+
+        Not in init_app, which runs at import: by first use a test has set
+        app.testing, and an unused web process never connects to Redis.
+        """
+        if not self._resolved:
+            with self._lock:
+                if not self._resolved:
+                    self._backend = self._make_backend()
+                    self._resolved = True
+        return self._backend
+
+    def _make_backend(self):
+        config = self.app.config
+        mode = config.get('CACHE_BACKEND', 'auto')
+        if mode == 'none':
+            return None
+        if mode == 'local' or self.app.testing:
+            return LocalCache(int(config.get('CACHE_MAX_ENTRIES', 1024)))
+        return _connect_redis(config.get('REDIS_URL')) or LocalCache(int(config.get('CACHE_MAX_ENTRIES', 1024)))
+
+    def cache_key(self, tags):
+        """Key for the current request, or None if tag versions can't be read"""
+        versions = self.backend.tag_versions(tags)
+        if versions is None:
+            return None
+        args = urlencode(sorted((k, v.strip()) for k, v in request.args.items(multi=True)))
+        digest = hashlib.sha1(args.encode()).hexdigest()
+        tag_part = ','.join(f'{tag}.{version}' for tag, version in zip(tags, versions))
+        return f'{request.endpoint}:{tag_part}:{digest}'
+
+    def cached(self, tags, ttl=None):
+        """Decorator caching successful JSON responses of a view"""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if self.backend is None:
+                    return fn(*args, **kwargs)
+                key = self.cache_key(tags)
+                if key is not None:
+                    body = self.backend.get(key)
+                    if body is not None:
+                        response = current_app.response_class(body, mimetype='application/json')
+                        response.headers['X-Cache'] = 'HIT'
+                        return response
+
+                response = current_app.make_response(fn(*args, **kwargs))
+                if key is not None and response.status_code == 200:
+                    self.backend.set(key, response.get_data(), ttl or self.default_ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *tags):
+        """Bump tags immediately"""
+        if self.backend is not None and tags:
+            self.backend.bump_tags(tags)
+
+    def invalidate_on_commit(self, *tags):
+        """Bump tags once the current session's transaction commits"""
+        self.db.session.info.setdefault(PENDING_KEY, set()).update(tags)
+
+    def _on_commit(self, session):
+        tags = session.info.pop(PENDING_KEY, None)
+        if tags:
+            self.invalidate(*sorted(tags))
+
+    def _on_rollback(self, session):
+        session.info.pop(PENDING_KEY, None)
@@ -18,4 +18,60 @@ class Config:
     
     # API settings
     API_PREFIX = '/api/v1'
+    # Largest page the list endpoints will return (per_page is capped to it)
+    MAX_PER_PAGE = int(os.getenv('MAX_PER_PAGE', 200))
+    
+    # Bulk submission limits
+    BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', 5000))
+    BATCH_CHUNK_SIZE = int(os.getenv('BATCH_CHUNK_SIZE', 500))
+    
+    # CSV imports are split into shards of about this many bytes (one
+    # transaction each), parsed by IMPORT_WORKERS processes (0 = one per core)
+    IMPORT_SHARD_BYTES = int(os.getenv('IMPORT_SHARD_BYTES', 1 << 20))
+    IMPORT_WORKERS = int(os.getenv('IMPORT_WORKERS', 0))
+    
+    # Applications deleted per transaction by purges and replace imports
+    PURGE_BATCH_SIZE = int(os.getenv('PURGE_BATCH_SIZE', 1000))
+    
+    # Document uploads are read UPLOAD_CHUNK_SIZE bytes at a time. Resumable
+    # uploads allow larger files, sent in RESUMABLE_CHUNK_SIZE pieces, and are
+    # dropped after RESUMABLE_UPLOAD_TTL_HOURS without a new chunk
+    UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', 10 * 1024 * 1024))
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 64 * 1024))
+    RESUMABLE_UPLOAD_MAX_SIZE = int(os.getenv('RESUMABLE_UPLOAD_MAX_SIZE', 100 * 1024 * 1024))
+    RESUMABLE_CHUNK_SIZE = int(os.getenv('RESUMABLE_CHUNK_SIZE', 5 * 1024 * 1024))
+    RESUMABLE_UPLOAD_TTL_HOURS = int(os.getenv('RESUMABLE_UPLOAD_TTL_HOURS', 24))
+    
+    # Background jobs: 'thread' runs a worker thread in each web process,
+    # 'external' leaves jobs to `python jobs.py` worker processes
+    JOB_RUNNER = os.getenv('JOB_RUNNER', 'thread')
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1.0))
+    JOB_STALE_SECONDS = int(os.getenv('JOB_STALE_SECONDS', 300))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    
+    # Audit log writer: 'async' batches inserts in a background thread,
+    # 'sync' writes them in the request's own transaction (tests)
+    AUDIT_MODE = os.getenv('AUDIT_MODE', 'async')
+    AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', 100))
+    AUDIT_FLUSH_INTERVAL_MS = int(os.getenv('AUDIT_FLUSH_INTERVAL_MS', 250))
+    AUDIT_FALLBACK_PATH = os.getenv('AUDIT_FALLBACK_PATH')
+    
+    # Response cache: 'auto' uses Redis at REDIS_URL if reachable, else an
+    # in-process LRU; 'local' forces the LRU, 'none' disables caching
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'auto')
+    CACHE_TTL = int(os.getenv('CACHE_TTL', 60))
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+    
+    # Seconds a worker trusts its cached copy of a user's role and token
+    # version, and how many users it keeps
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 30))
+    USER_CACHE_MAX_ENTRIES = int(os.getenv('USER_CACHE_MAX_ENTRIES', 10000))
+    
+    # Rows per chunk read from the database and flushed to the client by streamed exports
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 1000))
+    # Rows per Parquet row group / Arrow record batch
+    EXPORT_ROW_GROUP_SIZE = int(os.getenv('EXPORT_ROW_GROUP_SIZE', 10000))
+    
+    # JSON encoder: 'auto' uses orjson when installed, 'stdlib' forces Flask's default
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto')
 
@@ -0,0 +1,129 @@
+"""
+Streaming export encoders
+
+Each encoder takes rows read from the database with yield_per (so only
+one chunk is held at a time) and yields encoded byte chunks for a streamed
+Flask Response. Peak memory depends on the chunk size, not on the number
+of rows exported.
+
+Parquet and Arrow need pyarrow; arrow_available() reports whether it is
+installed.
+"""
+import csv
+import itertools
+import zlib
+from io import StringIO
+from sqlalchemy import Boolean, DateTime, Float, Integer
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+def csv_chunks(rows, header, to_values, chunk_size=1000):
+    """Yield CSV text as bytes, one chunk per chunk_size rows"""
+    output = StringIO()
+    writer = csv.writer(output)
+    writer.writerow(header)
+    for i, row in enumerate(rows, 1):
+        writer.writerow(to_values(row))
+        if i % chunk_size == 0:
+            yield output.getvalue().encode()
+            output.seek(0)
+            output.truncate()
+    yield output.getvalue().encode()
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip a stream of byte chunks on the fly"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def arrow_available():
+    """True if pyarrow is installed"""
+    return pa is not None
+
+
+def batched(rows, size):
+    """Split an iterator of rows into lists of at most size rows"""
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def arrow_type(column_type):
+    """Arrow type for a SQLAlchemy column type, or for 'bool'"""
+    if column_type == 'bool' or isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp('us')
+    return pa.string()
+
+
+class _ChunkSink:
+    """Write-only file object whose contents are drained after each row group"""
+
+    def __init__(self):
+        self.closed = False
+        self._parts = []
+        self._position = 0
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def arrow_chunks(batches, fields, fmt='parquet'):
+    """Yield a Parquet file ('parquet') or Arrow IPC stream ('arrow'), one row group per batch of {column: values}
+
+    fields is a list of (name, arrow type) pairs.
+    """
+    schema = pa.schema(fields)
+    sink = _ChunkSink()
+    if fmt == 'parquet':
+        writer = pq.ParquetWriter(sink, schema, compression='zstd')
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    for batch in batches:
+        writer.write_table(pa.Table.from_pydict(batch, schema=schema))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def ndjson_chunks(batches, dumps):
+    """Yield newline-delimited JSON, one chunk per batch of {column: values}"""
+    for batch in batches:
+        names = list(batch)
+        yield ''.join(dumps(dict(zip(names, values))) + '\n' for values in zip(*batch.values())).encode()
@@ -0,0 +1,105 @@
+"""
+Parallel CSV ingestion
+
+plan_shards() splits CSV files into byte ranges that start and end on
+record boundaries, so worker processes can parse them independently.
+read_shard() parses one range into a DataFrame. parallel_map() runs a
+transform over the shards in a process pool and yields the results in
+shard order to a single consumer, which does all the database writes.
+
+At most `window` shards are parsed ahead of the consumer, so memory stays
+bounded however far the workers get ahead of the writer.
+"""
+import itertools
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+import pandas as pd
+
+
+def _record_ends(f):
+    """Yield the offset after each CSV record, reading f from its current position
+
+    A line ends a record only when the quotes seen so far are balanced, so
+    quoted fields may contain newlines.
+    """
+    position = f.tell()
+    quotes = 0
+    for line in f:
+        position += len(line)
+        quotes += line.count(b'"')
+        if quotes % 2 == 0:
+            quotes = 0
+            yield position
+
+
+def plan_shards(paths, shard_bytes):
+    """Split CSV files into shards of about shard_bytes each
+
+    Returns a list of JSON-ready dicts: path, header_end, start, end, rows,
+    and first_row (the record number of the shard's first row, counted
+    across all the files).
+    """
+    shards = []
+    first_row = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            ends = _record_ends(f)
+            header_end = next(ends, None)
+            if header_end is None:
+                continue
+            start = last = header_end
+            rows = 0
+            for last in ends:
+                rows += 1
+                if last - start >= shard_bytes:
+                    shards.append(_shard(path, header_end, start, last, rows, first_row))
+                    first_row += rows
+                    start, rows = last, 0
+            if rows:
+                shards.append(_shard(path, header_end, start, last, rows, first_row))
+                first_row += rows
+    return shards
+
+
+def _shard(path, header_end, start, end, rows, first_row):
+    return {'path': path, 'header_end': header_end, 'start': start, 'end': end, 'rows': rows, 'first_row': first_row}
+
+
+def read_shard(shard, **read_csv_args):
+    """Parse one shard into a DataFrame indexed by record number"""
+    with open(shard['path'], 'rb') as f:
+        header = f.read(shard['header_end'])
+        f.seek(shard['start'])
+        body = f.read(shard['end'] - shard['start'])
+    df = pd.read_csv(BytesIO(header + body), **read_csv_args)
+    df.index = pd.RangeIndex(shard['first_row'], shard['first_row'] + len(df))
+    return df
+
+
+def parallel_map(fn, items, workers, window=None):
+    """Yield fn(item) for each item in order, computed in up to workers processes
+
+    With workers <= 1 everything runs in this process. Otherwise at most
+    window items (default twice the workers) are submitted ahead of the
+    result being consumed. Closing the generator cancels the rest.
+
+    Workers are spawned rather than forked: the caller runs threads (job
+    and audit workers, database pools) that a forked child would inherit
+    mid-operation. fn must therefore be importable at module level.
+    """
+    if workers <= 1:
+        yield from map(fn, items)
+        return
+    items = iter(items)
+    window = window or workers * 2
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        pending = deque(pool.submit(fn, item) for item in itertools.islice(items, window))
+        while pending:
+            result = pending.popleft().result()
+            pending.extend(pool.submit(fn, item) for item in itertools.islice(items, 1))
+            yield result
+    finally:
+        pool.shutdown(cancel_futures=True)
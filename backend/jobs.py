@@ -0,0 +1,267 @@
+"""
+Background job queue for long-running imports
+
+Endpoints enqueue a row in import_jobs and return its id at once. A worker
+claims queued jobs and runs their handler, which processes its input in
+chunks and calls checkpoint() after each one. The checkpoint commits in
+the same transaction as the chunk's own writes, so a job resumed from its
+last checkpoint never applies a chunk twice.
+
+While a handler runs, a heartbeat thread refreshes heartbeat_at every third
+of JOB_STALE_SECONDS, however long it goes between checkpoints (a slow chunk,
+a VACUUM). A job whose heartbeat is older than JOB_STALE_SECONDS therefore
+belongs to a worker that died; the next worker to poll claims it again and
+resumes it. A handler error requeues the job the same way until it has been
+attempted JOB_MAX_ATTEMPTS times, then marks it failed.
+
+JOB_RUNNER selects who runs jobs:
+
+    thread     a worker thread in each web process (default)
+    external   dedicated worker processes only: python jobs.py
+    inline     inside the request that enqueued them (app.testing)
+"""
+import os
+import socket
+import threading
+import traceback
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, update
+
+
+class JobLost(Exception):
+    """Raised by checkpoint() when another worker has claimed the job"""
+
+
+class JobQueue:
+    """Runs registered job handlers for rows of the jobs table"""
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self.model = None
+        self.configured_runner = 'thread'
+        self.poll_interval = 1.0
+        self.stale_after = timedelta(seconds=300)
+        self.max_attempts = 3
+        self._handlers = {}
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._wakeup = threading.Event()
+
+    def init_app(self, app, db, model):
+        self.app = app
+        self.db = db
+        self.model = model
+        self.configured_runner = app.config.get('JOB_RUNNER', 'thread')
+        self.poll_interval = float(app.config.get('JOB_POLL_INTERVAL', 1.0))
+        self.stale_after = timedelta(seconds=int(app.config.get('JOB_STALE_SECONDS', 300)))
+        self.max_attempts = int(app.config.get('JOB_MAX_ATTEMPTS', 3))
+        app.extensions['job_queue'] = self
+
+    @property
+    def runner(self):
+        """JOB_RUNNER, or inline under app.testing
+
+        Checked on every use rather than in init_app, which runs at import
+        before a test has had the chance to set app.testing.
+        """
+        return 'inline' if self.app is not None and self.app.testing else self.configured_runner
+
+    def handler(self, kind):
+        """Register fn(job) as the handler for jobs of this kind
+
+        The handler may return extra job fields to save on completion.
+        """
+        def decorator(fn):
+            self._handlers[kind] = fn
+            return fn
+        return decorator
+
+    # ---- producer side ----
+
+    def enqueue(self, kind, params=None, user_id=None, total_rows=None):
+        """Commit a new queued job and return it"""
+        job = self.model(kind=kind, params=params or {}, created_by=user_id, total_rows=total_rows)
+        self.db.session.add(job)
+        self.db.session.commit()
+        if self.runner == 'inline':
+            self.run_next()
+            self.db.session.refresh(job)
+        elif self.runner == 'thread':
+            self.ensure_worker()
+            self._wakeup.set()
+        return job
+
+    def active(self, *kinds):
+        """The oldest queued or running job of any of these kinds, if any"""
+        return self.model.query.filter(
+            self.model.kind.in_(kinds), self.model.status.in_(['queued', 'running'])
+        ).order_by(self.model.id).first()
+
+    # ---- worker side ----
+
+    @staticmethod
+    def worker_name():
+        return f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+
+    def _claimable(self, now):
+        model = self.model
+        return or_(
+            model.status == 'queued',
+            and_(model.status == 'running', model.heartbeat_at < now - self.stale_after)
+        )
+
+    def claim(self):
+        """Atomically take the oldest claimable job; returns it or None"""
+        model = self.model
+        now = datetime.utcnow()
+        candidates = self.db.session.query(model.id).filter(
+            self._claimable(now)
+        ).order_by(model.id).limit(5).all()
+        for (job_id,) in candidates:
+            # Compare-and-set: only one worker's UPDATE can still match
+            claimed = self.db.session.execute(
+                update(model).where(model.id == job_id, self._claimable(now)).values(
+                    status='running',
+                    worker=self.worker_name(),
+                    attempts=model.attempts + 1,
+                    started_at=func.coalesce(model.started_at, now),
+                    heartbeat_at=now
+                ).execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.session.commit()
+            if claimed:
+                return self.db.session.get(model, job_id, populate_existing=True)
+        return None
+
+    def checkpoint(self, job, **fields):
+        """Save progress fields on job and commit them with the session's pending writes"""
+        model = self.model
+        owned = self.db.session.execute(
+            update(model).where(model.id == job.id, model.worker == job.worker, model.status == 'running').values(
+                heartbeat_at=datetime.utcnow(), **fields
+            ).execution_options(synchronize_session=False)
+        ).rowcount
+        if not owned:
+            self.db.session.rollback()
+            raise JobLost(f'Job {job.id} was claimed by another worker')
+        self.db.session.commit()
+
+    def run_next(self):
+        """Claim and run one job; returns False if there was none"""
+        job = self.claim()
+        if job is None:
+            return False
+        handler = self._handlers.get(job.kind)
+        stop = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(job.id, job.worker, stop),
+                                name=f'job-{job.id}-heartbeat', daemon=True)
+        beat.start()
+        try:
+            if handler is None:
+                raise ValueError(f'No handler for job kind {job.kind}')
+            print(f"⚙️ Running job {job.id} ({job.kind}), attempt {job.attempts}")
+            fields = handler(job) or {}
+            self.checkpoint(job, status='completed', finished_at=datetime.utcnow(), error=None, **fields)
+            print(f"✅ Job {job.id} completed")
+        except JobLost as e:
+            print(f"⚠️ {e}")
+        except Exception as e:
+            self.db.session.rollback()
+            traceback.print_exc()
+            retry = job.attempts < self.max_attempts
+            self._fail(job, f'{type(e).__name__}: {e}', retry)
+            print(f"❌ Job {job.id} failed: {e}" + (' (will retry)' if retry else ''))
+        finally:
+            stop.set()
+            beat.join()
+        return True
+
+    def _heartbeat(self, job_id, worker, stop):
+        """Refresh a running job's heartbeat_at on its own connection until stop is set"""
+        model = self.model
+        interval = max(self.stale_after.total_seconds() / 3, 0.1)
+        with self.app.app_context():
+            while not stop.wait(interval):
+                try:
+                    with self.db.engine.begin() as conn:
+                        conn.execute(update(model).where(
+                            model.id == job_id, model.worker == worker, model.status == 'running'
+                        ).values(heartbeat_at=datetime.utcnow()))
+                except Exception as e:
+                    print(f"⚠️ Heartbeat for job {job_id} failed: {e}")
+
+    def _fail(self, job, message, retry):
+        model = self.model
+        self.db.session.execute(
+            update(model).where(model.id == job.id, model.worker == job.worker).values(
+                status='queued' if retry else 'failed',
+                error=message,
+                finished_at=None if retry else datetime.utcnow()
+            ).execution_options(synchronize_session=False)
+        )
+        self.db.session.commit()
+
+    def run_forever(self):
+        """Poll for jobs until stop() is called"""
+        while not self._stopping.is_set():
+            try:
+                with self.app.app_context():
+                    ran = self.run_next()
+            except Exception as e:
+                print(f"⚠️ Job worker error: {e}")
+                ran = False
+            if not ran:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+    def ensure_worker(self):
+        """Start this process's worker thread if JOB_RUNNER=thread (again after a fork)"""
+        if self.runner != 'thread':
+            return
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self.run_forever, name='job-worker', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self._wakeup.set()
+
+
+def job_progress(job):
+    """JSON-ready status of a job with its throughput in rows per second"""
+    end = job.finished_at or (job.heartbeat_at if job.status == 'running' else None) or datetime.utcnow()
+    elapsed = (end - job.started_at).total_seconds() if job.started_at else 0
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'total_rows': job.total_rows,
+        'rows_processed': job.rows_processed,
+        'rows_per_second': round(job.rows_processed / elapsed, 1) if elapsed > 0 else None,
+        'attempts': job.attempts,
+        'stats': job.stats or {},
+        'error': job.error,
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at
+    }
+
+
+if __name__ == '__main__':
+    os.environ['JOB_RUNNER'] = 'external'
+    from app import app, job_queue
+
+    print(f"👷 Job worker {job_queue.worker_name()} polling every {job_queue.poll_interval}s")
+    try:
+        job_queue.run_forever()
+    except KeyboardInterrupt:
+        job_queue.stop()
@@ -0,0 +1,117 @@
+"""
+Kaggle CSV transform
+
+Turns one shard of a Kaggle CSV (see ingest.plan_shards) into the
+application rows and masked PII the import writes. This runs in the
+import's worker processes, so it imports nothing that opens the database
+or the Flask app, only pandas and the pure helper modules.
+"""
+import hashlib
+import pandas as pd
+from ingest import read_shard
+from pii import detect_pii_frame, mask_pii
+from security_controls import pack_controls_frame
+
+# Kaggle import status rules: (fraud_score, risk_score) per status
+KAGGLE_IMPORT_SCORES = {
+    'flagged': (0.8, 30),
+    'approved': (0.05, 90),
+    'pending_review': (0.1, 75)
+}
+KAGGLE_APPROVAL_CONTROLS = [
+    'mfaEnabled', 'ssoSupport', 'encryptionAtRest', 'encryptionInTransit', 'firewallEnabled', 'gdprCompliant'
+]
+KAGGLE_TEXT_COLUMNS = ['phone', 'address', 'city', 'state', 'zip', 'tax_id', 'industry']
+# Read as strings so values (and content hashes) don't depend on the dtype pandas infers per chunk
+KAGGLE_STRING_COLUMNS = ['application_id', 'company_name', 'email'] + KAGGLE_TEXT_COLUMNS
+
+
+def content_hashes(df):
+    """SHA-1 of each row's CSV values, independent of column order and of int/float inference"""
+    parts = []
+    for name in sorted(df.columns):
+        values = df[name]
+        if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+            values = values.astype('Int64')
+        parts.append(f'{name}=' + values.astype(str).where(values.notna(), ''))
+    rows = parts[0].str.cat(parts[1:], sep='\x1f')
+    return rows.map(lambda row: hashlib.sha1(row.encode()).hexdigest())
+
+
+def kaggle_application_frame(df):
+    """Application column values for the importable rows of a Kaggle CSV DataFrame
+    
+    Rows without a company name or email are dropped. Status and scores come
+    from is_fraud and the security control flags, all computed column-wise.
+    Generated emails are numbered by df's index (the CSV record number).
+    Rows sharing an application_id keep only the last one.
+    """
+    def column(name, default=None):
+        return df[name] if name in df.columns else pd.Series(default, index=df.index, dtype=object)
+    
+    def text(values):
+        return values.astype(str).astype(object).where(values.notna(), None)
+    
+    if 'company_name' in df.columns:
+        company_name = df['company_name']
+    else:
+        company_name = 'Company ' + column('application_id', 'Unknown').astype(str)
+    keep = company_name.notna() & (company_name != '')
+    if 'email' in df.columns:
+        email = df['email']
+        keep &= email.notna() & (email != '')
+    else:
+        email = 'contact' + df.index.to_series(index=df.index).astype(str) + '@example.com'
+    
+    external_id = text(column('application_id'))
+    keep &= external_id.isna() | ~external_id.duplicated(keep='last')
+    
+    # Determine status based on is_fraud and security controls
+    is_fraud = column('is_fraud', 0)
+    security_count = df.reindex(columns=KAGGLE_APPROVAL_CONTROLS, fill_value=0).sum(axis=1, skipna=False)
+    status = pd.Series('pending_review', index=df.index, dtype=object)
+    status[(is_fraud == 0) & (security_count >= 10)] = 'approved'
+    status[is_fraud == 1] = 'flagged'
+    
+    fraud_results = {
+        name: {
+            'is_fraud': name == 'flagged',
+            'fraud_score': float(fraud_score),
+            'risk_level': 'high' if name == 'flagged' else 'low',
+            'model_type': 'kaggle_import'
+        }
+        for name, (fraud_score, _) in KAGGLE_IMPORT_SCORES.items()
+    }
+    
+    frame = pd.DataFrame({
+        'type': column('type', 'vendor').fillna('vendor').astype(str).str.lower(),
+        'company_name': text(company_name),
+        'email': text(email),
+        **{name: text(column(name)) for name in KAGGLE_TEXT_COLUMNS},
+        'status': status,
+        'risk_score': status.map({name: risk for name, (_, risk) in KAGGLE_IMPORT_SCORES.items()}),
+        'fraud_score': status.map({name: fraud for name, (fraud, _) in KAGGLE_IMPORT_SCORES.items()}),
+        'fraud_detection_result': status.map(fraud_results),
+        'fraud_model_type': 'kaggle_import',
+        'fraud_risk_level': status.map({name: result['risk_level'] for name, result in fraud_results.items()}),
+        'controls_mask': pack_controls_frame(df, numeric_only=True),
+        'external_id': external_id,
+        'content_hash': content_hashes(df)
+    }, index=df.index)
+    return frame[keep]
+
+
+def transform_kaggle_shard(shard):
+    """Parse one shard of a Kaggle CSV into (rows read, application frame, PII frame)
+    
+    Runs in an ingest worker process and touches no database. The PII
+    frame is indexed by the application's row label and holds the masked
+    values.
+    """
+    df = read_shard(shard, dtype={column: str for column in KAGGLE_STRING_COLUMNS})
+    frame = kaggle_application_frame(df)
+    pii = pd.DataFrame(
+        detect_pii_frame(df.loc[frame.index]), columns=['label', 'field_name', 'pii_type', 'value']
+    ).set_index('label')
+    pii['masked_value'] = [mask_pii(value, pii_type) for value, pii_type in zip(pii['value'], pii['pii_type'])]
+    return len(df), frame, pii.drop(columns='value')
@@ -0,0 +1,206 @@
+"""
+Versioned schema migrations
+
+db.create_all() creates missing tables but never alters existing ones, so
+every schema change made after a table first shipped is recorded here as a
+numbered migration. Applied versions are tracked in schema_migrations and
+each migration runs in its own transaction. Migrations must be idempotent
+because a freshly created database already has the current schema.
+
+Run directly to migrate the configured database:
+
+    python migrations.py
+"""
+from datetime import datetime
+from sqlalchemy import inspect, text
+from counters import rebuild_counters, rebuild_daily_rollups
+from search import create_search_index
+from security_controls import CONTROL_BITS
+
+# (name, table, columns) for every secondary index the queries rely on.
+# Keep in sync with the __table_args__ declared on the models in app.py.
+INDEXES = [
+    ('ix_applications_submitted_date_id', 'applications', ['submitted_date', 'id']),
+    ('ix_applications_status_submitted_date', 'applications', ['status', 'submitted_date', 'id']),
+    ('ix_applications_type_submitted_date', 'applications', ['type', 'submitted_date', 'id']),
+    ('ix_applications_status_type_submitted_date', 'applications', ['status', 'type', 'submitted_date', 'id']),
+    ('ix_applications_risk_score', 'applications', ['risk_score']),
+    ('ix_security_controls_application_id', 'security_controls', ['application_id']),
+    ('ix_pii_data_application_id', 'pii_data', ['application_id']),
+    ('ix_audit_logs_application_id', 'audit_logs', ['application_id', 'timestamp']),
+    ('ix_audit_logs_timestamp_id', 'audit_logs', ['timestamp', 'id']),
+    ('ix_audit_logs_user_id', 'audit_logs', ['user_id']),
+    ('ix_application_comments_application_id', 'application_comments', ['application_id', 'created_at']),
+    ('ix_documents_application_id', 'documents', ['application_id', 'uploaded_at']),
+]
+
+
+def _columns(conn, table):
+    return [c['name'] for c in inspect(conn).get_columns(table)]
+
+
+def add_controls_mask(conn):
+    """Add Application.controls_mask and backfill it from security_controls rows"""
+    if 'controls_mask' in _columns(conn, 'applications'):
+        return
+
+    bit_cases = ' '.join(f"WHEN '{control}' THEN {bit}" for control, bit in CONTROL_BITS.items())
+    conn.execute(text('ALTER TABLE applications ADD COLUMN controls_mask INTEGER DEFAULT 0'))
+    conn.execute(text(
+        'UPDATE applications SET controls_mask = ('
+        f'SELECT COALESCE(SUM(CASE sc.control_name {bit_cases} ELSE 0 END), 0) '
+        'FROM security_controls sc '
+        'WHERE sc.application_id = applications.id AND sc.status = :enabled)'
+    ), {'enabled': True})
+    conn.execute(text(
+        'CREATE INDEX IF NOT EXISTS ix_applications_controls_mask ON applications (controls_mask)'
+    ))
+
+
+def add_query_indexes(conn):
+    """Create composite and foreign-key indexes matching the list and detail queries"""
+    for name, table, columns in INDEXES:
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({", ".join(columns)})'))
+
+
+def add_search_index(conn):
+    """Create the full-text search index over company_name, email and industry"""
+    create_search_index(conn)
+
+
+def native_fraud_result(conn):
+    """Store fraud_detection_result as native JSON with indexed model_type and risk_level copies"""
+    columns = _columns(conn, 'applications')
+    for name, type_ in (('fraud_model_type', 'VARCHAR(50)'), ('fraud_risk_level', 'VARCHAR(20)')):
+        if name not in columns:
+            conn.execute(text(f'ALTER TABLE applications ADD COLUMN {name} {type_}'))
+    
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text(
+            'ALTER TABLE applications ALTER COLUMN fraud_detection_result '
+            'TYPE JSONB USING fraud_detection_result::jsonb'
+        ))
+        extract = "fraud_detection_result->>'{key}'"
+    else:
+        # SQLite's JSON type is text holding the same json.dumps output, so only the copies need backfilling
+        extract = "CASE WHEN json_valid(fraud_detection_result) THEN json_extract(fraud_detection_result, '$.{key}') END"
+    conn.execute(text(
+        f"UPDATE applications SET fraud_model_type = {extract.format(key='model_type')}, "
+        f"fraud_risk_level = {extract.format(key='risk_level')} "
+        'WHERE fraud_detection_result IS NOT NULL AND fraud_model_type IS NULL'
+    ))
+    for name in ('fraud_model_type', 'fraud_risk_level'):
+        conn.execute(text(f'CREATE INDEX IF NOT EXISTS ix_applications_{name} ON applications ({name})'))
+
+
+def add_dashboard_counters(conn):
+    """Create the dashboard counter rollup and fill it from existing applications"""
+    conn.execute(text(
+        'CREATE TABLE IF NOT EXISTS dashboard_counters ('
+        'name VARCHAR(150) PRIMARY KEY, '
+        'count INTEGER NOT NULL DEFAULT 0, '
+        'risk_sum FLOAT NOT NULL DEFAULT 0, '
+        'risk_count INTEGER NOT NULL DEFAULT 0)'
+    ))
+    rebuild_counters(conn)
+
+
+def add_daily_risk_rollups(conn):
+    """Create the per-day risk trend rollup and fill it from existing applications"""
+    conn.execute(text(
+        'CREATE TABLE IF NOT EXISTS daily_risk_rollups ('
+        'day DATE NOT NULL, '
+        'type VARCHAR(20) NOT NULL, '
+        'count INTEGER NOT NULL DEFAULT 0, '
+        'risk_sum FLOAT NOT NULL DEFAULT 0, '
+        'risk_count INTEGER NOT NULL DEFAULT 0, '
+        'fraud_sum FLOAT NOT NULL DEFAULT 0, '
+        'fraud_count INTEGER NOT NULL DEFAULT 0, '
+        'pending_count INTEGER NOT NULL DEFAULT 0, '
+        'approved_count INTEGER NOT NULL DEFAULT 0, '
+        'flagged_count INTEGER NOT NULL DEFAULT 0, '
+        'PRIMARY KEY (day, type))'
+    ))
+    rebuild_daily_rollups(conn)
+
+
+def add_token_version(conn):
+    """Add User.token_version, checked against the 'ver' claim of access tokens"""
+    if 'token_version' not in _columns(conn, 'users'):
+        conn.execute(text('ALTER TABLE users ADD COLUMN token_version INTEGER NOT NULL DEFAULT 0'))
+
+
+def add_import_keys(conn):
+    """Add Application.external_id and content_hash, which incremental imports match rows on"""
+    columns = _columns(conn, 'applications')
+    for name, type_ in (('external_id', 'VARCHAR(100)'), ('content_hash', 'VARCHAR(40)')):
+        if name not in columns:
+            conn.execute(text(f'ALTER TABLE applications ADD COLUMN {name} {type_}'))
+    conn.execute(text(
+        'CREATE UNIQUE INDEX IF NOT EXISTS ix_applications_external_id ON applications (external_id)'
+    ))
+
+
+def add_document_sha256(conn):
+    """Add Document.sha256, computed while uploads are streamed to disk"""
+    if 'sha256' not in _columns(conn, 'documents'):
+        conn.execute(text('ALTER TABLE documents ADD COLUMN sha256 VARCHAR(64)'))
+
+
+MIGRATIONS = [
+    (1, 'add_controls_mask', add_controls_mask),
+    (2, 'add_query_indexes', add_query_indexes),
+    (3, 'add_search_index', add_search_index),
+    (4, 'native_fraud_result', native_fraud_result),
+    (5, 'add_dashboard_counters', add_dashboard_counters),
+    (6, 'add_daily_risk_rollups', add_daily_risk_rollups),
+    (7, 'add_token_version', add_token_version),
+    (8, 'add_import_keys', add_import_keys),
+    (9, 'add_document_sha256', add_document_sha256),
+]
+
+
+def _ensure_version_table(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            'CREATE TABLE IF NOT EXISTS schema_migrations ('
+            'version INTEGER PRIMARY KEY, '
+            'name VARCHAR(200) NOT NULL, '
+            'applied_at TIMESTAMP NOT NULL)'
+        ))
+
+
+def current_version(engine):
+    """Return the highest applied migration version (0 for none)"""
+    _ensure_version_table(engine)
+    with engine.connect() as conn:
+        return conn.execute(text('SELECT COALESCE(MAX(version), 0) FROM schema_migrations')).scalar()
+
+
+def migrate(engine, target=None):
+    """Apply pending migrations up to target (default: latest)
+
+    Returns the list of (version, name) applied.
+    """
+    applied = []
+    version = current_version(engine)
+    for number, name, upgrade in MIGRATIONS:
+        if number <= version or (target is not None and number > target):
+            continue
+        with engine.begin() as conn:
+            upgrade(conn)
+            conn.execute(
+                text('INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :t)'),
+                {'v': number, 'n': name, 't': datetime.utcnow()}
+            )
+        applied.append((number, name))
+    return applied
+
+
+if __name__ == '__main__':
+    from app import app, db
+
+    with app.app_context():
+        for number, name in migrate(db.engine):
+            print(f"✓ Applied migration {number:03d} {name}")
+        print(f"Schema version: {current_version(db.engine)}")
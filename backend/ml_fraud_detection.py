@@ -125,6 +125,35 @@ class FraudDetectionModel:
             'anomaly_score': float(anomaly_score)
         }
     
+    def predict_batch(self, records):
+        """Predict fraud for a list of user data dicts with one model call"""
+        if not records:
+            return []
+        if not self.is_trained:
+            self._initialize_model()
+        
+        features = np.vstack([self.extract_features(r) for r in records])
+        features_scaled = self.scaler.transform(features)
+        predictions = self.model.predict(features_scaled)
+        anomaly_scores = self.model.score_samples(features_scaled)
+        fraud_scores = np.clip((1 - (anomaly_scores + 0.5)) / 2, 0, 1)
+        
+        results = []
+        for prediction, anomaly_score, fraud_score in zip(predictions, anomaly_scores, fraud_scores):
+            if fraud_score < 0.3:
+                risk_level = 'low'
+            elif fraud_score < 0.7:
+                risk_level = 'medium'
+            else:
+                risk_level = 'high'
+            results.append({
+                'is_fraud': bool(prediction == -1),
+                'fraud_score': float(fraud_score),
+                'risk_level': risk_level,
+                'anomaly_score': float(anomaly_score)
+            })
+        return results
+    
     def retrain(self, training_data):
         """Retrain model with new data"""
         if not training_data or len(training_data) < 10:
@@ -146,12 +175,17 @@ class FraudDetectionModel:
         """Train model using Kaggle dataset
         
         Args:
-            data_path: Path to the processed CSV file
+            data_path: Path to the processed data written by process_kaggle_data.py:
+                a directory of Parquet parts (data/processed/creditcard) or,
+                without pyarrow, the processed CSV file
             dataset_type: Type of dataset ('creditcard' or 'supplier')
         """
         try:
             print(f"Loading dataset from {data_path}...")
-            df = pd.read_csv(data_path)
+            if os.path.isdir(data_path) or str(data_path).endswith('.parquet'):
+                df = pd.read_parquet(data_path)
+            else:
+                df = pd.read_csv(data_path)
             
             if dataset_type == 'creditcard':
                 # Use V1-V28 features and Amount, Time
@@ -129,11 +129,8 @@ class EnhancedFraudDetectionModel:
         self.is_trained = True
         self.model_type = 'isolation_forest'
     
-    def extract_features_for_rf(self, user_data):
-        """Extract features in the format expected by Random Forest model"""
-        if self.feature_names is None:
-            return None
-        
+    def _rf_feature_row(self, user_data):
+        """Build the feature dict for one application"""
         features = {}
         
         # Email features
@@ -190,8 +187,19 @@ class EnhancedFraudDetectionModel:
         features['description_length'] = len(description)
         features['description_provided'] = 1 if description else 0
         
+        return features
+    
+    def extract_features_for_rf(self, user_data):
+        """Extract features in the format expected by Random Forest model"""
+        return self.extract_features_for_rf_batch([user_data])
+    
+    def extract_features_for_rf_batch(self, records):
+        """Extract a feature matrix for many applications at once"""
+        if self.feature_names is None:
+            return None
+        
         # Create DataFrame with correct column order
-        feature_df = pd.DataFrame([features])
+        feature_df = pd.DataFrame([self._rf_feature_row(r) for r in records])
         # Reorder to match feature_names
         if self.feature_names:
             feature_df = feature_df.reindex(columns=self.feature_names, fill_value=0)
@@ -403,6 +411,85 @@ class EnhancedFraudDetectionModel:
             'model_type': 'isolation_forest'
         }
 
+    def _batch_classifier(self):
+        """Return (model, name) of the supervised model predict() would try first"""
+        if self.best_model is not None:
+            return self.best_model, self.best_model_name
+        if self.model_type == 'xgboost' and self.xgb_model is not None:
+            return self.xgb_model, 'xgboost'
+        if self.model_type == 'lightgbm' and self.lgb_model is not None:
+            return self.lgb_model, 'lightgbm'
+        if self.model_type == 'random_forest' and self.rf_model is not None:
+            return self.rf_model, 'random_forest'
+        return None, None
+    
+    @staticmethod
+    def _risk_level(fraud_score):
+        if fraud_score < 0.3:
+            return 'low'
+        elif fraud_score < 0.7:
+            return 'medium'
+        return 'high'
+    
+    def predict_batch(self, records):
+        """Predict fraud for a list of applications with one model call
+        
+        Returns a list of result dicts in the same format and order as
+        predict(). Falls back to per-record predict() if the batched
+        supervised path fails.
+        """
+        if not records:
+            return []
+        if not self.is_trained:
+            self._initialize_model()
+        
+        model, name = self._batch_classifier()
+        if model is not None:
+            try:
+                X = self.extract_features_for_rf_batch(records)
+                if X is not None:
+                    if self.feature_names:
+                        X_df = pd.DataFrame(X, columns=self.feature_names)
+                    else:
+                        X_df = pd.DataFrame(X)
+                    
+                    X_scaled = self.scaler.transform(X_df)
+                    predictions = model.predict(X_scaled)
+                    probabilities = model.predict_proba(X_scaled)
+                    
+                    results = []
+                    for prediction, probability in zip(predictions, probabilities):
+                        fraud_score = float(probability[1])
+                        results.append({
+                            'is_fraud': bool(prediction == 1),
+                            'fraud_score': fraud_score,
+                            'risk_level': self._risk_level(fraud_score),
+                            'model_type': name,
+                            'fraud_probability': fraud_score,
+                            'legitimate_probability': float(probability[0])
+                        })
+                    return results
+            except Exception as e:
+                print(f"Error in batch prediction, falling back to per-record: {e}")
+                return [self.predict(r) for r in records]
+        
+        # Isolation Forest (default or fallback)
+        if self.isolation_forest is None:
+            self._initialize_model()
+        features = np.vstack([self.extract_features_legacy(r) for r in records])
+        features_scaled = self.scaler.transform(features)
+        predictions = self.isolation_forest.predict(features_scaled)
+        anomaly_scores = self.isolation_forest.score_samples(features_scaled)
+        fraud_scores = np.clip((1 - (anomaly_scores + 0.5)) / 2, 0, 1)
+        
+        return [{
+            'is_fraud': bool(prediction == -1),
+            'fraud_score': float(fraud_score),
+            'risk_level': self._risk_level(fraud_score),
+            'anomaly_score': float(anomaly_score),
+            'model_type': 'isolation_forest'
+        } for prediction, anomaly_score, fraud_score in zip(predictions, anomaly_scores, fraud_scores)]
+
 # Global model instance
 fraud_model = EnhancedFraudDetectionModel()
 
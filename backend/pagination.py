@@ -0,0 +1,85 @@
+"""
+Keyset (cursor) pagination
+
+Pages are fetched with WHERE (sort_key, id) < (last_sort_key, last_id)
+ORDER BY sort_key DESC, id DESC LIMIT n, so every page costs the same as the
+first one: no OFFSET scan and no COUNT(*). The position is handed to the
+client as an opaque, URL-safe next_cursor token. Rows with a NULL sort key
+follow all the others.
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import DateTime, and_, or_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded"""
+
+
+def encode_cursor(values):
+    """Encode the sort key values of the last row on a page"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token, columns):
+    """Decode a cursor token back into values typed for the given columns"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(columns):
+            raise ValueError('wrong number of values')
+        return [
+            datetime.fromisoformat(v) if v is not None and isinstance(col.type, DateTime) else v
+            for v, col in zip(payload, columns)
+        ]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f'Invalid cursor: {e}')
+
+
+def _after(columns, values):
+    """Predicate selecting rows strictly after values in descending column order"""
+    column, value = columns[0], values[0]
+    if len(columns) == 1:
+        return column < value
+    return or_(column < value, and_(column == value, _after(columns[1:], values[1:])))
+
+
+def _seek(columns, values):
+    """_after plus a redundant bound on the leading column so an index range scan can start at the cursor"""
+    if len(columns) == 1:
+        return _after(columns, values)
+    return and_(columns[0] <= values[0], _after(columns, values))
+
+
+def keyset_page(query, columns, cursor=None, per_page=50):
+    """Fetch one page of query ordered by columns descending
+
+    The last column must be unique (normally the primary key). Rows whose
+    leading column is NULL come after all the others, ordered by the
+    remaining columns: once the non-NULL rows run out the page continues
+    with a separate IS NULL query, so both parts can use the same index.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    values = decode_cursor(cursor, columns) if cursor else None
+    leading, rest = columns[0], columns[1:]
+
+    rows = []
+    if values is None or values[0] is not None:
+        section = query.filter(leading.isnot(None))
+        if values is not None:
+            section = section.filter(_seek(columns, values))
+        rows = section.order_by(*[c.desc() for c in columns]).limit(per_page + 1).all()
+    if len(rows) <= per_page and rest:
+        section = query.filter(leading.is_(None))
+        if values is not None and values[0] is None:
+            section = section.filter(_seek(rest, values[1:]))
+        rows += section.order_by(*[c.desc() for c in rest]).limit(per_page + 1 - len(rows)).all()
+
+    if len(rows) <= per_page:
+        return rows, None
+
+    rows = rows[:per_page]
+    return rows, encode_cursor([getattr(rows[-1], c.key) for c in columns])
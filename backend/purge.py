@@ -0,0 +1,103 @@
+"""
+Chunked purges and data retention
+
+Deleting a large share of a table in one DELETE holds its locks (and on
+SQLite the whole database) for the duration and grows the WAL or rollback
+journal with every row. Purges here walk the parent table in id order
+instead and delete one id range of batch_size rows at a time, with their
+child rows, in short transactions committed by the caller between batches.
+
+Child tables that are emptied completely can be TRUNCATEd on PostgreSQL.
+SQLite doesn't return deleted pages to the filesystem, so a large purge
+there can be followed by vacuum().
+
+Run directly to apply a retention policy to applications (see
+app.purge_applications):
+
+    python purge.py --older-than-days 365 --imported-only --vacuum
+"""
+import argparse
+from sqlalchemy import delete, select, text
+
+
+def id_ranges(session, id_column, criteria=(), batch_size=1000):
+    """Yield (first id, last id, count) for consecutive batches of up to batch_size rows matching criteria
+
+    Each batch is queried after the previous one has been handled, so rows
+    deleted meanwhile are simply not seen again.
+    """
+    after = None
+    while True:
+        query = select(id_column).where(*criteria).order_by(id_column).limit(batch_size)
+        if after is not None:
+            query = query.where(id_column > after)
+        ids = session.execute(query).scalars().all()
+        if not ids:
+            return
+        yield ids[0], ids[-1], len(ids)
+        after = ids[-1]
+
+
+def delete_batch(session, id_column, batch_criteria, child_columns=()):
+    """Delete the rows matching batch_criteria and the child rows whose foreign key (in child_columns) points at them
+
+    Children are matched with a subquery rather than a list of ids, so a
+    batch costs the same few statements however large it is.
+    """
+    ids = select(id_column).where(*batch_criteria)
+    for column in child_columns:
+        session.execute(delete(column.table).where(column.in_(ids)).execution_options(synchronize_session=False))
+    session.execute(delete(id_column.table).where(*batch_criteria).execution_options(synchronize_session=False))
+
+
+def truncate_tables(session, tables):
+    """TRUNCATE tables on PostgreSQL; returns False (doing nothing) elsewhere"""
+    if session.get_bind().dialect.name != 'postgresql':
+        return False
+    session.execute(text(f'TRUNCATE {", ".join(table.name for table in tables)}'))
+    return True
+
+
+def vacuum(engine, tables=()):
+    """Reclaim the space left by deletes: VACUUM the SQLite file, or VACUUM ANALYZE tables on PostgreSQL
+
+    Runs outside any transaction. SQLite rewrites the whole file and blocks
+    writers meanwhile, so this belongs after a large purge, not every batch.
+    """
+    if engine.dialect.name == 'sqlite':
+        statement = 'VACUUM'
+    elif engine.dialect.name == 'postgresql':
+        statement = f'VACUUM (ANALYZE) {", ".join(table.name for table in tables)}'
+    else:
+        return
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.exec_driver_sql(statement)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Purge applications in batches')
+    parser.add_argument('--older-than-days', type=int, help='Only applications submitted more than this many days ago')
+    parser.add_argument('--imported-only', action='store_true', help='Only applications created by CSV imports')
+    parser.add_argument('--status', action='append', help='Only applications with this status (repeatable)')
+    parser.add_argument('--all', action='store_true', help='Purge every application when no filter is given')
+    parser.add_argument('--vacuum', action='store_true', help='Reclaim the freed space afterwards')
+    return parser.parse_args()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    from app import app, db, purge_criteria, purge_applications, vacuum_applications
+
+    with app.app_context():
+        criteria = purge_criteria(args.older_than_days, args.imported_only, args.status)
+        if not criteria and not args.all:
+            raise SystemExit('Refusing to purge every application without --all')
+        deleted = 0
+        for deleted in purge_applications(criteria):
+            db.session.commit()
+            print(f"🗑️  {deleted} applications purged", end='\r')
+        db.session.commit()
+        print(f"✓ Purged {deleted} applications")
+        if args.vacuum:
+            vacuum_applications()
+            print("✓ Vacuumed")
@@ -0,0 +1,112 @@
+"""
+Full-text search over applications
+
+SQLite uses an FTS5 external-content table (applications_fts) kept in sync
+with applications by triggers. PostgreSQL uses a generated tsvector column
+(search_vector) with a GIN index. Both are created by migration 003; when
+neither exists (FTS5 not compiled in, older PostgreSQL, other databases)
+search falls back to ILIKE '%term%' on the given columns.
+
+Terms are split into words and matched as word prefixes, so "acme te"
+finds "Acme Technologies".
+"""
+import re
+from sqlalchemy import func, inspect, literal_column, or_, select, text
+
+FTS_COLUMNS = ['company_name', 'email', 'industry']
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS applications_fts USING fts5("
+    "company_name, email, industry, content='applications', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS applications_fts_ai AFTER INSERT ON applications BEGIN "
+    "INSERT INTO applications_fts(rowid, company_name, email, industry) "
+    "VALUES (new.id, new.company_name, new.email, new.industry); END",
+    "CREATE TRIGGER IF NOT EXISTS applications_fts_ad AFTER DELETE ON applications BEGIN "
+    "INSERT INTO applications_fts(applications_fts, rowid, company_name, email, industry) "
+    "VALUES ('delete', old.id, old.company_name, old.email, old.industry); END",
+    "CREATE TRIGGER IF NOT EXISTS applications_fts_au AFTER UPDATE OF company_name, email, industry "
+    "ON applications BEGIN "
+    "INSERT INTO applications_fts(applications_fts, rowid, company_name, email, industry) "
+    "VALUES ('delete', old.id, old.company_name, old.email, old.industry); "
+    "INSERT INTO applications_fts(rowid, company_name, email, industry) "
+    "VALUES (new.id, new.company_name, new.email, new.industry); END",
+    "INSERT INTO applications_fts(applications_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_FTS_DDL = [
+    "ALTER TABLE applications ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "to_tsvector('simple', coalesce(company_name, '') || ' ' || coalesce(email, '') || ' ' || "
+    "coalesce(industry, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_applications_search_vector ON applications USING GIN (search_vector)",
+]
+
+
+def create_search_index(conn):
+    """Create the dialect's full-text index; leaves the fallback in place if unsupported"""
+    statements = {
+        'sqlite': SQLITE_FTS_DDL,
+        'postgresql': POSTGRES_FTS_DDL,
+    }.get(conn.dialect.name)
+    if not statements:
+        return False
+    try:
+        with conn.begin_nested():
+            for statement in statements:
+                conn.execute(text(statement))
+        return True
+    except Exception as e:
+        print(f"⚠️ Full-text search unavailable, using ILIKE fallback: {e}")
+        return False
+
+
+def search_terms(term):
+    """Split a search string into word tokens"""
+    return re.findall(r'\w+', term)
+
+
+class SearchIndex:
+    """Applies a search term to an Application query using the best available backend"""
+
+    def __init__(self):
+        self.model = None
+        self.backend = None
+
+    def init_app(self, app, model):
+        self.model = model
+        app.extensions['search_index'] = self
+
+    def detect(self, engine):
+        """Work out which backend the database supports; call after migrations"""
+        inspector = inspect(engine)
+        if engine.dialect.name == 'sqlite' and 'applications_fts' in inspector.get_table_names():
+            self.backend = 'fts5'
+        elif engine.dialect.name == 'postgresql' and 'search_vector' in [
+            c['name'] for c in inspector.get_columns('applications')
+        ]:
+            self.backend = 'tsvector'
+        else:
+            self.backend = None
+        return self.backend
+
+    def apply(self, query, term, ranked=False):
+        """Filter query to applications matching term, best matches first if ranked"""
+        tokens = search_terms(term)
+        if self.backend == 'fts5' and tokens:
+            match = ' AND '.join(f'"{t}"*' for t in tokens)
+            fts = select(
+                literal_column('rowid').label('id'),
+                literal_column('bm25(applications_fts)').label('rank')
+            ).select_from(text('applications_fts')).where(
+                text('applications_fts MATCH :match').bindparams(match=match)
+            ).subquery()
+            query = query.join(fts, self.model.id == fts.c.id)
+            return query.order_by(fts.c.rank) if ranked else query
+
+        if self.backend == 'tsvector' and tokens:
+            tsquery = func.to_tsquery('simple', ' & '.join(f'{t}:*' for t in tokens))
+            vector = literal_column('applications.search_vector')
+            query = query.filter(vector.op('@@')(tsquery))
+            return query.order_by(func.ts_rank(vector, tsquery).desc()) if ranked else query
+
+        pattern = f'%{term}%'
+        return query.filter(or_(*[getattr(self.model, c).ilike(pattern) for c in FTS_COLUMNS]))
@@ -0,0 +1,76 @@
+"""
+Security control registry
+
+Maps each security control to its category and to a bit in
+Application.controls_mask.
+"""
+import pandas as pd
+
+SECURITY_CONTROLS = {
+    'Identity & Access Management': ['mfaEnabled', 'ssoSupport', 'rbacImplemented'],
+    'Data Encryption': ['encryptionAtRest', 'encryptionInTransit', 'keyManagement'],
+    'Network Security': ['firewallEnabled', 'vpnRequired', 'ipWhitelisting'],
+    'Logging & Monitoring': ['auditLogging', 'siemIntegration', 'alertingEnabled'],
+    'Compliance': ['gdprCompliant', 'soc2Certified', 'isoCompliant']
+}
+SECURITY_COLS = [control for controls in SECURITY_CONTROLS.values() for control in controls]
+
+# Bit assignments for Application.controls_mask. Append new controls only,
+# never reorder: stored masks depend on these positions.
+CONTROL_BITS = {control: 1 << bit for bit, control in enumerate(SECURITY_COLS)}
+
+
+def pack_controls(data):
+    """Pack the security control flags of an application into a bitmask"""
+    mask = 0
+    for control, bit in CONTROL_BITS.items():
+        if data.get(control, False):
+            mask |= bit
+    return mask
+
+
+def unpack_controls(mask):
+    """Expand a controls bitmask into {category: {control: bool}}"""
+    mask = mask or 0
+    return {
+        category: {control: bool(mask & CONTROL_BITS[control]) for control in controls}
+        for category, controls in SECURITY_CONTROLS.items()
+    }
+
+
+def controls_bits(names):
+    """OR together the bits for a comma-separated list of control names"""
+    bits = 0
+    for name in filter(None, (n.strip() for n in names.split(','))):
+        if name not in CONTROL_BITS:
+            raise ValueError(f'Unknown security control: {name}')
+        bits |= CONTROL_BITS[name]
+    return bits
+
+
+def pack_controls_frame(df, numeric_only=False):
+    """Vectorized pack_controls over a DataFrame of applications
+    
+    With numeric_only, non-numeric values (e.g. strings in a CSV) count as
+    False.
+    """
+    flags = (_numeric_columns if numeric_only else truthy_columns)(df, SECURITY_COLS)
+    return sum(flags[control].astype(int) * bit for control, bit in CONTROL_BITS.items())
+
+
+def truthy_columns(df, columns):
+    """Per-row truthiness of columns, treating missing columns/values as False"""
+    return df.reindex(columns=columns).fillna(False).astype(bool)
+
+
+def _numeric_columns(df, columns):
+    """Per-row truthiness of columns, counting only numeric values"""
+    flags = pd.DataFrame(False, index=df.index, columns=columns)
+    for column in columns:
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if not pd.api.types.is_numeric_dtype(values):
+            values = values.where(values.map(pd.api.types.is_number), 0)
+        flags[column] = values.fillna(0).astype(bool)
+    return flags
@@ -0,0 +1,79 @@
+"""
+Streamed file uploads
+
+Request bodies are copied to disk chunk_size bytes at a time while their
+size and SHA-256 are computed, so an upload never has to fit in memory and
+is rejected as soon as it passes its size limit rather than after it has
+been received in full.
+
+save_stream() stores a whole upload. A piece of a resumable upload is
+saved the same way to a file of its own and splice()d into the partial file
+at its offset once it is known to be the piece expected there; file_sha256()
+hashes the assembled file once the last piece is in.
+"""
+import hashlib
+import os
+import shutil
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload stream goes past its size limit"""
+
+
+def copy_stream(stream, f, limit, chunk_size=CHUNK_SIZE, digest=None):
+    """Copy stream into the file object f in chunks; returns the number of bytes copied
+
+    Raises UploadTooLarge as soon as more than limit bytes have been read.
+    """
+    size = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return size
+        size += len(chunk)
+        if size > limit:
+            raise UploadTooLarge(f'Upload exceeds {limit} bytes')
+        if digest is not None:
+            digest.update(chunk)
+        f.write(chunk)
+
+
+def save_stream(stream, path, limit, chunk_size=CHUNK_SIZE):
+    """Stream an upload into a new file at path; returns (size, SHA-256 hex digest)
+
+    Data goes to path + '.part' and is moved into place only once complete,
+    so a rejected or interrupted upload leaves nothing behind.
+    """
+    digest = hashlib.sha256()
+    part_path = path + '.part'
+    try:
+        with open(part_path, 'wb') as f:
+            size = copy_stream(stream, f, limit, chunk_size, digest)
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return size, digest.hexdigest()
+
+
+def splice(chunk_path, path, offset, chunk_size=CHUNK_SIZE):
+    """Copy the file at chunk_path into the existing file at path from offset
+
+    Anything after it (left by an earlier interrupted attempt) is cut off.
+    """
+    with open(chunk_path, 'rb') as src, open(path, 'r+b') as f:
+        f.seek(offset)
+        shutil.copyfileobj(src, f, chunk_size)
+        f.truncate()
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
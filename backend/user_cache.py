@@ -0,0 +1,44 @@
+"""
+In-process cache of each user's role and token version
+
+Access tokens carry the user's role and token_version as claims, so
+authorization needs no database read. Revocation works by bumping
+User.token_version (or deleting the user); every request compares the
+token's version with the cached current one. Entries live for
+USER_CACHE_TTL seconds, so a change made through update_user or
+delete_user is seen at once by the worker that made it and within the TTL
+by the others.
+"""
+from cache import LocalCache
+
+MISSING = (None, None)
+
+
+class UserCache:
+    """Caches (role, token_version) per user id"""
+
+    def __init__(self):
+        self.db = None
+        self.model = None
+        self.ttl = 30
+        self._cache = LocalCache()
+
+    def init_app(self, app, db, model):
+        self.db = db
+        self.model = model
+        self.ttl = int(app.config.get('USER_CACHE_TTL', 30))
+        self._cache = LocalCache(int(app.config.get('USER_CACHE_MAX_ENTRIES', 10000)))
+        app.extensions['user_cache'] = self
+
+    def get(self, user_id):
+        """Return (role, token_version) for user_id, or (None, None) if the user doesn't exist"""
+        state = self._cache.get(user_id)
+        if state is None:
+            row = self.db.session.query(self.model.role, self.model.token_version).filter_by(id=user_id).first()
+            state = (row.role, row.token_version) if row else MISSING
+            self._cache.set(user_id, state, self.ttl)
+        return state
+
+    def invalidate(self, user_id):
+        """Forget user_id so the next request reloads it"""
+        self._cache.delete(user_id)
@@ -0,0 +1,93 @@
+"""
+Shared pytest fixtures
+
+The app is imported once, against a SQLite database in a scratch directory,
+with TESTING set (jobs run inline, audit entries are written synchronously
+and responses are cached in process). Every test then starts from a fresh
+copy of the database the app created on startup, holding only the admin
+user, and from empty caches.
+"""
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+SCRATCH_DIR = tempfile.mkdtemp(prefix='onboarding-test-')
+DATABASE_PATH = os.path.join(SCRATCH_DIR, 'test.db')
+TEMPLATE_PATH = os.path.join(SCRATCH_DIR, 'template.db')
+
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from flask_jwt_extended import create_access_token
+import app as api
+
+api.app.config['TESTING'] = True
+
+
+def _close_connections():
+    with api.app.app_context():
+        api.db.session.remove()
+        api.db.engine.dispose()
+
+
+_close_connections()
+shutil.copyfile(DATABASE_PATH, TEMPLATE_PATH)
+
+
+@pytest.fixture(autouse=True)
+def database():
+    """Give the test its own copy of the startup database, with nothing cached"""
+    _close_connections()
+    shutil.copyfile(TEMPLATE_PATH, DATABASE_PATH)
+    if api.response_cache.backend is not None:
+        api.response_cache.backend.clear()
+    api.user_cache._cache.clear()
+    yield
+    _close_connections()
+
+
+@pytest.fixture
+def client():
+    return api.app.test_client()
+
+
+@pytest.fixture
+def auth_headers():
+    """Call with a user id (default: the admin) for a bearer token header"""
+    def headers(user_id=1):
+        with api.app.app_context():
+            return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+    return headers
+
+
+@pytest.fixture
+def drift():
+    """Call to reconcile the dashboard counters; returns what had drifted"""
+    def reconcile():
+        with api.app.app_context():
+            return api.dashboard_counters.reconcile()
+    return reconcile
+
+
+@pytest.fixture
+def add_applications():
+    """Call with a list of field dicts to add applications, counted like the create endpoint does
+
+    Fields not given default to a vendor with a numbered name and email.
+    Returns the new application ids in order.
+    """
+    def add(rows):
+        with api.app.app_context():
+            apps = [
+                api.Application(**{'type': 'vendor', 'company_name': f'Test {i}', 'email': f'test{i}@example.com', **fields})
+                for i, fields in enumerate(rows)
+            ]
+            api.db.session.add_all(apps)
+            api.db.session.flush()
+            api.dashboard_counters.record(apps)
+            api.db.session.commit()
+            return [application.id for application in apps]
+    return add
@@ -311,25 +311,24 @@ function App() {
       return;
     }
 
-    // Validate file size (10MB)
-    if (file.size > 10 * 1024 * 1024) {
-      setError('File too large. Maximum size: 10MB');
+    // Validate file size (100MB; over 10MB goes up in resumable chunks)
+    if (file.size > 100 * 1024 * 1024) {
+      setError('File too large. Maximum size: 100MB');
       return;
     }
 
     setUploadingFile(true);
     try {
-      const formData = new FormData();
-      formData.append('file', file);
-      formData.append('file_type', fileType);
-
-      const response = await fetch(`${API_URL}/applications/${appId}/documents`, {
-        method: 'POST',
-        headers: {
-          'Authorization': `Bearer ${token}`
-        },
-        body: formData
-      });
+      const response = file.size > 10 * 1024 * 1024
+        ? await uploadInChunks(appId, file, fileType)
+        : await fetch(`${API_URL}/applications/${appId}/documents?filename=${encodeURIComponent(file.name)}&file_type=${encodeURIComponent(fileType)}`, {
+            method: 'POST',
+            headers: {
+              'Authorization': `Bearer ${token}`,
+              'Content-Type': file.type || 'application/octet-stream'
+            },
+            body: file
+          });
 
       if (response.ok) {
         setSuccess('Document uploaded successfully!');
@@ -346,6 +345,45 @@ function App() {
     }
   };
 
+  // Resumable upload: PUT the file in chunks, asking the server where to
+  // carry on from when a chunk fails. Returns the response to the last chunk.
+  const uploadInChunks = async (appId, file, fileType) => {
+    const headers = { 'Authorization': `Bearer ${token}` };
+    const started = await fetch(`${API_URL}/applications/${appId}/documents/uploads`, {
+      method: 'POST',
+      headers: { ...headers, 'Content-Type': 'application/json' },
+      body: JSON.stringify({ filename: file.name, size: file.size, file_type: fileType })
+    });
+    if (!started.ok) return started;
+    const upload = await started.json();
+    const uploadUrl = `${API_URL}/documents/uploads/${upload.upload_id}`;
+
+    let offset = upload.offset;
+    let retries = 3;
+    while (true) {
+      let response;
+      try {
+        response = await fetch(uploadUrl, {
+          method: 'PUT',
+          headers: { ...headers, 'Upload-Offset': String(offset) },
+          body: file.slice(offset, offset + upload.chunk_size)
+        });
+      } catch (err) {
+        if (retries-- === 0) throw err;
+        const status = await fetch(uploadUrl, { headers });
+        if (!status.ok) throw err;
+        offset = (await status.json()).offset;
+        continue;
+      }
+      if (response.status === 409 && retries-- > 0) {
+        offset = (await response.json()).offset;
+        continue;
+      }
+      if (response.status !== 200) return response;
+      offset = (await response.json()).offset;
+    }
+  };
+
   const fetchApplicationDocuments = async (appId) => {
     try {
       const response = await fetch(`${API_URL}/applications/${appId}/documents`, {
@@ -471,9 +509,33 @@ function App() {
         }
       });
       
-      const data = await response.json();
+      const queued = await response.json();
       
-      if (response.ok) {
+      if (!response.ok) {
+        setError(queued.error || 'Failed to import data');
+        return;
+      }
+      
+      // The import runs as a background job; poll it until it finishes
+      let job = queued;
+      while (job.status === 'queued' || job.status === 'running') {
+        await new Promise(resolve => setTimeout(resolve, 1000));
+        const jobResponse = await fetch(`${API_URL}/jobs/${queued.job_id}`, {
+          headers: {
+            'Authorization': `Bearer ${token}`
+          }
+        });
+        job = await jobResponse.json();
+        if (!jobResponse.ok) {
+          break;
+        }
+        if (job.status === 'running' && job.total_rows) {
+          setSuccess(`Importing... ${job.rows_processed} of ${job.total_rows} rows`);
+        }
+      }
+      
+      if (job.status === 'completed') {
+        const data = job.stats || {};
         const breakdown = data.status_breakdown || {};
         setSuccess(`Successfully imported ${data.imported} applications! (${breakdown.flagged || 0} flagged, ${breakdown.pending || 0} pending, ${breakdown.approved || 0} approved)`);
         // Refresh dashboard to show new stats
@@ -485,7 +547,7 @@ function App() {
           handleCardClick('all');
         }, 1500);
       } else {
-        setError(data.error || 'Failed to import data');
+        setError(job.error || 'Failed to import data');
       }
     } catch (err) {
       setError('Network error. Please try again.');
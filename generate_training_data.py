@@ -2,10 +2,51 @@
 """
 Generate sample supplier quality dataset with fraud labels
 """
+import argparse
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+TYPES = ['Vendor', 'Supplier', 'Contractor', 'Service Provider']
+COMPANY_NAMES = [
+    'TechCorp', 'GlobalSupply', 'QualityGoods', 'PrimeVendor',
+    'EliteServices', 'PremiumSupply', 'TrustedPartner', 'SecureVendor',
+    'ReliableSource', 'BestProvider', 'TopSupplier', 'AceVendor'
+]
+ADDRESSES = ['123 Main St', '456 Oak Ave', '789 Pine Rd', '321 Elm St', '654 Maple Dr']
+CITIES = ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 'Philadelphia']
+STATES = ['NY', 'CA', 'IL', 'TX', 'AZ', 'PA']
+INDUSTRIES = [
+    'Technology', 'Manufacturing', 'Healthcare', 'Finance',
+    'Retail', 'Logistics', 'Energy', 'Construction'
+]
+
+# Probability of each security control being enabled, (fraud, normal)
+SECURITY_CONTROL_PROBS = {
+    'mfaEnabled': (0.3, 0.85),
+    'ssoSupport': (0.2, 0.75),
+    'rbacImplemented': (0.25, 0.80),
+    'encryptionAtRest': (0.4, 0.90),
+    'encryptionInTransit': (0.5, 0.95),
+    'keyManagement': (0.3, 0.70),
+    'firewallEnabled': (0.6, 0.95),
+    'vpnRequired': (0.2, 0.60),
+    'ipWhitelisting': (0.25, 0.65),
+    'auditLogging': (0.4, 0.85),
+    'siemIntegration': (0.2, 0.70),
+    'alertingEnabled': (0.3, 0.80),
+    'gdprCompliant': (0.3, 0.75),
+    'soc2Certified': (0.1, 0.50),
+    'isoCompliant': (0.2, 0.60),
+}
+
+COLUMNS = [
+    'application_id', 'type', 'company_name', 'email', 'phone', 'address',
+    'city', 'state', 'zip', 'tax_id', 'industry'
+] + list(SECURITY_CONTROL_PROBS) + ['is_fraud']
+
 def generate_supplier_dataset(n_samples=1000, fraud_rate=0.15):
     """Generate synthetic supplier quality dataset"""
     np.random.seed(42)
@@ -20,39 +61,26 @@ def generate_supplier_dataset(n_samples=1000, fraud_rate=0.15):
         application_id = f"APP-{i+1:06d}"
         
         # Company type
-        types = ['Vendor', 'Supplier', 'Contractor', 'Service Provider']
-        company_type = np.random.choice(types)
+        company_type = np.random.choice(TYPES)
         
         # Company name
-        company_names = [
-            'TechCorp', 'GlobalSupply', 'QualityGoods', 'PrimeVendor',
-            'EliteServices', 'PremiumSupply', 'TrustedPartner', 'SecureVendor',
-            'ReliableSource', 'BestProvider', 'TopSupplier', 'AceVendor'
-        ]
-        company_name = f"{np.random.choice(company_names)} {np.random.randint(100, 9999)}"
+        company_name = f"{np.random.choice(COMPANY_NAMES)} {np.random.randint(100, 9999)}"
         
         # Contact info
         email = f"contact@{company_name.lower().replace(' ', '')}.com"
         phone = f"+1-{np.random.randint(200, 999)}-{np.random.randint(200, 999)}-{np.random.randint(1000, 9999)}"
         
         # Address
-        addresses = ['123 Main St', '456 Oak Ave', '789 Pine Rd', '321 Elm St', '654 Maple Dr']
-        address = np.random.choice(addresses)
-        cities = ['New York', 'Los Angeles', 'Chicago', 'Houston', 'Phoenix', 'Philadelphia']
-        city = np.random.choice(cities)
-        states = ['NY', 'CA', 'IL', 'TX', 'AZ', 'PA']
-        state = np.random.choice(states)
+        address = np.random.choice(ADDRESSES)
+        city = np.random.choice(CITIES)
+        state = np.random.choice(STATES)
         zip_code = f"{np.random.randint(10000, 99999)}"
         
         # Tax ID
         tax_id = f"{np.random.randint(10, 99)}-{np.random.randint(1000000, 9999999)}"
         
         # Industry
-        industries = [
-            'Technology', 'Manufacturing', 'Healthcare', 'Finance',
-            'Retail', 'Logistics', 'Energy', 'Construction'
-        ]
-        industry = np.random.choice(industries)
+        industry = np.random.choice(INDUSTRIES)
         
         # Security features - fraud cases have fewer security measures
         if is_fraud:
@@ -123,12 +151,169 @@ def generate_supplier_dataset(n_samples=1000, fraud_rate=0.15):
     df = pd.DataFrame(data)
     return df
 
+def _format_ints(values, width=0):
+    """Format an integer array as zero-padded strings"""
+    s = pd.Series(values).astype(str)
+    return s.str.zfill(width) if width else s
+
+def generate_supplier_chunk(start, n_rows, fraud_rate=0.15, rng=None):
+    """Generate a chunk of the supplier dataset with whole-column draws
+
+    Produces the same schema and per-class security control probabilities as
+    generate_supplier_dataset. Application IDs are numbered from start + 1.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    
+    is_fraud = rng.random(n_rows) < fraud_rate
+    
+    company_name = (
+        pd.Series(np.asarray(COMPANY_NAMES, dtype=object)[rng.integers(0, len(COMPANY_NAMES), n_rows)])
+        + ' ' + _format_ints(rng.integers(100, 9999, n_rows))
+    )
+    
+    data = {
+        'application_id': 'APP-' + _format_ints(np.arange(start + 1, start + n_rows + 1), 6),
+        'type': np.asarray(TYPES, dtype=object)[rng.integers(0, len(TYPES), n_rows)],
+        'company_name': company_name,
+        'email': 'contact@' + company_name.str.lower().str.replace(' ', '', regex=False) + '.com',
+        'phone': (
+            '+1-' + _format_ints(rng.integers(200, 999, n_rows))
+            + '-' + _format_ints(rng.integers(200, 999, n_rows))
+            + '-' + _format_ints(rng.integers(1000, 9999, n_rows))
+        ),
+        'address': np.asarray(ADDRESSES, dtype=object)[rng.integers(0, len(ADDRESSES), n_rows)],
+        'city': np.asarray(CITIES, dtype=object)[rng.integers(0, len(CITIES), n_rows)],
+        'state': np.asarray(STATES, dtype=object)[rng.integers(0, len(STATES), n_rows)],
+        'zip': _format_ints(rng.integers(10000, 99999, n_rows)),
+        'tax_id': _format_ints(rng.integers(10, 99, n_rows)) + '-' + _format_ints(rng.integers(1000000, 9999999, n_rows)),
+        'industry': np.asarray(INDUSTRIES, dtype=object)[rng.integers(0, len(INDUSTRIES), n_rows)],
+    }
+    
+    # Security features - fraud cases have fewer security measures
+    for col, (fraud_prob, normal_prob) in SECURITY_CONTROL_PROBS.items():
+        threshold = np.where(is_fraud, fraud_prob, normal_prob)
+        data[col] = (rng.random(n_rows) < threshold).astype(np.int64)
+    
+    data['is_fraud'] = is_fraud.astype(np.int64)
+    
+    return pd.DataFrame(data, columns=COLUMNS)
+
+def _chunk_bounds(n_samples, chunk_size):
+    """Split n_samples into (index, start, n_rows) chunks"""
+    return [
+        (i, start, min(chunk_size, n_samples - start))
+        for i, start in enumerate(range(0, n_samples, chunk_size))
+    ]
+
+def _generate_part(args):
+    """Generate one chunk and write it as its own part file (worker entry point)"""
+    seed_seq, start, n_rows, fraud_rate, part_path, fmt = args
+    df = generate_supplier_chunk(start, n_rows, fraud_rate, np.random.default_rng(seed_seq))
+    if fmt == 'parquet':
+        df.to_parquet(part_path, index=False)
+    else:
+        df.to_csv(part_path, index=False)
+    return n_rows, int(df['is_fraud'].sum())
+
+def generate_large_supplier_dataset(output_path, n_samples, fraud_rate=0.15, seed=42,
+                                    chunk_size=250_000, fmt='csv', workers=1):
+    """Generate a large supplier dataset in chunks
+
+    Each chunk draws from its own child of a seeded SeedSequence, so output is
+    reproducible for a given seed and chunk_size regardless of worker count.
+    With workers=1 the chunks are appended to a single CSV or Parquet file;
+    with workers>1 output_path is a directory of part files, one per chunk.
+
+    Returns (total_rows, fraud_rows).
+    """
+    if fmt not in ('csv', 'parquet'):
+        raise ValueError(f"Unsupported format: {fmt}")
+    
+    output_path = Path(output_path)
+    chunks = _chunk_bounds(n_samples, chunk_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+    total_rows = 0
+    fraud_rows = 0
+    
+    if workers > 1:
+        output_path.mkdir(parents=True, exist_ok=True)
+        jobs = [
+            (seeds[i], start, n_rows, fraud_rate, output_path / f"part-{i:05d}.{fmt}", fmt)
+            for i, start, n_rows in chunks
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for n_rows, n_fraud in pool.map(_generate_part, jobs):
+                total_rows += n_rows
+                fraud_rows += n_fraud
+        return total_rows, fraud_rows
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = None
+    try:
+        for i, start, n_rows in chunks:
+            df = generate_supplier_chunk(start, n_rows, fraud_rate, np.random.default_rng(seeds[i]))
+            if fmt == 'parquet':
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                writer.write_table(table)
+            else:
+                df.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+            total_rows += n_rows
+            fraud_rows += int(df['is_fraud'].sum())
+    finally:
+        if writer is not None:
+            writer.close()
+    
+    return total_rows, fraud_rows
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Generate synthetic supplier quality data')
+    parser.add_argument('--rows', type=int, default=None,
+                        help='Generate this many rows with the vectorized chunked generator')
+    parser.add_argument('--fraud-rate', type=float, default=0.15)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Shard chunks across this many processes (writes a directory of part files)')
+    parser.add_argument('--output', default=None)
+    return parser.parse_args()
+
+def generate_large(args):
+    """Generate a large dataset with the vectorized generator"""
+    workers = args.workers if args.workers > 0 else os.cpu_count() or 1
+    output_path = args.output or (
+        Path('data') / (f"supplier_quality_data_{args.rows}" + ('' if workers > 1 else f".{args.format}"))
+    )
+    
+    print(f"\nGenerating {args.rows} supplier records ({args.format}, {workers} worker(s))...")
+    total, fraud = generate_large_supplier_dataset(
+        output_path, args.rows, fraud_rate=args.fraud_rate, seed=args.seed,
+        chunk_size=args.chunk_size, fmt=args.format, workers=workers
+    )
+    
+    print(f"\n✓ Dataset saved to {output_path}")
+    print(f"\nDataset Summary:")
+    print(f"  Total records: {total}")
+    print(f"  Fraud cases: {fraud} ({fraud / max(total, 1) * 100:.2f}%)")
+
 def main():
     """Generate and save supplier quality dataset"""
+    args = parse_args()
+    
     print("="*50)
     print("Generating Supplier Quality Dataset")
     print("="*50)
     
+    if args.rows is not None:
+        generate_large(args)
+        return
+    
     # Create data directory
     data_dir = Path('data')
     data_dir.mkdir(exist_ok=True)
@@ -149,10 +334,7 @@ def main():
     print(f"  Columns: {len(df.columns)}")
     print("\nSecurity Features Summary (Fraud vs Normal):")
     
-    security_cols = ['mfaEnabled', 'ssoSupport', 'rbacImplemented', 'encryptionAtRest',
-                   'encryptionInTransit', 'keyManagement', 'firewallEnabled', 'vpnRequired',
-                   'ipWhitelisting', 'auditLogging', 'siemIntegration', 'alertingEnabled',
-                   'gdprCompliant', 'soc2Certified', 'isoCompliant']
+    security_cols = list(SECURITY_CONTROL_PROBS)
     
     fraud_df = df[df['is_fraud'] == 1]
     normal_df = df[df['is_fraud'] == 0]
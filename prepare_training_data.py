@@ -1,11 +1,11 @@
 #!/usr/bin/env python3
 """
-Prepare training data files from generated supplier data
+Prepare training data files from generated or processed supplier data
 Creates onboarding_train.csv, onboarding_test.csv, and onboarding_training_data.csv
 """
-import pandas as pd
 from pathlib import Path
 from sklearn.model_selection import train_test_split
+from training_data import read_training_data
 
 def main():
     """Split supplier data into train/test sets"""
@@ -16,16 +16,20 @@ def main():
     data_dir = Path('data')
     data_dir.mkdir(exist_ok=True)
     
-    # Load supplier quality data
+    # Load supplier quality data, or the Parquet parts process_kaggle_data.py
+    # streams it into
     supplier_file = data_dir / 'supplier_quality_data.csv'
+    processed_dir = data_dir / 'processed' / 'supplier_quality'
     
-    if not supplier_file.exists():
+    if not supplier_file.exists() and processed_dir.is_dir():
+        supplier_file = processed_dir
+    elif not supplier_file.exists():
         print(f"⚠️ {supplier_file} not found. Generating data first...")
         import generate_training_data
         generate_training_data.main()
     
     print(f"\n📂 Loading {supplier_file}...")
-    df = pd.read_csv(supplier_file)
+    df = read_training_data(supplier_file)
     print(f"✅ Loaded {len(df)} records")
     
     # Save full dataset
@@ -81,18 +81,33 @@ fi
 echo ""
 echo "📦 Extracting datasets..."
 
+# process_kaggle_data.py streams the archives directly when pyarrow is available
+if python3 -c "import pyarrow" &> /dev/null; then
+    STREAM_ARCHIVES=1
+else
+    STREAM_ARCHIVES=0
+fi
+
 if [ -f "data/creditcardfraud.zip" ]; then
-    echo "  → Extracting creditcardfraud.zip..."
-    unzip -q data/creditcardfraud.zip -d data/
-    echo "  ✓ Credit card fraud dataset extracted"
+    if [ "$STREAM_ARCHIVES" = 1 ]; then
+        echo "  ✓ pyarrow available, creditcardfraud.zip will be streamed without extraction"
+    else
+        echo "  → Extracting creditcardfraud.zip..."
+        unzip -q data/creditcardfraud.zip -d data/
+        echo "  ✓ Credit card fraud dataset extracted"
+    fi
 else
     echo "  ⚠️  creditcardfraud.zip not found"
 fi
 
 if [ -f "data/supplier-quality-data.zip" ]; then
-    echo "  → Extracting supplier-quality-data.zip..."
-    unzip -q data/supplier-quality-data.zip -d data/
-    echo "  ✓ Supplier quality dataset extracted"
+    if [ "$STREAM_ARCHIVES" = 1 ]; then
+        echo "  ✓ pyarrow available, supplier-quality-data.zip will be streamed to Parquet and data/supplier_quality_data.csv"
+    else
+        echo "  → Extracting supplier-quality-data.zip..."
+        unzip -q data/supplier-quality-data.zip -d data/
+        echo "  ✓ Supplier quality dataset extracted"
+    fi
 elif [ -f "data/supplier_quality_data.csv" ]; then
     echo "  ✓ Using generated supplier quality dataset"
 else
@@ -111,7 +126,6 @@ echo "✓ Setup complete!"
 echo "=========================================="
 echo ""
 echo "Next steps:"
-echo "1. Review the processed data in data/processed/"
-echo "2. Update ml_fraud_detection.py to use the new training data"
-echo "3. Retrain the model with the processed datasets"
+echo "1. Review the processed data in data/processed/ (Parquet part directories when pyarrow is installed)"
+echo "2. Retrain the model with the processed datasets (FraudDetectionModel.train_from_kaggle_data)"
 
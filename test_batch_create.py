@@ -0,0 +1,86 @@
+"""
+Tests for the batch application endpoint
+"""
+import pytest
+import app as api
+
+URL = f'{api.Config.API_PREFIX}/applications/batch'
+
+
+def record(name, **fields):
+    return {'type': 'vendor', 'company_name': name, 'email': f'{name.lower().replace(" ", "")}@example.com', **fields}
+
+
+def stored(names):
+    """{company_name: id} of applications with these names, and how many audit rows they have"""
+    with api.app.app_context():
+        apps = api.Application.query.filter(api.Application.company_name.in_(names)).all()
+        ids = {a.company_name: a.id for a in apps}
+        audits = api.AuditLog.query.filter(
+            api.AuditLog.application_id.in_(ids.values()), api.AuditLog.action == 'APPLICATION_CREATED'
+        ).count()
+    return ids, audits
+
+
+@pytest.fixture
+def fail_on(monkeypatch):
+    """Call with a prefix to make the counter update raise for any chunk with a company name starting with it"""
+    record_rows = api.dashboard_counters.record
+
+    def fail(prefix):
+        def failing(rows, sign=1):
+            if any(str(row['company_name']).startswith(prefix) for row in rows):
+                raise RuntimeError('database went away')
+            return record_rows(rows, sign)
+        monkeypatch.setattr(api.dashboard_counters, 'record', failing)
+    return fail
+
+
+def test_batch_creates_every_record(client, auth_headers, drift):
+    """201, one application and one audit row per record, results in request order"""
+    names = ['Batch One', 'Batch Two', 'Batch Three']
+    response = client.post(URL, json={'applications': [record(n, mfaEnabled=True) for n in names]}, headers=auth_headers())
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['created'] == 3 and body['failed'] == 0
+
+    ids, audits = stored(names)
+    assert [r['application_id'] for r in body['results']] == [ids[n] for n in names]
+    assert audits == 3
+    assert drift() == {}
+
+
+def test_batch_of_invalid_records_is_400(client, auth_headers):
+    """Nothing is written when every record is invalid"""
+    response = client.post(URL, json=[{'company_name': 'No Email Ltd'}, 'not an object'], headers=auth_headers())
+    assert response.status_code == 400
+    body = response.get_json()
+    assert body['created'] == 0
+    assert not any(r.get('retryable') for r in body['results'])
+    assert stored(['No Email Ltd'])[0] == {}
+
+
+def test_failed_chunk_is_207_and_retryable(client, auth_headers, drift, fail_on, monkeypatch):
+    """A chunk that fails on the server is rolled back alone and marked retryable"""
+    monkeypatch.setitem(api.app.config, 'BATCH_CHUNK_SIZE', 2)
+    fail_on('Doomed')
+    records = [record('Kept One'), record('Kept Two'), record('Doomed One'), record('Doomed Two'), {'company_name': 'Bad'}]
+    response = client.post(URL, json={'applications': records}, headers=auth_headers())
+    assert response.status_code == 207
+    body = response.get_json()
+    assert body['created'] == 2 and body['failed'] == 3
+    assert [r['success'] for r in body['results']] == [True, True, False, False, False]
+    assert [bool(r.get('retryable')) for r in body['results']] == [False, False, True, True, False]
+
+    ids, audits = stored(['Kept One', 'Kept Two', 'Doomed One', 'Doomed Two'])
+    assert set(ids) == {'Kept One', 'Kept Two'}
+    assert audits == 2
+    assert drift() == {}
+
+
+def test_batch_that_only_fails_on_the_server_is_500(client, auth_headers, fail_on):
+    fail_on('Doomed')
+    response = client.post(URL, json=[record('Doomed Three')], headers=auth_headers())
+    assert response.status_code == 500
+    assert response.get_json()['results'][0]['retryable'] is True
+    assert stored(['Doomed Three'])[0] == {}
@@ -0,0 +1,156 @@
+"""
+Tests for the Kaggle import job: inline running, resuming from a checkpoint
+or after its worker died, and incremental imports, from a generated CSV
+"""
+import csv
+from datetime import datetime, timedelta
+
+import pytest
+import app as api
+
+URL = f'{api.Config.API_PREFIX}/import/kaggle-data'
+COLUMNS = ['application_id', 'type', 'company_name', 'email', 'phone', 'city', 'industry',
+           'mfaEnabled', 'encryptionAtRest', 'is_fraud']
+
+
+@pytest.fixture(autouse=True)
+def small_shards(monkeypatch):
+    monkeypatch.setitem(api.app.config, 'IMPORT_SHARD_BYTES', 1024)
+    monkeypatch.setitem(api.app.config, 'IMPORT_WORKERS', 1)
+
+
+@pytest.fixture
+def csv_path(tmp_path, monkeypatch):
+    """The CSV the import reads, in place of the Kaggle data files"""
+    path = str(tmp_path / 'supplier_quality_data.csv')
+    monkeypatch.setattr(api, 'find_kaggle_csvs', lambda: [path])
+    return path
+
+
+def supplier(n, **fields):
+    return {
+        'application_id': f'APP-{n:04d}', 'type': 'Vendor', 'company_name': f'Supplier {n}',
+        'email': f'contact@supplier{n}.com', 'phone': f'+1-555-010-{n:04d}', 'city': 'Chicago',
+        'industry': 'Finance', 'mfaEnabled': n % 2, 'encryptionAtRest': 1, 'is_fraud': int(n % 7 == 0), **fields
+    }
+
+
+def write_csv(path, rows):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def run_import(client, headers, mode='replace'):
+    """POST an import and return (response, job row)"""
+    response = client.post(f'{URL}?mode={mode}', headers=headers)
+    job_id = response.get_json().get('job_id')
+    with api.app.app_context():
+        return response, api.db.session.get(api.ImportJob, job_id) if job_id else None
+
+
+def imported():
+    """{external_id: (application id, company_name)} of every imported application"""
+    with api.app.app_context():
+        rows = api.db.session.query(api.Application.external_id, api.Application.id, api.Application.company_name).filter(
+            api.Application.fraud_model_type == 'kaggle_import'
+        ).all()
+    return {external_id: (app_id, name) for external_id, app_id, name in rows}
+
+
+def test_import_runs_inline_under_testing(client, auth_headers, drift, csv_path):
+    """The job is planned into shards and finished before the request returns"""
+    write_csv(csv_path, [supplier(n) for n in range(1, 61)])
+    response, job = run_import(client, auth_headers())
+    assert response.status_code == 202
+    assert job.status == 'completed', job.error
+    assert len(job.params['shards']) > 1
+    assert job.total_rows == job.rows_processed == 60
+    assert job.stats['inserted'] == 60 and job.stats['skipped'] == 0
+    assert len(imported()) == 60
+
+    progress = client.get(response.get_json()['status_url'], headers=auth_headers()).get_json()
+    assert progress['status'] == 'completed' and progress['rows_processed'] == 60
+    assert drift() == {}
+
+
+def test_failed_import_resumes_from_its_checkpoint(client, auth_headers, drift, csv_path, monkeypatch):
+    """A job that fails mid-way is retried from the last committed shard, with the same plan"""
+    write_csv(csv_path, [supplier(n) for n in range(1, 61)])
+    upsert = api._upsert_kaggle_chunk
+    calls = []
+
+    def fail_third_shard(frame, pii):
+        calls.append(len(frame))
+        if len(calls) == 3:
+            raise RuntimeError('worker lost its connection')
+        return upsert(frame, pii)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(api, '_upsert_kaggle_chunk', fail_third_shard)
+        response, job = run_import(client, auth_headers())
+    assert response.status_code == 202
+    assert job.status == 'queued' and job.attempts == 1
+    assert job.checkpoint == {'shards_done': 2}
+    assert len(imported()) == sum(shard['rows'] for shard in job.params['shards'][:2])
+
+    # Only one import or purge at a time
+    busy, _ = run_import(client, auth_headers())
+    assert busy.status_code == 409 and busy.get_json()['job_id'] == job.id
+
+    shards = job.params['shards']
+    with api.app.app_context():
+        assert api.job_queue.run_next()
+        job = api.db.session.get(api.ImportJob, job.id)
+        assert job.status == 'completed' and job.attempts == 2
+        assert job.params['shards'] == shards
+        assert job.rows_processed == 60 and job.stats['inserted'] == 60
+    assert len(imported()) == 60
+    assert drift() == {}
+
+
+def test_job_of_a_dead_worker_is_claimed_again(csv_path):
+    """A running job whose heartbeat went stale is taken over; a live one is left alone"""
+    write_csv(csv_path, [supplier(n) for n in range(1, 61)])
+    now = datetime.utcnow()
+    with api.app.app_context():
+        live = api.ImportJob(kind='kaggle_import', params={'paths': [csv_path], 'mode': 'incremental'},
+                             status='running', worker='busy-host:1:1', attempts=1, started_at=now, heartbeat_at=now)
+        dead = api.ImportJob(kind='kaggle_import', params={'paths': [csv_path], 'mode': 'replace'},
+                             status='running', worker='gone-host:1:1', attempts=1, started_at=now - timedelta(hours=1),
+                             heartbeat_at=now - api.job_queue.stale_after - timedelta(seconds=1))
+        api.db.session.add_all([live, dead])
+        api.db.session.commit()
+        assert api.job_queue.run_next()
+        assert not api.job_queue.run_next()
+        dead = api.db.session.get(api.ImportJob, dead.id)
+        live = api.db.session.get(api.ImportJob, live.id)
+        assert dead.status == 'completed' and dead.attempts == 2 and dead.worker != 'gone-host:1:1'
+        assert live.status == 'running' and live.worker == 'busy-host:1:1'
+    assert len(imported()) == 60
+
+
+def test_incremental_import_writes_only_new_and_changed_rows(client, auth_headers, drift, csv_path):
+    write_csv(csv_path, [supplier(n) for n in range(1, 61)])
+    assert run_import(client, auth_headers())[1].status == 'completed'
+    before = imported()
+
+    rows = [supplier(n) for n in range(1, 61)]
+    rows[4]['company_name'] = 'Supplier 5 Renamed'
+    rows.append(supplier(61))
+    rows.append(supplier(62, application_id=''))
+    write_csv(csv_path, rows)
+    response, job = run_import(client, auth_headers(), 'incremental')
+    assert response.status_code == 202
+    assert job.status == 'completed', job.error
+    assert {k: job.stats[k] for k in ('inserted', 'updated', 'unchanged', 'skipped')} == {
+        'inserted': 1, 'updated': 1, 'unchanged': 59, 'skipped': 1
+    }
+
+    after = imported()
+    assert len(after) == 61
+    assert after['APP-0005'] == (before['APP-0005'][0], 'Supplier 5 Renamed')
+    assert all(after[key] == value for key, value in before.items() if key != 'APP-0005')
+    assert drift() == {}
+
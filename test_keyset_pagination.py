@@ -0,0 +1,83 @@
+"""
+Tests for cursor (keyset) pagination of the applications list
+"""
+import math
+from datetime import datetime, timedelta
+
+import pytest
+import app as api
+
+URL = f'{api.Config.API_PREFIX}/applications'
+
+
+@pytest.fixture(autouse=True)
+def applications(add_applications):
+    """45 applications: some sharing a submitted_date, some with none"""
+    start = datetime(2024, 1, 1)
+    ids = add_applications([
+        {
+            'type': 'supplier' if i % 2 else 'vendor', 'company_name': f'Keyset {i}',
+            'status': 'flagged' if i % 3 == 0 else 'pending_review',
+            'submitted_date': start if i % 4 == 0 else start + timedelta(hours=i),  # ties are ordered by id
+        }
+        for i in range(45)
+    ])
+    # The column default fills in a date on insert; older rows may have none
+    with api.app.app_context():
+        api.Application.query.filter(api.Application.id.in_(ids[::9])).update(
+            {'submitted_date': None}, synchronize_session=False
+        )
+        api.db.session.commit()
+
+
+def expected_ids(status=None):
+    """Every application id in list order: newest first, undated last, ties by id"""
+    with api.app.app_context():
+        query = api.Application.query
+        if status:
+            query = query.filter_by(status=status)
+        apps = query.all()
+    dated = sorted((a for a in apps if a.submitted_date), key=lambda a: (a.submitted_date, a.id), reverse=True)
+    undated = sorted((a for a in apps if not a.submitted_date), key=lambda a: a.id, reverse=True)
+    return [a.id for a in dated + undated]
+
+
+def walk(client, headers, per_page, query=''):
+    """Follow next_cursor from the first page; returns (ids, number of pages)"""
+    ids, cursor, pages = [], '', 0
+    while cursor is not None:
+        body = client.get(f'{URL}?per_page={per_page}&cursor={cursor}{query}', headers=headers).get_json()
+        ids += [a['id'] for a in body['applications']]
+        assert len(body['applications']) <= per_page
+        assert body['has_more'] == (body['next_cursor'] is not None)
+        cursor = body['next_cursor']
+        pages += 1
+    return ids, pages
+
+
+def test_cursor_pages_return_every_row_once(client, auth_headers):
+    """Walking the cursors yields each application exactly once, undated ones included"""
+    expected = expected_ids()
+    with api.app.app_context():
+        assert api.Application.query.filter(api.Application.submitted_date.is_(None)).count() > 0
+    for per_page in (1, 7, 50):
+        ids, pages = walk(client, auth_headers(), per_page)
+        assert ids == expected
+        assert pages == math.ceil(len(expected) / per_page)  # no empty last page
+
+    ids, _ = walk(client, auth_headers(), 4, '&status=flagged')
+    assert ids == expected_ids('flagged')
+
+
+def test_per_page_is_capped(client, auth_headers, monkeypatch):
+    monkeypatch.setitem(api.app.config, 'MAX_PER_PAGE', 5)
+    cursor_page = client.get(f'{URL}?per_page=100000&cursor=&include_total=1', headers=auth_headers()).get_json()
+    numbered_page = client.get(f'{URL}?per_page=100000&page=1', headers=auth_headers()).get_json()
+    assert len(cursor_page['applications']) == 5
+    assert cursor_page['total'] == 45
+    assert len(numbered_page['applications']) == 5
+
+
+def test_invalid_cursor_is_400(client, auth_headers):
+    response = client.get(f'{URL}?cursor=not-a-cursor', headers=auth_headers())
+    assert response.status_code == 400
@@ -0,0 +1,111 @@
+"""
+Tests for the versioned schema migrations
+
+Upgrades a scratch SQLite database holding the schema the app first shipped
+with, and checks the database the app creates on startup is already current.
+"""
+import json
+
+from sqlalchemy import create_engine, inspect, text
+import app as api
+from migrations import MIGRATIONS, current_version, migrate
+from security_controls import CONTROL_BITS
+
+# The tables as they were before any migration existed
+ORIGINAL_SCHEMA = [
+    'CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(80) NOT NULL UNIQUE, '
+    'email VARCHAR(120) NOT NULL UNIQUE, password_hash VARCHAR(255) NOT NULL, role VARCHAR(20), created_at DATETIME)',
+    'CREATE TABLE applications (id INTEGER PRIMARY KEY, type VARCHAR(20) NOT NULL, company_name VARCHAR(200) NOT NULL, '
+    'email VARCHAR(120) NOT NULL, phone VARCHAR(20), address VARCHAR(200), city VARCHAR(100), state VARCHAR(50), '
+    'zip VARCHAR(20), tax_id VARCHAR(50), industry VARCHAR(100), description TEXT, status VARCHAR(20), '
+    'risk_score FLOAT, fraud_score FLOAT, fraud_detection_result TEXT, submitted_date DATETIME, '
+    'reviewed_by INTEGER REFERENCES users (id), reviewed_at DATETIME)',
+    'CREATE TABLE security_controls (id INTEGER PRIMARY KEY, application_id INTEGER NOT NULL REFERENCES applications (id), '
+    'category VARCHAR(100) NOT NULL, control_name VARCHAR(100) NOT NULL, status BOOLEAN)',
+    'CREATE TABLE pii_data (id INTEGER PRIMARY KEY, application_id INTEGER NOT NULL REFERENCES applications (id), '
+    'field_name VARCHAR(100) NOT NULL, pii_type VARCHAR(50) NOT NULL, masked_value VARCHAR(200), detected_at DATETIME)',
+    'CREATE TABLE audit_logs (id INTEGER PRIMARY KEY, application_id INTEGER REFERENCES applications (id), '
+    'user_id INTEGER REFERENCES users (id), action VARCHAR(100) NOT NULL, details TEXT, ip_address VARCHAR(50), '
+    'timestamp DATETIME)',
+    'CREATE TABLE application_comments (id INTEGER PRIMARY KEY, application_id INTEGER NOT NULL REFERENCES applications (id), '
+    'user_id INTEGER NOT NULL REFERENCES users (id), comment TEXT NOT NULL, created_at DATETIME)',
+    'CREATE TABLE documents (id INTEGER PRIMARY KEY, application_id INTEGER NOT NULL REFERENCES applications (id), '
+    'user_id INTEGER NOT NULL REFERENCES users (id), filename VARCHAR(255) NOT NULL, '
+    'original_filename VARCHAR(255) NOT NULL, file_path VARCHAR(500) NOT NULL, file_type VARCHAR(50), '
+    'file_size INTEGER, uploaded_at DATETIME)',
+]
+
+
+def original_database(path):
+    """Engine for a new database at path with the original schema and two applications"""
+    engine = create_engine(f'sqlite:///{path}')
+    with engine.begin() as conn:
+        for statement in ORIGINAL_SCHEMA:
+            conn.execute(text(statement))
+        conn.execute(text("INSERT INTO users (id, username, email, password_hash, role) VALUES (1, 'admin', 'a@example.com', 'x', 'admin')"))
+        for app_id, status, risk in ((1, 'approved', 80.0), (2, 'flagged', 20.0)):
+            conn.execute(text(
+                'INSERT INTO applications (id, type, company_name, email, industry, status, risk_score, '
+                'fraud_detection_result, submitted_date) VALUES (:id, :type, :name, :email, :industry, :status, '
+                ':risk, :result, :submitted)'
+            ), {
+                'id': app_id, 'type': 'vendor', 'name': f'Legacy {app_id}', 'email': f'legacy{app_id}@example.com',
+                'industry': 'Finance', 'status': status, 'risk': risk, 'submitted': '2023-05-01 10:00:00',
+                'result': json.dumps({'model_type': 'ensemble', 'risk_level': 'low' if app_id == 1 else 'high'})
+            })
+        conn.execute(text(
+            'INSERT INTO security_controls (application_id, category, control_name, status) VALUES '
+            "(1, 'access_control', 'mfaEnabled', 1), (1, 'data_protection', 'encryptionAtRest', 1), "
+            "(1, 'network_security', 'firewallEnabled', 0), (2, 'access_control', 'mfaEnabled', 0)"
+        ))
+    return engine
+
+
+def test_original_schema_is_migrated_to_latest(tmp_path):
+    """Every migration applies in order, is recorded, and backfills the existing rows"""
+    engine = original_database(tmp_path / 'original.db')
+    latest = MIGRATIONS[-1][0]
+
+    applied = migrate(engine, target=3)
+    assert [number for number, _ in applied] == [1, 2, 3]
+    assert current_version(engine) == 3
+
+    applied = migrate(engine)
+    assert [number for number, _ in applied] == list(range(4, latest + 1))
+    assert current_version(engine) == latest
+    assert migrate(engine) == []
+
+    with engine.connect() as conn:
+        recorded = conn.execute(text('SELECT version, name FROM schema_migrations ORDER BY version')).all()
+        assert [tuple(row) for row in recorded] == [(number, name) for number, name, _ in MIGRATIONS]
+
+        columns = inspect(conn).get_columns('applications')
+        assert {'controls_mask', 'fraud_model_type', 'fraud_risk_level', 'external_id', 'content_hash'} <= {
+            c['name'] for c in columns
+        }
+        assert 'token_version' in [c['name'] for c in inspect(conn).get_columns('users')]
+        assert 'sha256' in [c['name'] for c in inspect(conn).get_columns('documents')]
+
+        apps = conn.execute(text(
+            'SELECT id, controls_mask, fraud_model_type, fraud_risk_level FROM applications ORDER BY id'
+        )).all()
+        assert [tuple(row) for row in apps] == [
+            (1, CONTROL_BITS['mfaEnabled'] | CONTROL_BITS['encryptionAtRest'], 'ensemble', 'low'),
+            (2, 0, 'ensemble', 'high'),
+        ]
+
+        counters = dict(conn.execute(text('SELECT name, count FROM dashboard_counters')).all())
+        assert counters['total'] == 2
+        assert counters['status:approved'] == 1 and counters['status:flagged'] == 1
+        assert counters['risk_level:high'] == 1
+        daily = conn.execute(text('SELECT day, type, count, approved_count, flagged_count FROM daily_risk_rollups')).all()
+        assert [tuple(row) for row in daily] == [('2023-05-01', 'vendor', 2, 1, 1)]
+
+
+def test_new_database_is_created_current():
+    """The app's startup schema needs no migrations: all are recorded as applied"""
+    with api.app.app_context():
+        engine = api.db.engine
+        assert current_version(engine) == MIGRATIONS[-1][0]
+        assert migrate(engine) == []
+
@@ -0,0 +1,117 @@
+"""
+Tests for batched purges and the dashboard counters they maintain
+"""
+from datetime import datetime, timedelta
+
+import pytest
+import app as api
+
+URL = f'{api.Config.API_PREFIX}/applications/purge'
+
+
+@pytest.fixture(autouse=True)
+def small_batches(monkeypatch):
+    monkeypatch.setitem(api.app.config, 'PURGE_BATCH_SIZE', 4)
+
+
+@pytest.fixture
+def add_with_children(add_applications):
+    """Call with (n, status, age_days) to add n applications with a PII row, comment and audit entry each"""
+    def add(n, status='pending_review', age_days=0):
+        ids = add_applications([
+            {'company_name': f'Purge {status} {i}', 'status': status, 'risk_score': 50.0 + i,
+             'submitted_date': datetime.utcnow() - timedelta(days=age_days)}
+            for i in range(n)
+        ])
+        with api.app.app_context():
+            for app_id in ids:
+                api.db.session.add(api.PIIData(application_id=app_id, field_name='email', pii_type='email'))
+                api.db.session.add(api.ApplicationComment(application_id=app_id, user_id=1, comment='Checked'))
+                api.db.session.add(api.AuditLog(application_id=app_id, user_id=1, action='APPLICATION_CREATED'))
+            api.db.session.commit()
+        return ids
+    return add
+
+
+def remaining(ids):
+    """How many of these applications, and of their PII, comment and audit rows, still exist"""
+    with api.app.app_context():
+        return [
+            model.query.filter(column.in_(ids)).count()
+            for model, column in (
+                (api.Application, api.Application.id),
+                (api.PIIData, api.PIIData.application_id),
+                (api.ApplicationComment, api.ApplicationComment.application_id),
+                (api.AuditLog, api.AuditLog.application_id),
+            )
+        ]
+
+
+def count(**filters):
+    with api.app.app_context():
+        return api.Application.query.filter_by(**filters).count()
+
+
+def purge(client, headers, body):
+    """POST a purge and return (response, job row)"""
+    response = client.post(URL, json=body, headers=headers)
+    job_id = response.get_json().get('job_id')
+    with api.app.app_context():
+        return response, api.db.session.get(api.ImportJob, job_id) if job_id else None
+
+
+def test_purge_needs_a_filter(client, auth_headers):
+    response, _ = purge(client, auth_headers(), {})
+    assert response.status_code == 400
+
+
+def test_filtered_purge_keeps_counters_exact(client, auth_headers, drift, add_with_children):
+    """Purged rows go with their child rows, across several batches, and no counter drifts"""
+    flagged = add_with_children(10, 'flagged')
+    old = add_with_children(3, 'approved', age_days=400)
+    kept = add_with_children(5, 'approved')
+    assert drift() == {}
+
+    response, job = purge(client, auth_headers(), {'statuses': ['flagged']})
+    assert response.status_code == 202
+    assert job.status == 'completed', job.error
+    assert job.stats == {'deleted': 10} and job.rows_processed == job.total_rows == 10
+    assert remaining(flagged) == [0, 0, 0, 0]
+    assert remaining(old + kept) == [8, 8, 8, 8]
+    assert drift() == {}
+
+    response, job = purge(client, auth_headers(), {'older_than_days': 365})
+    assert job.stats == {'deleted': 3}
+    assert remaining(old) == [0, 0, 0, 0] and remaining(kept) == [5, 5, 5, 5]
+    assert drift() == {}
+
+
+def test_full_purge_counts_applications_added_while_it_runs(drift, add_with_children):
+    """Counters match the table after purging everything, even with inserts between batches"""
+    add_with_children(10)
+    added = []
+    with api.app.app_context():
+        for _ in api.purge_applications():
+            api.db.session.commit()
+            if not added:
+                added = add_with_children(2, 'flagged')
+        counters = api.dashboard_counters.snapshot()
+    assert counters['total'][0] == count()
+    assert counters.get('status:flagged', (0,))[0] == count(status='flagged')
+    assert drift() == {}
+
+
+def test_full_purge_rebuilds_stale_counters(client, auth_headers, drift, add_with_children):
+    add_with_children(3)
+    with api.app.app_context():
+        # Counters that drifted before the purge must not survive it
+        api.db.session.execute(api.db.text("UPDATE dashboard_counters SET count = count + 7 WHERE name = 'total'"))
+        api.db.session.commit()
+
+    response, job = purge(client, auth_headers(), {'all': True})
+    assert response.status_code == 202
+    assert job.status == 'completed', job.error
+    assert count() == 0
+    with api.app.app_context():
+        assert api.dashboard_counters.snapshot()['total'][0] == 0
+    assert drift() == {}
@@ -0,0 +1,65 @@
+"""
+Query-count regression test for the application detail endpoint
+"""
+from sqlalchemy import event
+import app as api
+
+
+def count_queries(client, url, headers):
+    """Return (response, number of SELECT statements) for one GET request"""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append(statement)
+
+    with api.app.app_context():
+        engine = api.db.engine
+    event.listen(engine, 'before_cursor_execute', capture)
+    try:
+        response = client.get(url, headers=headers)
+    finally:
+        event.remove(engine, 'before_cursor_execute', capture)
+    return response, len(statements)
+
+
+def add_activity(app_id, n):
+    """Add n comments (each from a different user), audit logs and PII rows"""
+    with api.app.app_context():
+        start = api.User.query.count()
+        users = [
+            api.User(username=f'reviewer{start + i}', email=f'reviewer{start + i}@example.com', password_hash='x')
+            for i in range(n)
+        ]
+        api.db.session.add_all(users)
+        api.db.session.flush()
+        for user in users:
+            api.db.session.add(api.ApplicationComment(application_id=app_id, user_id=user.id, comment='Looks fine'))
+            api.db.session.add(api.AuditLog(application_id=app_id, user_id=user.id, action='APPLICATION_VIEWED'))
+            api.db.session.add(api.PIIData(application_id=app_id, field_name='email', pii_type='email'))
+        api.db.session.commit()
+
+
+def test_detail_query_count_is_bounded(client, auth_headers, add_applications):
+    """Detail endpoint issues the same number of queries for 1 or 50 comments and logs"""
+    [app_id] = add_applications([{'company_name': 'Query Count Ltd'}])
+    url = f'{api.Config.API_PREFIX}/applications/{app_id}'
+    headers = auth_headers()
+
+    add_activity(app_id, 1)
+    client.get(url, headers=headers)  # prime the per-worker user cache used for token checks
+    response, small = count_queries(client, url, headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['comments']) == 1
+
+    add_activity(app_id, 49)
+    response, large = count_queries(client, url, headers)
+    assert response.status_code == 200
+    body = response.get_json()
+    assert len(body['comments']) == 50
+    assert len(body['audit_logs']) == 50
+    assert all(c['username'].startswith('reviewer') for c in body['comments'])
+
+    print(f"Detail queries: {small} with 1 comment, {large} with 50 comments")
+    assert large == small, f'query count grew from {small} to {large}'
+    assert large <= 5, f'detail endpoint issued {large} queries'
@@ -0,0 +1,109 @@
+"""
+Tests for resumable document uploads, and the request body cap on plain ones
+"""
+import hashlib
+import io
+import os
+
+import pytest
+import app as api
+
+CONTENT = os.urandom(300 * 1024)
+
+
+@pytest.fixture(autouse=True)
+def documents_dir(tmp_path, monkeypatch):
+    """Keep uploaded files out of the repository's uploads/ directory"""
+    monkeypatch.setattr(api, 'documents_dir', lambda: str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def start_upload(client, auth_headers, add_applications):
+    """Call to create an application and start an upload of CONTENT for it; returns the upload status"""
+    def start(**fields):
+        [app_id] = add_applications([{'company_name': 'Upload Ltd'}])
+        body = {'filename': 'report.pdf', 'size': len(CONTENT), 'file_type': 'contract', **fields}
+        response = client.post(f'{api.Config.API_PREFIX}/applications/{app_id}/documents/uploads', json=body,
+                               headers=auth_headers())
+        assert response.status_code == 201
+        return response.get_json()
+    return start
+
+
+@pytest.fixture
+def put(client, auth_headers):
+    def send(upload, offset, data, user_id=1):
+        return client.put(upload['upload_url'], data=data,
+                          headers={**auth_headers(user_id), 'Upload-Offset': str(offset)})
+    return send
+
+
+def documents(app_id):
+    with api.app.app_context():
+        return api.Document.query.filter_by(application_id=app_id).all()
+
+
+def test_upload_in_chunks_with_a_retried_chunk(client, auth_headers, documents_dir, start_upload, put):
+    """A repeated chunk gets 409 with the offset to resume from; the assembled file is checked and stored"""
+    upload = start_upload(sha256=hashlib.sha256(CONTENT).hexdigest())
+    assert upload['offset'] == 0
+
+    response = put(upload, 0, CONTENT[:100 * 1024])
+    assert response.status_code == 200 and response.get_json()['offset'] == 100 * 1024
+
+    # The response to the first chunk was lost and the client sends it again
+    response = put(upload, 0, CONTENT[:100 * 1024])
+    assert response.status_code == 409 and response.get_json()['offset'] == 100 * 1024
+    assert client.get(upload['upload_url'], headers=auth_headers()).get_json()['offset'] == 100 * 1024
+
+    response = put(upload, 100 * 1024, CONTENT[100 * 1024:] + b'extra')
+    assert response.status_code == 413
+
+    response = put(upload, 100 * 1024, CONTENT[100 * 1024:])
+    assert response.status_code == 201
+    document = response.get_json()['document']
+    assert document['file_size'] == len(CONTENT) and document['sha256'] == hashlib.sha256(CONTENT).hexdigest()
+
+    [stored] = documents(upload['application_id'])
+    with open(stored.file_path, 'rb') as f:
+        assert f.read() == CONTENT
+    assert os.listdir(documents_dir) == [os.path.basename(stored.file_path)]
+    assert client.get(upload['upload_url'], headers=auth_headers()).status_code == 404
+
+
+def test_checksum_mismatch_discards_the_upload(documents_dir, start_upload, put):
+    upload = start_upload(sha256=hashlib.sha256(b'something else').hexdigest())
+    response = put(upload, 0, CONTENT)
+    assert response.status_code == 422
+    assert response.get_json()['sha256'] == hashlib.sha256(CONTENT).hexdigest()
+    assert documents(upload['application_id']) == []
+    assert not any(name.endswith('.part') for name in os.listdir(documents_dir))
+
+
+def test_only_the_uploader_may_continue_or_cancel(client, auth_headers, documents_dir, start_upload, put):
+    with api.app.app_context():
+        other = api.User(username='other-uploader', email='other@example.com', password_hash='x', role='reviewer')
+        api.db.session.add(other)
+        api.db.session.commit()
+        other_id = other.id
+    upload = start_upload()
+    assert put(upload, 0, CONTENT[:1024], user_id=other_id).status_code == 403
+    assert client.delete(upload['upload_url'], headers=auth_headers(other_id)).status_code == 403
+
+    assert put(upload, 0, CONTENT[:1024]).status_code == 200
+    assert client.delete(upload['upload_url'], headers=auth_headers()).status_code == 200
+    assert client.get(upload['upload_url'], headers=auth_headers()).status_code == 404
+    assert not any(name.endswith('.part') for name in os.listdir(documents_dir))
+
+
+def test_multipart_body_without_content_length_is_capped(client, auth_headers, add_applications):
+    """A streamed multipart upload is refused once it passes MAX_CONTENT_LENGTH, not parsed in full"""
+    [app_id] = add_applications([{'company_name': 'Multipart Ltd'}])
+    body = (b'--XX\r\nContent-Disposition: form-data; name="file"; filename="big.pdf"\r\n\r\n'
+            + b'x' * (api.app.config['MAX_CONTENT_LENGTH'] + 1) + b'\r\n--XX--\r\n')
+    response = client.post(f'{api.Config.API_PREFIX}/applications/{app_id}/documents', input_stream=io.BytesIO(body),
+                           content_type='multipart/form-data; boundary=XX', headers=auth_headers(),
+                           environ_overrides={'wsgi.input_terminated': True})
+    assert response.status_code == 413 and 'error' in response.get_json()
+    assert documents(app_id) == []
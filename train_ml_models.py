@@ -13,9 +13,10 @@ from sklearn.metrics import classification_report, confusion_matrix, roc_auc_sco
 import pickle
 import os
 from pathlib import Path
+from training_data import read_training_data, bytes_per_row
 
-def load_data(filepath=None):
-    """Load training data"""
+def load_data(filepath=None, columns=None):
+    """Load training data, optionally restricted to a subset of columns"""
     # Try multiple possible file paths
     possible_paths = [
         filepath,
@@ -23,20 +24,22 @@ def load_data(filepath=None):
         'data/onboarding_training_data.csv',
         'onboarding_train.csv',
         'data/supplier_quality_data.csv',
-        'data/processed/supplier_quality_processed.csv'
+        'data/processed/supplier_quality_processed.csv',
+        'data/processed/supplier_quality'
     ]
     
     for path in possible_paths:
         if path and os.path.exists(path):
             print(f"📂 Loading data from {path}...")
-            df = pd.read_csv(path)
-            print(f"✅ Loaded {len(df)} records")
+            df = read_training_data(path, columns=columns)
+            print(f"✅ Loaded {len(df)} records ({bytes_per_row(df):.0f} bytes/row)")
             return df
     
     raise FileNotFoundError("Could not find training data. Please ensure one of these files exists:\n" +
                           "  - onboarding_train.csv\n" +
                           "  - data/supplier_quality_data.csv\n" +
-                          "  - data/processed/supplier_quality_processed.csv")
+                          "  - data/processed/supplier_quality_processed.csv\n" +
+                          "  - data/processed/supplier_quality/ (Parquet parts)")
 
 def prepare_features(df):
     """Extract features for ML model"""
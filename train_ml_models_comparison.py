@@ -12,6 +12,7 @@ from sklearn.metrics import classification_report, confusion_matrix, roc_auc_sco
 import pickle
 import os
 import warnings
+from training_data import read_training_data, bytes_per_row
 warnings.filterwarnings('ignore')
 
 # Try to import XGBoost and LightGBM
@@ -31,14 +32,14 @@ except (ImportError, Exception) as e:
     print(f"⚠️ LightGBM not available: {str(e)[:100]}")
     print("   Note: LightGBM may require additional dependencies")
 
-def load_data(filepath='data/onboarding_train.csv'):
-    """Load training data"""
+def load_data(filepath='data/onboarding_train.csv', columns=None):
+    """Load training data, optionally restricted to a subset of columns"""
     print(f"📂 Loading data from {filepath}...")
     if not os.path.exists(filepath):
         print(f"❌ File not found: {filepath}")
         return None
-    df = pd.read_csv(filepath)
-    print(f"✅ Loaded {len(df)} records")
+    df = read_training_data(filepath, columns=columns)
+    print(f"✅ Loaded {len(df)} records ({bytes_per_row(df):.0f} bytes/row)")
     return df
 
 def prepare_features(df):
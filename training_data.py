@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Schema-aware loader for onboarding training data
+
+Reads the 15 security control flags and is_fraud as uint8 and the
+low-cardinality text columns as categoricals instead of pandas' default
+int64/object dtypes.
+"""
+import os
+import numpy as np
+import pandas as pd
+
+SECURITY_COLS = [
+    'mfaEnabled', 'ssoSupport', 'rbacImplemented',
+    'encryptionAtRest', 'encryptionInTransit', 'keyManagement',
+    'firewallEnabled', 'vpnRequired', 'ipWhitelisting',
+    'auditLogging', 'siemIntegration', 'alertingEnabled',
+    'gdprCompliant', 'soc2Certified', 'isoCompliant'
+]
+FLAG_COLS = SECURITY_COLS + ['is_fraud', 'Class']
+CATEGORY_COLS = ['type', 'industry', 'state', 'city']
+
+def training_dtypes(flag_dtype=np.uint8):
+    """Return the read_csv dtype mapping for known training columns"""
+    dtypes = {col: flag_dtype for col in FLAG_COLS}
+    dtypes.update({col: 'category' for col in CATEGORY_COLS})
+    return dtypes
+
+def _compact(df):
+    """Coerce known columns to their compact dtypes after a permissive read"""
+    for col in FLAG_COLS:
+        if col in df.columns and df[col].dtype != np.uint8:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(np.uint8)
+    for col in CATEGORY_COLS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
+def read_training_data(path, columns=None):
+    """Load a training CSV or Parquet dataset with compact dtypes
+
+    columns restricts the read to a subset of columns. Parquet files or
+    directories (as written by process_kaggle_data.py) are read column-wise.
+    """
+    path = str(path)
+    if os.path.isdir(path) or path.endswith('.parquet'):
+        return _compact(pd.read_parquet(path, columns=columns))
+
+    try:
+        df = pd.read_csv(path, usecols=columns, dtype=training_dtypes())
+    except (ValueError, TypeError):
+        # Missing or non-integer flag values can't be parsed straight into
+        # uint8, so read them permissively and coerce afterwards
+        df = pd.read_csv(path, usecols=columns, dtype={col: 'category' for col in CATEGORY_COLS})
+    return _compact(df)
+
+def bytes_per_row(df):
+    """Deep memory usage per row in bytes"""
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)